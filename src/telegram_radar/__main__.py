@@ -1,21 +1,62 @@
 import asyncio
 import signal
+import time
+from collections.abc import Awaitable, Callable
 from pathlib import Path
+from typing import TypeVar
 
 from loguru import logger
 
+from telegram_radar.archive import PostArchive
 from telegram_radar.batch_builder import BatchBuilder
 from telegram_radar.bot import TelegramBotController
+from telegram_radar.cache import DigestCache
 from telegram_radar.digest_builder import DigestBuilder
 from telegram_radar.gateway import TelegramClientGateway
+from telegram_radar.history import DigestHistory
+from telegram_radar.models import DigestItem, DigestProfile, RunProgress
 from telegram_radar.pipeline import run_digest
+from telegram_radar.prefilter import RelevanceFilter
+from telegram_radar.reducer import DigestReducer
 from telegram_radar.scheduler import Scheduler
 from telegram_radar.settings import Settings
 from telegram_radar.state import StateManager
 from telegram_radar.summarizer import LLMSummarizer
+from telegram_radar.triage import PostTriage
+
+T = TypeVar("T")
+
+
+class StartupTimer:
+    """Collects durations of startup steps for a one-line log summary."""
+
+    def __init__(self) -> None:
+        self._started = time.perf_counter()
+        self._mark = self._started
+        self.steps: dict[str, float] = {}
+
+    def lap(self, name: str) -> None:
+        now = time.perf_counter()
+        self.steps[name] = now - self._mark
+        self._mark = now
+
+    async def timed(self, name: str, aw: Awaitable[T]) -> T:
+        start = time.perf_counter()
+        try:
+            return await aw
+        finally:
+            self.steps[name] = time.perf_counter() - start
+
+    def log(self) -> None:
+        total = time.perf_counter() - self._started
+        breakdown = ", ".join(
+            f"{name} {seconds:.2f}s" for name, seconds in self.steps.items()
+        )
+        logger.info("Startup took {:.2f}s ({})", total, breakdown)
 
 
 async def main() -> None:
+    timer = StartupTimer()
     settings = Settings()
 
     # Ensure data directory exists
@@ -25,20 +66,83 @@ async def main() -> None:
 
     state = StateManager(Path("data/state.json"))
     gateway = TelegramClientGateway(settings)
-    batch_builder = BatchBuilder()
+    batch_builder = BatchBuilder(
+        chunk_overlap_chars=settings.llm_chunk_overlap_chars
+    )
     summarizer = LLMSummarizer(settings)
     digest_builder = DigestBuilder()
+    cache = DigestCache(settings)
+    prefilter = (
+        RelevanceFilter(settings, Path("data/prefilter.json"))
+        if settings.prefilter_enabled
+        else None
+    )
+    archive = PostArchive(
+        settings.archive_path, settings.archive_retention_days
+    )
+    history = DigestHistory(settings.history_path)
+    triage = (
+        PostTriage(summarizer, settings) if settings.llm_triage_model else None
+    )
+    reducer = (
+        DigestReducer(
+            summarizer,
+            fan_in=settings.llm_reduce_fan_in,
+            max_items_per_call=settings.llm_reduce_max_items,
+        )
+        if settings.llm_reduce_enabled
+        else None
+    )
 
     # Create the digest callable that captures all dependencies
-    async def digest_fn() -> str:
-        return await run_digest(
-            gateway=gateway,
-            batch_builder=batch_builder,
-            summarizer=summarizer,
-            digest_builder=digest_builder,
-            state=state,
-            settings=settings,
-        )
+    async def digest_fn(
+        profiles: list[DigestProfile] | None = None,
+        on_item: Callable[[DigestItem], None] | None = None,
+        progress: RunProgress | None = None,
+    ) -> str:
+        try:
+            return await run_digest(
+                gateway=gateway,
+                batch_builder=batch_builder,
+                summarizer=summarizer,
+                digest_builder=digest_builder,
+                state=state,
+                settings=settings,
+                profiles=profiles,
+                cache=cache,
+                reducer=reducer,
+                prefilter=prefilter,
+                triage=triage,
+                on_item=on_item,
+                progress=progress,
+                archive=archive,
+                history=history,
+            )
+        finally:
+            for tier, usage in summarizer.pop_usage().items():
+                logger.info(
+                    "LLM tier '{}' on {}: {} calls, {:.1f}s, {} prompt "
+                    "({} cached) + {} completion tokens, {:.1f} tokens/s",
+                    tier,
+                    summarizer.backend_name,
+                    usage.calls,
+                    usage.seconds,
+                    usage.prompt_tokens,
+                    usage.cached_tokens,
+                    usage.completion_tokens,
+                    usage.completion_tokens / usage.seconds
+                    if usage.seconds
+                    else 0.0,
+                )
+                if usage.unmetered_calls:
+                    logger.warning(
+                        "LLM tier '{}': token usage unavailable for {} of "
+                        "{} calls (streamed output), totals above are "
+                        "incomplete",
+                        tier,
+                        usage.unmetered_calls,
+                        usage.calls,
+                    )
 
     bot = TelegramBotController(
         settings=settings,
@@ -46,19 +150,30 @@ async def main() -> None:
         summarizer=summarizer,
         state=state,
         run_digest=digest_fn,
+        archive=archive,
+        history=history,
     )
 
     scheduler = Scheduler(
-        digest_callback=digest_fn,
-        send_callback=bot.send_message,
+        digest_callback=bot.run_scheduled_digest,
+        profiles=settings.profiles(),
     )
 
-    # Start services
-    await gateway.connect()
-    await bot.start()
+    timer.lap("setup")
+
+    async def connect_gateway() -> bool:
+        await gateway.connect()
+        return await gateway.is_authorized()
+
+    # The Telegram client and the bot connect independently
+    authorized, _ = await asyncio.gather(
+        timer.timed("telethon", connect_gateway()),
+        timer.timed("bot", bot.start()),
+    )
+    timer.log()
 
     # Auth flow: if session not authorized, bot collects credentials
-    if not await gateway.is_authorized():
+    if not authorized:
         auth_event = asyncio.Event()
         await bot.start_auth_flow(auth_event)
         logger.info("Waiting for authentication via bot...")
@@ -66,6 +181,9 @@ async def main() -> None:
     else:
         bot._auth_complete = True
 
+    # Probing before the client is connected would report Telegram down
+    # until the next interval
+    bot.start_health_monitor()
     scheduler.start()
     logger.info("Telegram Radar Digest is running")
 
@@ -86,6 +204,9 @@ async def main() -> None:
     scheduler.stop()
     await bot.stop()
     await gateway.stop()
+    await summarizer.close()
+    archive.close()
+    history.close()
     logger.info("Shutdown complete")
 
 
@@ -0,0 +1,168 @@
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from loguru import logger
+
+from telegram_radar.models import Post
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    channel_title TEXT NOT NULL,
+    author TEXT,
+    date INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_date ON documents (date);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5 (
+    text,
+    channel_title,
+    content='documents',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+    INSERT INTO documents_fts (rowid, text, channel_title)
+    VALUES (new.id, new.text, new.channel_title);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, text, channel_title)
+    VALUES ('delete', old.id, old.text, old.channel_title);
+END;
+"""
+
+_INSERT = """
+INSERT OR IGNORE INTO documents
+    (key, url, kind, channel_title, author, date, text)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SEARCH = """
+SELECT d.url, d.kind, d.channel_title, d.author, d.date,
+       snippet(documents_fts, 0, '«', '»', '…', 16)
+FROM documents_fts
+JOIN documents AS d ON d.id = documents_fts.rowid
+WHERE documents_fts MATCH ?
+ORDER BY rank
+LIMIT ?
+"""
+
+
+@dataclass(slots=True, kw_only=True)
+class SearchHit:
+    url: str
+    kind: str
+    channel_title: str
+    author: str | None
+    date: datetime
+    snippet: str
+
+
+def _match_query(query: str) -> str:
+    """Turn free text into an FTS5 query: every word, as a prefix.
+
+    Quoting each word keeps user input from being parsed as FTS5 syntax;
+    prefix matching stands in for stemming of inflected words.
+    """
+    words = query.split()
+    return " ".join('"' + w.replace('"', '""') + '"*' for w in words)
+
+
+class PostArchive:
+    """Every fetched post and comment in a local full-text index.
+
+    Rows are keyed by permalink, so re-archiving a post fetched again is a
+    no-op. Rows older than ``retention_days`` are removed by ``prune``;
+    0 keeps everything.
+    """
+
+    def __init__(self, path: Path, retention_days: int = 0) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._retention_days = retention_days
+
+    def add_posts(self, posts: list[Post]) -> int:
+        """Archive posts and their comments; returns rows added."""
+        rows: list[tuple] = []
+        for post in posts:
+            rows.append(
+                (
+                    post.permalink,
+                    post.permalink,
+                    "post",
+                    post.channel_title,
+                    None,
+                    int(post.date.timestamp()),
+                    post.text,
+                )
+            )
+            for comment in post.comments:
+                key = f"{post.permalink}?comment={comment.id}"
+                rows.append(
+                    (
+                        key,
+                        comment.link or key,
+                        "comment",
+                        post.channel_title,
+                        comment.author_name,
+                        int(comment.date.timestamp()),
+                        comment.text,
+                    )
+                )
+        with self._db:
+            # rowcount skips ignored duplicates and trigger changes
+            added = self._db.executemany(_INSERT, rows).rowcount
+        if added:
+            logger.debug("Archived {} new posts and comments", added)
+        return added
+
+    def search(self, query: str, limit: int = 10) -> list[SearchHit]:
+        match = _match_query(query)
+        if not match:
+            return []
+        start = time.perf_counter()
+        rows = self._db.execute(_SEARCH, (match, limit)).fetchall()
+        logger.info(
+            "Archive search for '{}': {} hits in {:.1f}ms",
+            query,
+            len(rows),
+            (time.perf_counter() - start) * 1000,
+        )
+        return [
+            SearchHit(
+                url=url,
+                kind=kind,
+                channel_title=channel_title,
+                author=author,
+                date=datetime.fromtimestamp(date, timezone.utc),
+                snippet=snippet,
+            )
+            for url, kind, channel_title, author, date, snippet in rows
+        ]
+
+    def prune(self) -> int:
+        """Delete rows past the retention window; returns rows removed."""
+        if self._retention_days <= 0:
+            return 0
+        cutoff = datetime.now(timezone.utc) - timedelta(
+            days=self._retention_days
+        )
+        with self._db:
+            removed = self._db.execute(
+                "DELETE FROM documents WHERE date < ?",
+                (int(cutoff.timestamp()),),
+            ).rowcount
+        if removed:
+            logger.info("Pruned {} archived posts and comments", removed)
+        return removed
+
+    def close(self) -> None:
+        self._db.close()
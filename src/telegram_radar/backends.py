@@ -0,0 +1,88 @@
+from typing import TYPE_CHECKING
+
+from telegram_radar.settings import Settings
+
+if TYPE_CHECKING:
+    import httpx
+    from openai import AsyncOpenAI
+
+LOCAL_BASE_URL = "http://127.0.0.1:8080/v1"
+# Local servers ignore the key, but the OpenAI client insists on one
+_LOCAL_API_KEY = "sk-no-key-required"
+
+
+class LLMBackend:
+    """OpenAI API, the default backend."""
+
+    name = "openai"
+    # Remote APIs accept HTTP/2 when h2 is installed
+    http2 = True
+    # instructor.Mode value, kept as a string so instructor and openai are
+    # only imported once a client is created
+    mode = "tool_call"
+
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+
+    @property
+    def base_url(self) -> str | None:
+        return self._settings.llm_base_url
+
+    @property
+    def api_key(self) -> str:
+        return self._settings.llm_api_key
+
+    def create_client(
+        self, http_client: "httpx.AsyncClient"
+    ) -> "AsyncOpenAI":
+        from openai import AsyncOpenAI
+
+        return AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            http_client=http_client,
+        )
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """Any server speaking the OpenAI chat API at ``LLM_BASE_URL``.
+
+    Tool calling support varies between servers, so structured output is
+    requested as a JSON schema in the prompt instead.
+    """
+
+    name = "openai_compatible"
+    mode = "json_mode"
+
+    def __init__(self, settings: Settings) -> None:
+        if not settings.llm_base_url:
+            raise ValueError(
+                "LLM_BASE_URL is required for the openai_compatible provider"
+            )
+        super().__init__(settings)
+
+
+class LocalBackend(LLMBackend):
+    """Inference server on this machine, e.g. llama.cpp's llama-server."""
+
+    name = "local"
+    http2 = False
+    mode = "json_mode"
+
+    @property
+    def base_url(self) -> str:
+        return self._settings.llm_base_url or LOCAL_BASE_URL
+
+    @property
+    def api_key(self) -> str:
+        return self._settings.llm_api_key or _LOCAL_API_KEY
+
+
+_BACKENDS: dict[str, type[LLMBackend]] = {
+    backend.name: backend
+    for backend in (LLMBackend, OpenAICompatibleBackend, LocalBackend)
+}
+
+
+def create_backend(settings: Settings) -> LLMBackend:
+    return _BACKENDS[settings.llm_provider](settings)
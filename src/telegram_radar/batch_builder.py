@@ -1,21 +1,121 @@
 from loguru import logger
 
+from telegram_radar.compact import (
+    COMMENT_OVERHEAD_CHARS,
+    POST_OVERHEAD_CHARS,
+    compact_text,
+)
 from telegram_radar.models import Batch, Comment, Post, PostPayload
 
+# Text length stops adding signal beyond this many chars
+_SIGNAL_TEXT_CAP = 400
 
-def _metadata_text(post: Post) -> str:
+
+def comment_signal(comment: Comment) -> float:
+    """How much a comment is worth its place in the prompt."""
     return (
-        f"[{post.channel_title}] {post.permalink}\n"
-        f"Date: {post.date.isoformat()}\n\n"
+        comment.reactions
+        + 2 * comment.replies
+        + min(len(comment.text), _SIGNAL_TEXT_CAP) / 100
     )
 
 
-def _comment_text(comment: Comment) -> str:
-    author = comment.author_name or "Anonymous"
-    return f"\n--- Comment by {author} ---\n{comment.text}\n"
+def _select_comments(
+    comments: list[Comment], budget: int
+) -> tuple[list[Comment], list[str], int]:
+    """Pick the highest-signal comments that fit, in original order."""
+    ranked = sorted(
+        range(len(comments)),
+        key=lambda i: comment_signal(comments[i]),
+        reverse=True,
+    )
+    chosen: dict[int, str] = {}
+    used = 0
+    for i in ranked:
+        comment = comments[i]
+        text = compact_text(comment.text)
+        chars = (
+            COMMENT_OVERHEAD_CHARS
+            + len(comment.author_name or "Anon")
+            + len(text)
+        )
+        if used + chars <= budget:
+            chosen[i] = text
+            used += chars
+    order = sorted(chosen)
+    return [comments[i] for i in order], [chosen[i] for i in order], used
+
+
+def split_text(text: str, size: int, overlap: int) -> list[str]:
+    """Split text into chunks of at most size chars sharing overlap chars.
+
+    Cuts prefer paragraph, line and word boundaries in the second half of
+    a chunk.
+    """
+    if len(text) <= size:
+        return [text]
+    overlap = min(overlap, size // 4)
+    chunks: list[str] = []
+    start = 0
+    while start < len(text):
+        end = start + size
+        if end >= len(text):
+            chunks.append(text[start:])
+            break
+        for sep in ("\n\n", "\n", " "):
+            cut = text.rfind(sep, start + size // 2, end)
+            if cut != -1:
+                end = cut + len(sep)
+                break
+        chunks.append(text[start:end].strip())
+        start = end - overlap
+        # Resume at a word start so the overlap does not split words
+        space = text.find(" ", start, end)
+        if space != -1 and space - start < overlap:
+            start = space + 1
+    return chunks
+
+
+def render_payloads(
+    post: Post, max_chars: int, overlap: int = 0
+) -> list[PostPayload]:
+    """Render a post and its best comments into payloads of max_chars.
+
+    A post that does not fit on its own is split into overlapping parts;
+    comments go with the last part.
+    """
+    text = compact_text(post.text)
+    overhead = POST_OVERHEAD_CHARS + len(post.channel_title)
+    chunks = split_text(text, max(1, max_chars - overhead), overlap)
+
+    payloads: list[PostPayload] = []
+    for i, chunk in enumerate(chunks, start=1):
+        chars = overhead + len(chunk)
+        comments: list[Comment] = []
+        comment_texts: list[str] = []
+        if i == len(chunks):
+            comments, comment_texts, used = _select_comments(
+                post.comments, max_chars - chars
+            )
+            chars += used
+        payloads.append(
+            PostPayload(
+                post=post,
+                text=chunk,
+                comments=comments,
+                comment_texts=comment_texts,
+                char_count=chars,
+                part=i,
+                parts=len(chunks),
+            )
+        )
+    return payloads
 
 
 class BatchBuilder:
+    def __init__(self, chunk_overlap_chars: int = 0) -> None:
+        self._overlap = chunk_overlap_chars
+
     def build_batches(
         self,
         posts: list[Post],
@@ -24,35 +124,16 @@ class BatchBuilder:
         payloads: list[PostPayload] = []
 
         for post in posts:
-            meta = _metadata_text(post)
-            base_chars = len(meta) + len(post.text)
-
-            if base_chars > max_chars_per_batch:
-                logger.warning(
-                    "Skipping post {} in '{}' — {} chars exceeds batch budget {}",
+            rendered = render_payloads(post, max_chars_per_batch, self._overlap)
+            if len(rendered) > 1:
+                logger.info(
+                    "Split post {} in '{}' ({} chars) into {} parts",
                     post.id,
                     post.channel_title,
-                    base_chars,
-                    max_chars_per_batch,
+                    len(post.text),
+                    len(rendered),
                 )
-                continue
-
-            included_comments: list[Comment] = []
-            total_chars = base_chars
-            for comment in post.comments:
-                ct = _comment_text(comment)
-                if total_chars + len(ct) > max_chars_per_batch:
-                    break
-                included_comments.append(comment)
-                total_chars += len(ct)
-
-            payloads.append(
-                PostPayload(
-                    post=post,
-                    comments=included_comments,
-                    char_count=total_chars,
-                )
-            )
+            payloads.extend(rendered)
 
         batches: list[Batch] = []
         current_payloads: list[PostPayload] = []
@@ -92,5 +173,5 @@ def _make_batch(
         payloads=payloads,
         total_chars=total_chars,
         post_count=len(payloads),
-        comment_count=sum(len(p.comments) for p in payloads),
+        comment_count=sum(len(p.comment_texts) for p in payloads),
     )
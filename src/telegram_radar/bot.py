@@ -1,7 +1,10 @@
 import asyncio
 import re
+import secrets
 from collections.abc import Callable, Coroutine
-from typing import Any
+from datetime import date
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
 
 from loguru import logger
 from telegram import BotCommand, Update
@@ -21,15 +24,34 @@ from telethon.errors import (
     PasswordHashInvalidError,
 )
 
+from telegram_radar.archive import PostArchive
+from telegram_radar.delivery import MessageDelivery, ProgressiveMessage
+from telegram_radar.digest_builder import DigestBuilder, IncrementalDigest
+from telegram_radar.health import HealthMonitor
+from telegram_radar.history import DigestHistory, StoredDigest
+from telegram_radar.jobs import DigestJob, DigestJobs
+from telegram_radar.models import (
+    DigestBatchResult,
+    DigestItem,
+    DigestProfile,
+)
 from telegram_radar.protocols import StateRepository, Summarizer, TelegramGateway
 from telegram_radar.settings import Settings
 
+if TYPE_CHECKING:
+    from telegram_radar.webhook import WebhookServer
+
 # ConversationHandler states
 AWAITING_PHONE = 0
 AWAITING_CODE = 1
 AWAITING_PASSWORD = 2
 
 MAX_RETRIES = 3
+SEARCH_RESULTS = 10
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.0f} ms"
 
 
 class TelegramBotController:
@@ -43,26 +65,55 @@ class TelegramBotController:
         gateway: TelegramGateway,
         summarizer: Summarizer,
         state: StateRepository,
-        run_digest: Callable[[], Coroutine[Any, Any, str]],
+        run_digest: Callable[..., Coroutine[Any, Any, str]],
+        archive: PostArchive | None = None,
+        history: DigestHistory | None = None,
     ) -> None:
         self._settings = settings
+        self._archive = archive
+        self._history = history
         self._gateway = gateway
         self._summarizer = summarizer
         self._state = state
         self._run_digest = run_digest
         self._app = Application.builder().token(settings.tg_bot_token).build()
+        self._delivery = MessageDelivery(
+            self._app.bot, interval=settings.tg_send_interval_seconds
+        )
         self._auth_complete: bool = False
         self._auth_event: asyncio.Event | None = None
         self._phone: str = ""
         self._retry_count: int = 0
         self._reminder_job = None
+        self._jobs = DigestJobs()
+        self._health = HealthMonitor(
+            {
+                "Telegram": gateway.check_health,
+                "LLM": summarizer.check_health,
+            },
+            interval=settings.health_check_interval_seconds,
+            timeout=settings.health_check_timeout_seconds,
+            history=settings.health_history_size,
+        )
+        self._webhook: "WebhookServer | None" = None
         self._register_handlers()
 
     def _register_handlers(self) -> None:
         self._app.add_handler(CommandHandler("start", self._handle_start))
-        self._app.add_handler(CommandHandler("digest_now", self._handle_digest_now))
-        self._app.add_handler(CommandHandler("channels", self._handle_channels))
-        self._app.add_handler(CommandHandler("health", self._handle_health))
+        # Non-blocking, so commands are answered while others are in flight;
+        # the login conversation keeps the default ordered processing
+        for command, callback in (
+            ("digest_now", self._handle_digest_now),
+            ("channels", self._handle_channels),
+            ("health", self._handle_health),
+            ("status", self._handle_status),
+            ("search", self._handle_search),
+            ("digest_last", self._handle_digest_last),
+            ("digest_on", self._handle_digest_on),
+        ):
+            self._app.add_handler(
+                CommandHandler(command, callback, block=False)
+            )
 
     def _is_owner(self, update: Update) -> bool:
         user = update.effective_user
@@ -288,15 +339,193 @@ class TelegramBotController:
             await update.effective_chat.send_message("Please complete the login first.")
             return
         assert update.effective_chat is not None
-        await update.effective_chat.send_message("Generating digest...")
+        running = self._jobs.running()
+        if running is not None:
+            await update.effective_chat.send_message(
+                f"Digest job #{running.id} is already running, see /status."
+            )
+            return
+        chat_id = update.effective_chat.id
+        job = self._jobs.start(lambda job: self._digest_job(chat_id, job))
+        logger.info("Digest job #{} requested by owner", job.id)
+
+    async def _digest_job(self, chat_id: int, job: DigestJob) -> None:
+        if not self._settings.tg_progressive_digest:
+            await self._delivery.send(
+                chat_id, f"Generating digest (job #{job.id})...", None
+            )
+            try:
+                digest = await self._run_digest(progress=job.progress)
+                await self._send_long_message(chat_id, digest)
+            except Exception as e:
+                await self._delivery.send(chat_id, f"Digest failed: {e}", None)
+                raise
+            return
+
+        progress = ProgressiveMessage(
+            self._delivery,
+            chat_id,
+            interval=self._settings.tg_edit_interval_seconds,
+        )
+        await progress.start(f"Generating digest (job #{job.id})...")
+        preview = IncrementalDigest(self._settings.deadline_urgent_days)
+
+        def on_item(item: DigestItem) -> None:
+            preview.add(item)
+            progress.update(self._render_preview(preview))
+
         try:
-            digest = await self._run_digest()
-            await self._send_long_message(update.effective_chat.id, digest)
+            digest = await self._run_digest(
+                on_item=on_item, progress=job.progress
+            )
+            await progress.finish(digest)
         except Exception as e:
-            logger.exception("Digest failed")
+            await progress.finish(f"Digest failed: {e}", parse_mode=None)
+            raise
+
+    async def run_scheduled_digest(
+        self, profiles: list[DigestProfile]
+    ) -> None:
+        """Run a scheduled digest as a tracked job and send it to the owner.
+
+        A job already running is waited for first, so scheduled and manual
+        runs never share the state and fetch cache at the same time.
+        """
+        job = await self._jobs.start_when_idle(
+            lambda job: self._scheduled_job(profiles, job)
+        )
+        logger.info(
+            "Digest job #{} started by the schedule for {}",
+            job.id,
+            [p.name for p in profiles],
+        )
+        assert job.task is not None
+        await job.task
+
+    async def _scheduled_job(
+        self, profiles: list[DigestProfile], job: DigestJob
+    ) -> None:
+        digest = await self._run_digest(
+            profiles=profiles, progress=job.progress
+        )
+        await self.send_message(digest)
+        logger.info("Scheduled digest delivered (job #{})", job.id)
+
+    async def _handle_status(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        if not self._is_owner(update):
+            return
+        assert update.effective_chat is not None
+        job = self._jobs.latest
+        if job is None:
             await update.effective_chat.send_message(
-                f"Digest failed: {e}"
+                "No digest jobs since startup."
             )
+            return
+        await update.effective_chat.send_message(job.describe())
+
+    async def _handle_search(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        if not self._is_owner(update):
+            return
+        assert update.effective_chat is not None
+        if self._archive is None:
+            await update.effective_chat.send_message(
+                "The post archive is not enabled."
+            )
+            return
+        query = " ".join(context.args or [])
+        if not query:
+            await update.effective_chat.send_message("Usage: /search <query>")
+            return
+        hits = self._archive.search(query, limit=SEARCH_RESULTS)
+        if not hits:
+            await update.effective_chat.send_message(
+                f"No archived posts match \u201c{query}\u201d."
+            )
+            return
+        lines = [f"Results for \u201c{query}\u201d:"]
+        for i, hit in enumerate(hits, start=1):
+            source = hit.channel_title
+            if hit.kind == "comment":
+                source += f" (comment by {hit.author or 'unknown'})"
+            lines.append("")
+            lines.append(f"{i}. {source} \u2014 {hit.date:%Y-%m-%d}")
+            lines.append(hit.snippet)
+            lines.append(hit.url)
+        # Plain text: snippets are raw post text, not Markdown
+        await self._delivery.send(
+            update.effective_chat.id, "\n".join(lines), parse_mode=None
+        )
+
+    async def _handle_digest_last(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        if not self._is_owner(update):
+            return
+        assert update.effective_chat is not None
+        if self._history is None:
+            await update.effective_chat.send_message(
+                "Digest history is not enabled."
+            )
+            return
+        profile = context.args[0] if context.args else None
+        stored = self._history.latest(profile)
+        if stored is None:
+            await update.effective_chat.send_message("No stored digests yet.")
+            return
+        await self._send_stored(update.effective_chat.id, stored)
+
+    async def _handle_digest_on(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        if not self._is_owner(update):
+            return
+        assert update.effective_chat is not None
+        if self._history is None:
+            await update.effective_chat.send_message(
+                "Digest history is not enabled."
+            )
+            return
+        args = context.args or []
+        try:
+            day = date.fromisoformat(args[0])
+        except (IndexError, ValueError):
+            await update.effective_chat.send_message(
+                "Usage: /digest_on YYYY-MM-DD [profile]"
+            )
+            return
+        profile = args[1] if len(args) > 1 else None
+        stored = self._history.on_date(day, profile)
+        if not stored:
+            await update.effective_chat.send_message(
+                f"No stored digests for {day:%Y-%m-%d}."
+            )
+            return
+        for digest in stored:
+            await self._send_stored(update.effective_chat.id, digest)
+
+    async def _send_stored(self, chat_id: int, stored: StoredDigest) -> None:
+        created = stored.created_at.astimezone()
+        header = (
+            f"_Stored digest from {created:%Y-%m-%d %H:%M}: "
+            f"{stored.post_count} posts from {stored.channel_count} "
+            f"channels_"
+        )
+        await self._delivery.send(chat_id, f"{header}\n\n{stored.digest}")
+
+    def _render_preview(self, preview: IncrementalDigest) -> str:
+        max_items = self._settings.digest_max_items
+        items = preview.top(max_items)
+        text = DigestBuilder().build_digest(
+            [DigestBatchResult(items=items, batch_summary="")],
+            max_items=max_items,
+            urgent_days=self._settings.deadline_urgent_days,
+            title="Digest (in progress)",
+        )
+        return f"{text}\n\n\u23f3 {len(preview)} items so far..."
 
     async def _handle_channels(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
@@ -308,20 +537,38 @@ class TelegramBotController:
             return
         assert update.effective_chat is not None
         try:
-            channels = await self._gateway.get_radar_channels()
             self._state.load()
-            lines = ["Radar Channels:"]
-            for ch in channels:
-                ch_state = self._state.get_channel_state(ch.id)
-                if ch_state:
-                    count = ch_state.last_run_post_count
-                    suffix = f"{count} posts last run"
+            profiles = self._settings.profiles()
+            lines: list[str] = []
+            for profile in profiles:
+                channels = await self._gateway.get_radar_channels(
+                    profile.folder_name
+                )
+                if lines:
+                    lines.append("")
+                if len(profiles) == 1:
+                    lines.append("Radar Channels:")
                 else:
-                    suffix = "no data yet"
-                name = ch.title
-                if ch.username:
-                    name += f" (@{ch.username})"
-                lines.append(f"\u2022 {name} \u2014 {suffix}")
+                    lines.append(
+                        f"{profile.name} ({profile.folder_name}) Channels:"
+                    )
+                for ch in channels:
+                    ch_state = self._state.get_channel_state(
+                        ch.id, profile=profile.name
+                    )
+                    if ch_state:
+                        count = ch_state.last_run_post_count
+                        suffix = f"{count} posts last run"
+                        if ch_state.posts_per_day is not None:
+                            suffix += f", ~{ch_state.posts_per_day:.0f}/day"
+                        if ch_state.last_run_truncated:
+                            suffix += ", truncated"
+                    else:
+                        suffix = "no data yet"
+                    name = ch.title
+                    if ch.username:
+                        name += f" (@{ch.username})"
+                    lines.append(f"\u2022 {name} \u2014 {suffix}")
             await update.effective_chat.send_message("\n".join(lines))
         except Exception as e:
             logger.exception("Channels command failed")
@@ -336,63 +583,92 @@ class TelegramBotController:
             await update.effective_chat.send_message("Please complete the login first.")
             return
         assert update.effective_chat is not None
-        tg_ok = await self._gateway.check_health()
-        llm_ok = await self._summarizer.check_health()
-        tg_status = "\u2705 Connected" if tg_ok else "\u274c Disconnected"
-        llm_status = "\u2705 Reachable" if llm_ok else "\u274c Unreachable"
-        msg = (
-            "Health Status:\n"
-            f"\u2022 Telegram: {tg_status}\n"
-            f"\u2022 LLM: {llm_status}"
-        )
-        await update.effective_chat.send_message(msg)
+        # "/health now" probes on demand; otherwise answer from the
+        # background monitor, probing only if it has no results yet
+        force = bool(context and context.args and context.args[0] == "now")
+        if force or self._health.latest("Telegram") is None:
+            await self._health.probe()
+        await update.effective_chat.send_message(self._render_health())
+
+    def _render_health(self) -> str:
+        lines = ["Health Status:"]
+        for name, up, down in (
+            ("Telegram", "Connected", "Disconnected"),
+            ("LLM", "Reachable", "Unreachable"),
+        ):
+            result = self._health.latest(name)
+            if result is None:
+                lines.append(f"\u2022 {name}: not checked yet")
+                continue
+            status = f"\u2705 {up}" if result.ok else f"\u274c {down}"
+            line = f"\u2022 {name}: {status} ({_ms(result.latency)}"
+            percentiles = self._health.latency_percentiles(name)
+            if percentiles is not None:
+                p50, p95 = percentiles
+                line += f", p50 {_ms(p50)}, p95 {_ms(p95)}"
+            lines.append(line + ")")
+        checked = self._health.latest("Telegram")
+        if checked is not None:
+            lines.append(f"Checked at {checked.checked_at:%H:%M:%S} UTC")
+        return "\n".join(lines)
 
     async def send_message(self, text: str) -> None:
         await self._send_long_message(self._settings.tg_owner_user_id, text)
 
-    async def _send_long_message(
-        self, chat_id: int, text: str, max_len: int = 4096
-    ) -> None:
-        if len(text) <= max_len:
-            await self._app.bot.send_message(
-                chat_id=chat_id, text=text, parse_mode="Markdown"
-            )
-            return
-        # Split on line boundaries
-        chunks: list[str] = []
-        current = ""
-        for line in text.split("\n"):
-            if len(current) + len(line) + 1 > max_len:
-                if current:
-                    chunks.append(current)
-                current = line
-            else:
-                current = f"{current}\n{line}" if current else line
-        if current:
-            chunks.append(current)
-        for chunk in chunks:
-            await self._app.bot.send_message(
-                chat_id=chat_id, text=chunk, parse_mode="Markdown"
-            )
+    async def _send_long_message(self, chat_id: int, text: str) -> None:
+        await self._delivery.send(chat_id, text)
 
     async def start(self) -> None:
         await self._app.initialize()
         await self._app.start()
-        await self._app.updater.start_polling()
-        logger.info("Bot started polling")
+        if self._settings.tg_webhook_url:
+            await self._start_webhook(self._settings.tg_webhook_url)
+        else:
+            await self._app.updater.start_polling()
+            logger.info("Bot started polling")
         try:
             await self._app.bot.set_my_commands([
                 BotCommand("start", "Reset session and re-authenticate"),
                 BotCommand("digest_now", "Generate digest immediately"),
                 BotCommand("channels", "List monitored channels"),
-                BotCommand("health", "Check system health"),
+                BotCommand("health", "Show health; /health now re-checks"),
+                BotCommand("status", "Show digest job progress"),
+                BotCommand("search", "Search archived posts"),
+                BotCommand("digest_last", "Show the last stored digest"),
+                BotCommand("digest_on", "Show stored digests for a date"),
             ])
             logger.info("Bot command menu registered")
         except Exception as e:
             logger.warning("Failed to register command menu: {}", e)
 
+    def start_health_monitor(self) -> None:
+        """Begin background probes; call once the Telegram client is up."""
+        self._health.start()
+
+    async def _start_webhook(self, url: str) -> None:
+        # aiohttp is only needed in webhook mode
+        from telegram_radar.webhook import WebhookServer
+
+        secret = self._settings.tg_webhook_secret or secrets.token_urlsafe(32)
+        self._webhook = WebhookServer(
+            self._app.bot,
+            self._app.update_queue.put,
+            path=urlparse(url).path or "/",
+            secret_token=secret,
+            listen=self._settings.tg_webhook_listen,
+            port=self._settings.tg_webhook_port,
+        )
+        await self._webhook.start()
+        await self._app.bot.set_webhook(url, secret_token=secret)
+        logger.info("Bot receiving updates by webhook at {}", url)
+
     async def stop(self) -> None:
-        await self._app.updater.stop()
+        await self._health.stop()
+        if self._webhook is not None:
+            await self._webhook.stop()
+            self._webhook = None
+        if self._app.updater.running:
+            await self._app.updater.stop()
         await self._app.stop()
         await self._app.shutdown()
         logger.info("Bot stopped")
@@ -0,0 +1,180 @@
+from datetime import datetime, timedelta, timezone
+
+from loguru import logger
+
+from telegram_radar.models import ChannelInfo, DigestItem, Post
+from telegram_radar.protocols import TelegramGateway
+from telegram_radar.settings import Settings
+
+
+class _ChannelEntry:
+    def __init__(self, floor_id: int) -> None:
+        # Every text post with id > floor_id up to the newest fetch is cached
+        self.floor_id = floor_id
+        self.posts: dict[int, Post] = {}
+
+
+class DigestCache:
+    """Fetched posts and per-post summaries shared by all digest profiles."""
+
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+        self._ttl = timedelta(hours=settings.fetch_cache_ttl_hours)
+        self._channels: dict[int, _ChannelEntry] = {}
+        self._items: dict[tuple[str, str], list[DigestItem]] = {}
+
+    async def fetch_posts(
+        self,
+        gateway: TelegramGateway,
+        channel: ChannelInfo,
+        since_message_id: int | None,
+        limit: int | None = None,
+    ) -> tuple[list[Post], bool]:
+        """Posts above the cursor, and whether older posts were skipped.
+
+        ``limit`` is the page size and defaults to
+        ``fetch_limit_per_channel``. With a cursor, pages are fetched until
+        it is reached, so nothing is skipped; without one only the first
+        page is read and the result is truncated if it was full.
+        """
+        limit = limit or self._settings.fetch_limit_per_channel
+        self._prune()
+        entry = self._channels.get(channel.id)
+
+        if (
+            entry is not None
+            and since_message_id is not None
+            and since_message_id >= entry.floor_id
+        ):
+            newest = max(entry.posts, default=entry.floor_id)
+            fresh, _ = await self._fetch(gateway, channel, newest, limit)
+            entry.posts.update((p.id, p) for p in fresh)
+            logger.debug(
+                "Cache hit for '{}': {} new posts", channel.title, len(fresh)
+            )
+            posts = sorted(
+                (p for p in entry.posts.values() if p.id > since_message_id),
+                key=lambda p: p.id,
+                reverse=True,
+            )
+            return posts, False
+
+        posts, truncated = await self._fetch(
+            gateway, channel, since_message_id, limit
+        )
+        if since_message_id is not None and not truncated:
+            # The fetch covers everything above the cursor, so it extends
+            # any existing (newer) coverage down to since_message_id
+            widened = _ChannelEntry(since_message_id)
+            if entry is not None:
+                widened.posts.update(entry.posts)
+            widened.posts.update((p.id, p) for p in posts)
+            self._channels[channel.id] = widened
+        elif posts:
+            self._replace(channel.id, posts)
+        return posts, truncated
+
+    async def fetch_slice(
+        self,
+        gateway: TelegramGateway,
+        channel: ChannelInfo,
+        since_message_id: int,
+        limit: int,
+    ) -> tuple[list[Post], int | None]:
+        """The oldest ``limit`` messages above the cursor, as posts.
+
+        Also returns the cursor the next slice starts from, or None once
+        the backlog is read. Slices bypass the cache: streaming runs use
+        them to hold one slice of a long backlog in memory at a time.
+        """
+        page = await gateway.fetch_posts(
+            channel=channel,
+            since_message_id=since_message_id,
+            since_hours=self._settings.fetch_since_hours,
+            limit=limit,
+            reverse=True,
+        )
+        await self._add_comments(gateway, channel, page.posts)
+        if page.scanned < limit or page.newest_id is None:
+            return page.posts, None
+        return page.posts, page.newest_id
+
+    def get_items(
+        self, instructions: str | None, post: Post
+    ) -> list[DigestItem] | None:
+        return self._items.get((instructions or "", post.permalink))
+
+    def put_items(
+        self, instructions: str | None, post: Post, items: list[DigestItem]
+    ) -> None:
+        self._items[(instructions or "", post.permalink)] = items
+
+    async def _fetch(
+        self,
+        gateway: TelegramGateway,
+        channel: ChannelInfo,
+        since_message_id: int | None,
+        limit: int,
+    ) -> tuple[list[Post], bool]:
+        settings = self._settings
+        posts: list[Post] = []
+        offset_id = 0
+        pages = 0
+        while True:
+            page = await gateway.fetch_posts(
+                channel=channel,
+                since_message_id=since_message_id,
+                since_hours=settings.fetch_since_hours,
+                limit=limit,
+                offset_id=offset_id,
+            )
+            pages += 1
+            posts.extend(page.posts)
+            # A full page means more messages may remain below it; media-
+            # only messages count, as they yield no post but use the page
+            full = page.scanned >= limit
+            if not full or page.oldest_id is None or since_message_id is None:
+                break
+            offset_id = page.oldest_id
+        if pages > 1:
+            logger.info(
+                "Paged {} times to reach the cursor of '{}'",
+                pages,
+                channel.title,
+            )
+        await self._add_comments(gateway, channel, posts)
+        return posts, full and since_message_id is None
+
+    async def _add_comments(
+        self, gateway: TelegramGateway, channel: ChannelInfo, posts: list[Post]
+    ) -> None:
+        for post in posts:
+            post.comments = await gateway.fetch_comments(
+                channel=channel,
+                post=post,
+                limit=self._settings.comments_limit_per_post,
+                max_comment_len=self._settings.comment_max_len,
+            )
+
+    def _replace(self, channel_id: int, posts: list[Post]) -> _ChannelEntry:
+        entry = _ChannelEntry(min(p.id for p in posts) - 1)
+        entry.posts.update((p.id, p) for p in posts)
+        self._channels[channel_id] = entry
+        return entry
+
+    def _prune(self) -> None:
+        cutoff = datetime.now(timezone.utc) - self._ttl
+        expired_links: set[str] = set()
+        for entry in self._channels.values():
+            expired = [p for p in entry.posts.values() if p.date < cutoff]
+            for post in expired:
+                del entry.posts[post.id]
+                entry.floor_id = max(entry.floor_id, post.id)
+                expired_links.add(post.permalink)
+        if expired_links:
+            self._items = {
+                key: items
+                for key, items in self._items.items()
+                if key[1] not in expired_links
+            }
+            logger.debug("Pruned {} cached posts", len(expired_links))
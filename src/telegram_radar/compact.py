@@ -0,0 +1,110 @@
+import re
+from urllib.parse import urlsplit
+
+from telegram_radar.models import Batch, LenientDigestItem
+
+_MD_LINK_RE = re.compile(r"\[([^\]]*)\]\((?:[^()]|\([^)]*\))*\)")
+_URL_RE = re.compile(r"https?://\S+")
+_EMPHASIS_RE = re.compile(r"\*\*|__|~~|`")
+_EMOJI_RE = re.compile(
+    "["
+    "\U0001f000-\U0001faff"
+    "☀-➿"
+    "⬀-⯿"
+    "️‍"
+    "]+"
+)
+# Whole lines that are only a call to follow the channel, optionally
+# naming it or giving a link, or only hashtags and mentions; lines that
+# merely start with such a word ("Подписание договора до 15 марта",
+# "Subscribe by Friday") are content and are kept
+_BOILERPLATE_RE = re.compile(
+    r"^\s*("
+    r"(подписывайтесь|подпишитесь|подпишись|subscribe|join us|follow us)"
+    r"(\s+(to|on|in|на|в)(\s+(our|наш|нашу?))?"
+    r"\s+(channel|канал|telegram|телеграм))?"
+    r"[\s!.:,-]*((@\w+|<[^>\s]+>)[\s!.,]*)*"
+    r"|([#@]\w+\s*)+"
+    r")$",
+    re.IGNORECASE,
+)
+# Upper bounds for what the batch prompt adds around each rendered
+# fragment: the "#P12 C3 2026-01-15 part 2/3" header, separators and the
+# channel legend entry for a post; the "> P12.c10 " prefix and ": " for a
+# comment
+POST_OVERHEAD_CHARS = 44
+COMMENT_OVERHEAD_CHARS = 16
+
+_SPACES_RE = re.compile(r"[ \t]+")
+_BLANK_LINES_RE = re.compile(r"\n{2,}")
+
+
+def _link_host(match: re.Match[str]) -> str:
+    host = urlsplit(match.group(0)).netloc
+    return f"<{host.removeprefix('www.')}>" if host else ""
+
+
+def compact_text(text: str) -> str:
+    """Shrink text for the prompt: markdown, link targets, emoji and
+    signature lines are dropped and whitespace is collapsed."""
+    text = _MD_LINK_RE.sub(r"\1", text)
+    text = _EMPHASIS_RE.sub("", text)
+    text = _URL_RE.sub(_link_host, text)
+    text = _EMOJI_RE.sub("", text)
+    lines = [
+        _SPACES_RE.sub(" ", line).strip()
+        for line in text.splitlines()
+        if not _BOILERPLATE_RE.match(line)
+    ]
+    return _BLANK_LINES_RE.sub("\n", "\n".join(lines)).strip()
+
+
+class CompactBatchPrompt:
+    """Batch prompt that references channels and URLs by short ids.
+
+    Channels become C1, C2, ... and posts P1, P2, ... with comments as
+    P1.c1; ``resolve`` maps the ids in a response back to titles and
+    permalinks.
+    """
+
+    def __init__(self, batch: Batch) -> None:
+        self.urls: dict[str, str] = {}
+        self.channels: dict[str, str] = {}
+        channel_ids: dict[str, str] = {}
+        body: list[str] = []
+
+        for i, payload in enumerate(batch.payloads, start=1):
+            post = payload.post
+            cid = channel_ids.get(post.channel_title)
+            if cid is None:
+                cid = f"C{len(channel_ids) + 1}"
+                channel_ids[post.channel_title] = cid
+                self.channels[cid] = post.channel_title
+            pid = f"P{i}"
+            self.urls[pid] = post.permalink
+            header = f"#{pid} {cid} {post.date.date().isoformat()}"
+            if payload.parts > 1:
+                header += f" part {payload.part}/{payload.parts}"
+            body.append(f"{header}\n{payload.text}")
+            for j, (comment, text) in enumerate(
+                zip(payload.comments, payload.comment_texts), start=1
+            ):
+                comment_id = f"{pid}.c{j}"
+                self.urls[comment_id] = comment.link or post.permalink
+                author = comment.author_name or "Anon"
+                body.append(f"> {comment_id} {author}: {text}")
+
+        header = "Channels: " + "; ".join(
+            f"{cid}={title}" for cid, title in self.channels.items()
+        )
+        self.text = header + "\n\n" + "\n\n".join(body)
+
+    def resolve(self, item: LenientDigestItem) -> LenientDigestItem:
+        source = (item.source_url or "").strip().lstrip("#")
+        channel = (item.channel or "").strip()
+        update: dict[str, str] = {}
+        if source in self.urls:
+            update["source_url"] = self.urls[source]
+        if channel in self.channels:
+            update["channel"] = self.channels[channel]
+        return item.model_copy(update=update) if update else item
@@ -0,0 +1,228 @@
+import asyncio
+import contextlib
+import time
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from typing import TypeVar
+
+from loguru import logger
+from telegram import Bot, Message
+from telegram.error import BadRequest, NetworkError, RetryAfter
+
+MAX_MESSAGE_LEN = 4096
+
+T = TypeVar("T")
+
+
+def _split_line(line: str, max_len: int) -> list[str]:
+    """Cut a line longer than max_len, preferring spaces."""
+    parts: list[str] = []
+    while len(line) > max_len:
+        cut = line.rfind(" ", max_len // 2, max_len)
+        if cut == -1:
+            cut = max_len
+        parts.append(line[:cut].rstrip())
+        line = line[cut:].lstrip()
+    parts.append(line)
+    return parts
+
+
+def split_message(text: str, max_len: int = MAX_MESSAGE_LEN) -> list[str]:
+    """Split text into chunks of at most max_len on line boundaries."""
+    chunks: list[str] = []
+    current = ""
+    for line in text.split("\n"):
+        for part in _split_line(line, max_len):
+            if current and len(current) + len(part) + 1 > max_len:
+                chunks.append(current)
+                current = part
+            else:
+                current = f"{current}\n{part}" if current else part
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _seconds(retry_after: int | float | timedelta) -> float:
+    if isinstance(retry_after, timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+class MessageDelivery:
+    """Outbound message queue paced to Bot API limits.
+
+    Messages are split into chunks up front and sent one chunk at a time
+    per chat, at most one per ``interval`` seconds. Flood-control errors are
+    retried after the server-provided delay, and a chunk whose Markdown is
+    rejected is resent as plain text.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        interval: float = 1.0,
+        max_retries: int = 3,
+    ) -> None:
+        self._bot = bot
+        self._interval = interval
+        self._max_retries = max_retries
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._last_sent: dict[int, float] = {}
+
+    async def send(
+        self, chat_id: int, text: str, parse_mode: str | None = "Markdown"
+    ) -> list[Message]:
+        chunks = split_message(text)
+        lock = self._locks.setdefault(chat_id, asyncio.Lock())
+        # One sender per chat keeps chunks of concurrent digests in order
+        async with lock:
+            sent: list[Message] = []
+            for chunk in chunks:
+                sent.append(await self._send_chunk(chat_id, chunk, parse_mode))
+        if len(chunks) > 1:
+            logger.info("Delivered {} chunks to {}", len(chunks), chat_id)
+        return sent
+
+    async def _pace(self, chat_id: int) -> None:
+        last = self._last_sent.get(chat_id)
+        if last is not None:
+            wait = self._interval - (time.monotonic() - last)
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+    async def edit(
+        self,
+        chat_id: int,
+        message_id: int,
+        text: str,
+        parse_mode: str | None = "Markdown",
+    ) -> None:
+        """Replace a message's text; text must fit in one message."""
+
+        async def call(mode: str | None) -> Message | bool:
+            return await self._bot.edit_message_text(
+                chat_id=chat_id,
+                message_id=message_id,
+                text=text,
+                parse_mode=mode,
+            )
+
+        lock = self._locks.setdefault(chat_id, asyncio.Lock())
+        async with lock:
+            try:
+                await self._with_retries(chat_id, call, parse_mode)
+            except BadRequest as e:
+                # Editing to identical text is harmless
+                if "not modified" not in str(e).lower():
+                    raise
+
+    async def _send_chunk(
+        self, chat_id: int, text: str, parse_mode: str | None
+    ) -> Message:
+        async def call(mode: str | None) -> Message:
+            return await self._bot.send_message(
+                chat_id=chat_id, text=text, parse_mode=mode
+            )
+
+        return await self._with_retries(chat_id, call, parse_mode)
+
+    async def _with_retries(
+        self,
+        chat_id: int,
+        call: Callable[[str | None], Awaitable[T]],
+        parse_mode: str | None,
+    ) -> T:
+        for attempt in range(self._max_retries + 1):
+            await self._pace(chat_id)
+            try:
+                result = await call(parse_mode)
+                self._last_sent[chat_id] = time.monotonic()
+                return result
+            except RetryAfter as e:
+                delay = _seconds(e.retry_after)
+                logger.warning("Flood control, retrying in {:.0f}s", delay)
+                await asyncio.sleep(delay)
+            except BadRequest as e:
+                if parse_mode is None or "parse" not in str(e).lower():
+                    raise
+                logger.warning(
+                    "Markdown rejected ({}), sending chunk as plain text", e
+                )
+                parse_mode = None
+            except NetworkError:
+                if attempt == self._max_retries:
+                    raise
+                logger.warning("Send failed, retrying ({})", attempt + 1)
+                await asyncio.sleep(2**attempt)
+        raise RuntimeError(
+            f"Could not deliver message to {chat_id} after "
+            f"{self._max_retries} retries"
+        )
+
+
+class ProgressiveMessage:
+    """A placeholder message edited in place while content is produced.
+
+    ``update`` may be called as often as convenient: edits are coalesced
+    so at most one is made per ``interval`` seconds, always showing the
+    latest text. ``finish`` turns the placeholder into the final message,
+    sending any overflow as follow-up messages.
+    """
+
+    def __init__(
+        self, delivery: MessageDelivery, chat_id: int, interval: float
+    ) -> None:
+        self._delivery = delivery
+        self._chat_id = chat_id
+        self._interval = interval
+        self._message_id: int | None = None
+        self._pending: str | None = None
+        self._last_edit = 0.0
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self, text: str) -> None:
+        sent = await self._delivery.send(self._chat_id, text, parse_mode=None)
+        self._message_id = sent[0].message_id
+        self._last_edit = time.monotonic()
+
+    def update(self, text: str) -> None:
+        self._pending = split_message(text)[0]
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush())
+
+    async def _flush(self) -> None:
+        while self._pending is not None:
+            wait = self._interval - (time.monotonic() - self._last_edit)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            text, self._pending = self._pending, None
+            if text is None or self._message_id is None:
+                continue
+            try:
+                await self._delivery.edit(
+                    self._chat_id, self._message_id, text
+                )
+            except Exception:
+                logger.warning("Progress update failed, skipping")
+            self._last_edit = time.monotonic()
+
+    async def finish(
+        self, text: str, parse_mode: str | None = "Markdown"
+    ) -> None:
+        self._pending = None
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        chunks = split_message(text)
+        if self._message_id is None:
+            await self._delivery.send(self._chat_id, text, parse_mode)
+            return
+        await self._delivery.edit(
+            self._chat_id, self._message_id, chunks[0], parse_mode
+        )
+        if len(chunks) > 1:
+            await self._delivery.send(
+                self._chat_id, "\n".join(chunks[1:]), parse_mode
+            )
@@ -1,6 +1,18 @@
-from datetime import datetime, timedelta, timezone
+import bisect
+from datetime import date, datetime, timedelta, timezone
 
 from telegram_radar.models import DigestBatchResult, DigestItem
+from telegram_radar.topics import cluster_items
+
+
+def _is_urgent(item: DigestItem, cutoff: date) -> bool:
+    if not item.deadline:
+        return False
+    try:
+        dl = datetime.strptime(item.deadline, "%Y-%m-%d").date()
+    except ValueError:
+        return False
+    return dl <= cutoff
 
 
 class DigestBuilder:
@@ -9,7 +21,16 @@ class DigestBuilder:
         batch_results: list[DigestBatchResult],
         max_items: int,
         urgent_days: int,
+        title: str = "Digest",
+        summary: str | None = None,
+        topic_similarity: float | None = None,
     ) -> str:
+        """Render items, urgent first, as a Markdown message.
+
+        With ``topic_similarity`` set, non-urgent items are grouped under
+        topic headings found by clustering all of them, not only the
+        shown ones.
+        """
         all_items: list[DigestItem] = []
         for br in batch_results:
             all_items.extend(br.items)
@@ -24,15 +45,10 @@ class DigestBuilder:
         other: list[DigestItem] = []
 
         for item in all_items:
-            if item.deadline:
-                try:
-                    dl = datetime.strptime(item.deadline, "%Y-%m-%d").date()
-                    if dl <= cutoff:
-                        urgent.append(item)
-                        continue
-                except ValueError:
-                    pass
-            other.append(item)
+            if _is_urgent(item, cutoff):
+                urgent.append(item)
+            else:
+                other.append(item)
 
         urgent.sort(key=lambda x: x.deadline or "9999-99-99")
         other.sort(key=lambda x: x.priority, reverse=True)
@@ -42,7 +58,10 @@ class DigestBuilder:
         remaining = len(ordered) - len(shown)
 
         today_str = now.isoformat()
-        lines: list[str] = [f"\U0001f4cb Digest \u2014 {today_str}"]
+        lines: list[str] = [f"\U0001f4cb {title} \u2014 {today_str}"]
+        if summary:
+            lines.append("")
+            lines.append(summary)
 
         if urgent:
             lines.append("")
@@ -55,11 +74,17 @@ class DigestBuilder:
                 lines.append(_format_item(item))
             # Switch to other
             other_shown = [i for i in shown if i not in urgent]
-            if other_shown:
+            if other_shown and topic_similarity is not None:
+                lines.extend(
+                    _topic_lines(other_shown, other, topic_similarity)
+                )
+            elif other_shown:
                 lines.append("")
                 lines.append("\U0001f4cc Other highlights:")
                 for item in other_shown:
                     lines.append(_format_item(item))
+        elif topic_similarity is not None:
+            lines.extend(_topic_lines(shown, other, topic_similarity))
         else:
             lines.append("")
             lines.append("\U0001f4cc Highlights:")
@@ -73,6 +98,58 @@ class DigestBuilder:
         return "\n".join(lines)
 
 
+class IncrementalDigest:
+    """Keeps items ranked as they arrive, in final digest order."""
+
+    def __init__(self, urgent_days: int) -> None:
+        self._cutoff = datetime.now(timezone.utc).date() + timedelta(
+            days=urgent_days
+        )
+        self._items: list[DigestItem] = []
+
+    def _key(self, item: DigestItem) -> tuple[int, str, float]:
+        if _is_urgent(item, self._cutoff):
+            return (0, item.deadline or "", -item.priority)
+        return (1, "", -item.priority)
+
+    def add(self, item: DigestItem) -> None:
+        bisect.insort(self._items, item, key=self._key)
+
+    def top(self, n: int) -> list[DigestItem]:
+        return self._items[:n]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def _topic_lines(
+    shown: list[DigestItem], items: list[DigestItem], threshold: float
+) -> list[str]:
+    """Shown items under their topic's heading; lone items at the end."""
+    shown_ids = {id(item) for item in shown}
+    lines: list[str] = []
+    loose: list[DigestItem] = []
+    for topic in cluster_items(items, threshold):
+        visible = [i for i in topic.items if id(i) in shown_ids]
+        if len(topic.items) == 1:
+            loose.extend(visible)
+            continue
+        if not visible:
+            continue
+        hidden = len(topic.items) - len(visible)
+        heading = f"\U0001f5c2 {topic.label}"
+        if hidden:
+            heading += f" (+{hidden} related)"
+        lines.append("")
+        lines.append(heading)
+        lines.extend(_format_item(item) for item in visible)
+    if loose:
+        lines.append("")
+        lines.append("\U0001f4cc Other highlights:")
+        lines.extend(_format_item(item) for item in loose)
+    return lines
+
+
 def _format_item(item: DigestItem) -> str:
     parts: list[str] = [
         f"\u2022 **{item.title}** \u2014 {item.why_relevant}"
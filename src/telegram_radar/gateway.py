@@ -3,7 +3,7 @@ from datetime import datetime, timedelta, timezone
 from loguru import logger
 from telethon import TelegramClient, functions
 
-from telegram_radar.models import ChannelInfo, Comment, Post
+from telegram_radar.models import ChannelInfo, Comment, Post, PostPage
 from telegram_radar.settings import Settings
 
 
@@ -78,11 +78,13 @@ class TelegramClientGateway:
         except Exception:
             return False
 
-    async def get_radar_channels(self) -> list[ChannelInfo]:
+    async def get_radar_channels(
+        self, folder_name: str | None = None
+    ) -> list[ChannelInfo]:
         result = await self._client(
             functions.messages.GetDialogFiltersRequest()
         )
-        folder_name = self._settings.radar_folder_name
+        folder_name = folder_name or self._settings.radar_folder_name
         channels: list[ChannelInfo] = []
 
         for f in result.filters:
@@ -117,10 +119,17 @@ class TelegramClientGateway:
         since_message_id: int | None,
         since_hours: int,
         limit: int,
-    ) -> list[Post]:
+        offset_id: int = 0,
+        reverse: bool = False,
+    ) -> PostPage:
         entity = await self._client.get_entity(channel.id)
         kwargs: dict = {"limit": limit}
 
+        if reverse:
+            # Oldest first, starting just above min_id
+            kwargs["reverse"] = True
+        if offset_id:
+            kwargs["offset_id"] = offset_id
         if since_message_id is not None:
             kwargs["min_id"] = since_message_id
         else:
@@ -128,11 +137,14 @@ class TelegramClientGateway:
                 hours=since_hours
             )
 
-        posts: list[Post] = []
+        page = PostPage(posts=[])
         async for msg in self._client.iter_messages(entity, **kwargs):
+            page.scanned += 1
+            page.oldest_id = min(msg.id, page.oldest_id or msg.id)
+            page.newest_id = max(msg.id, page.newest_id or msg.id)
             if not msg.text:
                 continue
-            posts.append(
+            page.posts.append(
                 Post(
                     id=msg.id,
                     channel_id=channel.id,
@@ -141,13 +153,14 @@ class TelegramClientGateway:
                     date=msg.date,
                     text=msg.text,
                     permalink=_build_permalink(channel, msg.id),
+                    is_forward=msg.fwd_from is not None,
                 )
             )
 
         logger.info(
-            "Fetched {} posts from '{}'", len(posts), channel.title
+            "Fetched {} posts from '{}'", len(page.posts), channel.title
         )
-        return posts
+        return page
 
     async def fetch_comments(
         self,
@@ -184,6 +197,8 @@ class TelegramClientGateway:
                     comment_link = (
                         f"https://t.me/c/{msg.replies.channel_id}/{reply.id}"
                     )
+                reactions = getattr(reply, "reactions", None)
+                replies = getattr(reply, "replies", None)
                 comments.append(
                     Comment(
                         id=reply.id,
@@ -191,6 +206,10 @@ class TelegramClientGateway:
                         date=reply.date,
                         text=text,
                         link=comment_link,
+                        reactions=sum(
+                            r.count for r in getattr(reactions, "results", [])
+                        ),
+                        replies=getattr(replies, "replies", 0) or 0,
                     )
                 )
 
@@ -0,0 +1,122 @@
+import asyncio
+import contextlib
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from loguru import logger
+
+
+@dataclass(slots=True, kw_only=True)
+class ProbeResult:
+    ok: bool
+    latency: float
+    checked_at: datetime
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class HealthMonitor:
+    """Probes dependencies on an interval and keeps recent results.
+
+    Each probe is an async check returning True when healthy. Checks run
+    concurrently, each bounded by ``timeout``; a timeout or exception
+    counts as unhealthy. The last ``history`` results per check are kept
+    for latency percentiles.
+    """
+
+    def __init__(
+        self,
+        probes: dict[str, Callable[[], Awaitable[bool]]],
+        *,
+        interval: float,
+        timeout: float,
+        history: int = 100,
+    ) -> None:
+        self._probes = probes
+        self._interval = interval
+        self._timeout = timeout
+        self._history: dict[str, deque[ProbeResult]] = {
+            name: deque(maxlen=history) for name in probes
+        }
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+
+    async def _probe_one(
+        self, name: str, check: Callable[[], Awaitable[bool]]
+    ) -> ProbeResult:
+        start = time.monotonic()
+        try:
+            async with asyncio.timeout(self._timeout):
+                ok = await check()
+        except TimeoutError:
+            logger.warning(
+                "{} health check timed out after {}s", name, self._timeout
+            )
+            ok = False
+        except Exception as e:
+            logger.warning("{} health check failed: {}", name, e)
+            ok = False
+        return ProbeResult(
+            ok=ok,
+            latency=time.monotonic() - start,
+            checked_at=datetime.now(timezone.utc),
+        )
+
+    async def probe(self) -> dict[str, ProbeResult]:
+        """Run every check now, concurrently, and record the results."""
+        async with self._lock:
+            results = await asyncio.gather(
+                *(
+                    self._probe_one(name, check)
+                    for name, check in self._probes.items()
+                )
+            )
+        latest: dict[str, ProbeResult] = {}
+        for name, result in zip(self._probes, results):
+            previous = self.latest(name)
+            if previous is not None and previous.ok != result.ok:
+                logger.info(
+                    "{} is now {}",
+                    name,
+                    "healthy" if result.ok else "unhealthy",
+                )
+            self._history[name].append(result)
+            latest[name] = result
+        return latest
+
+    def latest(self, name: str) -> ProbeResult | None:
+        history = self._history[name]
+        return history[-1] if history else None
+
+    def latency_percentiles(self, name: str) -> tuple[float, float] | None:
+        """p50 and p95 probe latency in seconds, or None before any probe."""
+        latencies = [r.latency for r in self._history[name]]
+        if not latencies:
+            return None
+        return percentile(latencies, 50), percentile(latencies, 95)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Health monitor probing every {}s", self._interval)
+
+    async def _run(self) -> None:
+        while True:
+            await self.probe()
+            await asyncio.sleep(self._interval)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
@@ -0,0 +1,134 @@
+import sqlite3
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+
+from loguru import logger
+from pydantic import TypeAdapter
+
+from telegram_radar.models import DigestBatchResult
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS digests (
+    id INTEGER PRIMARY KEY,
+    profile TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    duration_seconds REAL NOT NULL,
+    post_count INTEGER NOT NULL,
+    channel_count INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    results TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS digests_created_at ON digests (created_at);
+"""
+
+_COLUMNS = (
+    "id, profile, created_at, duration_seconds, post_count, channel_count, "
+    "digest"
+)
+
+_RESULTS = TypeAdapter(list[DigestBatchResult])
+
+
+@dataclass(slots=True, kw_only=True)
+class StoredDigest:
+    id: int
+    profile: str
+    created_at: datetime
+    duration_seconds: float
+    post_count: int
+    channel_count: int
+    digest: str
+
+
+def _row(row: tuple) -> StoredDigest:
+    id_, profile, created_at, duration, posts, channels, digest = row
+    return StoredDigest(
+        id=id_,
+        profile=profile,
+        created_at=datetime.fromtimestamp(created_at, timezone.utc),
+        duration_seconds=duration,
+        post_count=posts,
+        channel_count=channels,
+        digest=digest,
+    )
+
+
+class DigestHistory:
+    """Every rendered digest with its batch results and run metadata.
+
+    Stored digests can be shown again without touching Telegram or the
+    LLM. Dates are matched in the local timezone, like the schedule.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+
+    def record(
+        self,
+        profile: str,
+        digest: str,
+        results: list[DigestBatchResult],
+        *,
+        post_count: int,
+        channel_count: int,
+        duration_seconds: float,
+    ) -> int:
+        with self._db:
+            cursor = self._db.execute(
+                "INSERT INTO digests (profile, created_at, duration_seconds,"
+                " post_count, channel_count, digest, results)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    profile,
+                    int(datetime.now(timezone.utc).timestamp()),
+                    duration_seconds,
+                    post_count,
+                    channel_count,
+                    digest,
+                    _RESULTS.dump_json(results).decode(),
+                ),
+            )
+        digest_id = cursor.lastrowid
+        assert digest_id is not None
+        logger.debug("Stored digest #{} for profile '{}'", digest_id, profile)
+        return digest_id
+
+    def latest(self, profile: str | None = None) -> StoredDigest | None:
+        sql = f"SELECT {_COLUMNS} FROM digests"
+        params: tuple = ()
+        if profile is not None:
+            sql += " WHERE profile = ?"
+            params = (profile,)
+        row = self._db.execute(
+            sql + " ORDER BY created_at DESC, id DESC LIMIT 1", params
+        ).fetchone()
+        return _row(row) if row else None
+
+    def on_date(
+        self, day: date, profile: str | None = None
+    ) -> list[StoredDigest]:
+        """Digests created on a local calendar day, oldest first."""
+        start = datetime.combine(day, time.min).astimezone()
+        end = start + timedelta(days=1)
+        sql = (
+            f"SELECT {_COLUMNS} FROM digests"
+            " WHERE created_at >= ? AND created_at < ?"
+        )
+        params: tuple = (int(start.timestamp()), int(end.timestamp()))
+        if profile is not None:
+            sql += " AND profile = ?"
+            params += (profile,)
+        rows = self._db.execute(sql + " ORDER BY created_at, id", params)
+        return [_row(row) for row in rows]
+
+    def results(self, digest_id: int) -> list[DigestBatchResult]:
+        row = self._db.execute(
+            "SELECT results FROM digests WHERE id = ?", (digest_id,)
+        ).fetchone()
+        return _RESULTS.validate_json(row[0]) if row else []
+
+    def close(self) -> None:
+        self._db.close()
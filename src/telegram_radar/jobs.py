@@ -0,0 +1,91 @@
+import asyncio
+from collections.abc import Callable, Coroutine
+from datetime import datetime, timezone
+from typing import Any
+
+from loguru import logger
+
+from telegram_radar.models import RunProgress
+
+
+class DigestJob:
+    def __init__(self, job_id: int) -> None:
+        self.id = job_id
+        self.progress = RunProgress()
+        self.started_at = datetime.now(timezone.utc)
+        self.finished_at: datetime | None = None
+        self.error: str | None = None
+        self.task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self.finished_at is None
+
+    def describe(self) -> str:
+        p = self.progress
+        if self.error is not None:
+            status = f"failed: {self.error}"
+        elif self.running:
+            status = p.stage
+        else:
+            status = "finished"
+        end = self.finished_at or datetime.now(timezone.utc)
+        elapsed = (end - self.started_at).total_seconds()
+        return (
+            f"Digest job #{self.id}: {status}\n"
+            f"• Channels: {p.channels_done}/{p.channels_total}\n"
+            f"• Batches: {p.batches_done}/{p.batches_total}\n"
+            f"• Elapsed: {elapsed:.0f}s"
+        )
+
+
+class DigestJobs:
+    """Runs digests as background tasks, one at a time, and tracks them."""
+
+    def __init__(self) -> None:
+        self._next_id = 1
+        self.latest: DigestJob | None = None
+
+    def running(self) -> DigestJob | None:
+        if self.latest is not None and self.latest.running:
+            return self.latest
+        return None
+
+    def start(
+        self, run: Callable[[DigestJob], Coroutine[Any, Any, None]]
+    ) -> DigestJob:
+        if self.running() is not None:
+            raise RuntimeError("A digest job is already running")
+        job = DigestJob(self._next_id)
+        self._next_id += 1
+        self.latest = job
+        job.task = asyncio.create_task(self._run(job, run))
+        logger.info("Started digest job #{}", job.id)
+        return job
+
+    async def start_when_idle(
+        self, run: Callable[[DigestJob], Coroutine[Any, Any, None]]
+    ) -> DigestJob:
+        """Wait for the running job, if any, to end, then start ``run``."""
+        while (running := self.running()) is not None:
+            assert running.task is not None
+            logger.info("Waiting for digest job #{} to end", running.id)
+            # wait() rather than await, so cancelling the waiter leaves
+            # the running job alone
+            await asyncio.wait({running.task})
+        return self.start(run)
+
+    async def _run(
+        self,
+        job: DigestJob,
+        run: Callable[[DigestJob], Coroutine[Any, Any, None]],
+    ) -> None:
+        try:
+            await run(job)
+        except Exception as e:
+            job.error = str(e) or type(e).__name__
+            logger.exception("Digest job #{} failed", job.id)
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            elapsed = (job.finished_at - job.started_at).total_seconds()
+            logger.info("Digest job #{} ended after {:.1f}s", job.id, elapsed)
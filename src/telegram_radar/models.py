@@ -1,7 +1,10 @@
+from dataclasses import dataclass, field
 from datetime import datetime
 
 from pydantic import BaseModel, Field
 
+DEFAULT_PROFILE = "default"
+
 
 class ChannelInfo(BaseModel):
     id: int
@@ -9,15 +12,23 @@ class ChannelInfo(BaseModel):
     username: str | None = None
 
 
-class Comment(BaseModel):
+# Hot-path records: built for every fetched message, so they are plain
+# slotted dataclasses; pydantic is kept for LLM schemas and persisted state
+
+
+@dataclass(slots=True, kw_only=True)
+class Comment:
     id: int
     author_name: str | None = None
     date: datetime
     text: str
     link: str | None = None
+    reactions: int = 0
+    replies: int = 0
 
 
-class Post(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class Post:
     id: int
     channel_id: int
     channel_title: str
@@ -25,22 +36,55 @@ class Post(BaseModel):
     date: datetime
     text: str
     permalink: str
-    comments: list[Comment] = Field(default_factory=list)
+    is_forward: bool = False
+    comments: list[Comment] = field(default_factory=list)
 
 
-class PostPayload(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class PostPage:
+    posts: list[Post]
+    # Raw messages read, including media-only ones that yield no post
+    scanned: int = 0
+    # Lowest message id read; the offset for the next, older page
+    oldest_id: int | None = None
+    # Highest message id read; the cursor for the next, newer slice
+    newest_id: int | None = None
+
+
+@dataclass(slots=True, kw_only=True)
+class PostPayload:
     post: Post
+    # Prompt fragments rendered once and used for both the char budget and
+    # the batch prompt: the compacted post text (or one chunk of it) and
+    # the compacted texts of the selected comments
+    text: str
     comments: list[Comment]
+    comment_texts: list[str]
     char_count: int
+    # 1-based chunk number of an oversized post split across payloads
+    part: int = 1
+    parts: int = 1
 
 
-class Batch(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class Batch:
     payloads: list[PostPayload]
     total_chars: int
     post_count: int
     comment_count: int
 
 
+@dataclass(slots=True)
+class RunProgress:
+    """Live counters of a digest run, updated in place by the pipeline."""
+
+    stage: str = "starting"
+    channels_total: int = 0
+    channels_done: int = 0
+    batches_total: int = 0
+    batches_done: int = 0
+
+
 # LLM output models (used with instructor)
 
 class DigestItem(BaseModel):
@@ -61,11 +105,71 @@ class DigestBatchResult(BaseModel):
     batch_summary: str
 
 
+# Lenient mirrors of the LLM output models: the response is accepted as
+# long as it is well-formed, and items are validated one by one afterwards
+
+class LenientDigestItem(BaseModel):
+    title: str | None = None
+    why_relevant: str | None = None
+    source_url: str | None = None
+    post_quote: str | None = Field(default=None, description="max 160 chars")
+    comment_quote: str | None = Field(
+        default=None, description="max 160 chars"
+    )
+    deadline: str | None = Field(default=None, description="YYYY-MM-DD")
+    action: str | None = None
+    channel: str | None = None
+    date: str | None = Field(default=None, description="YYYY-MM-DD")
+    priority: float | str | None = Field(default=None, description="0.0-1.0")
+
+
+class LenientBatchResult(BaseModel):
+    items: list[LenientDigestItem]
+    batch_summary: str = ""
+
+
+class TriageScore(BaseModel):
+    index: int
+    score: float = Field(ge=0.0, le=1.0)
+
+
+class TriageResult(BaseModel):
+    scores: list[TriageScore]
+
+
+class TierUsage(BaseModel):
+    calls: int = 0
+    seconds: float = 0.0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+    # Calls without token counts (streamed output), left out of the totals
+    unmetered_calls: int = 0
+
+
+# Digest profiles
+
+class DigestProfile(BaseModel):
+    name: str
+    folder_name: str
+    hour: int = Field(default=9, ge=0, le=23)
+    minute: int = Field(default=0, ge=0, le=59)
+    max_items: int | None = None
+    prompt: str | None = None
+
+
 # State persistence models
 
 class ChannelState(BaseModel):
     last_processed_message_id: int
     last_run_post_count: int = 0
+    # Posting rate smoothed across runs; sizes the next fetch
+    posts_per_day: float | None = None
+    updated_at: datetime | None = None
+    # The fetch hit its limit, so posts between the previous cursor and
+    # the oldest fetched post were skipped
+    last_run_truncated: bool = False
+    truncated_at: datetime | None = None
 
 
 class LastRun(BaseModel):
@@ -75,4 +179,7 @@ class LastRun(BaseModel):
 
 class AppState(BaseModel):
     channels: dict[str, ChannelState] = Field(default_factory=dict)
+    profile_channels: dict[str, dict[str, ChannelState]] = Field(
+        default_factory=dict
+    )
     last_run: LastRun = Field(default_factory=LastRun)
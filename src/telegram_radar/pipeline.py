@@ -1,10 +1,104 @@
+import asyncio
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
 from loguru import logger
 
+from telegram_radar.archive import PostArchive
 from telegram_radar.batch_builder import BatchBuilder
+from telegram_radar.cache import DigestCache
 from telegram_radar.digest_builder import DigestBuilder
-from telegram_radar.models import Post
+from telegram_radar.history import DigestHistory
+from telegram_radar.models import (
+    DEFAULT_PROFILE,
+    Batch,
+    ChannelInfo,
+    ChannelState,
+    DigestBatchResult,
+    DigestItem,
+    DigestProfile,
+    Post,
+    RunProgress,
+)
+from telegram_radar.prefilter import RelevanceFilter
 from telegram_radar.protocols import StateRepository, Summarizer, TelegramGateway
+from telegram_radar.reducer import DigestReducer, merge_overlapping
 from telegram_radar.settings import Settings
+from telegram_radar.spool import ResultSpool
+from telegram_radar.triage import PostTriage
+
+NO_POSTS_MESSAGE = "No new posts found in Radar channels since last check."
+
+
+@dataclass(slots=True, kw_only=True)
+class _ChannelRun:
+    """New posts a profile got from a channel over one run."""
+
+    last_id: int = 0
+    post_count: int = 0
+    truncated: bool = False
+
+
+def _item_owners(batch: Batch, result: DigestBatchResult) -> list[str]:
+    """Map each returned item to the permalink of the post it came from."""
+    by_url: dict[str, str] = {}
+    by_channel: dict[str, str] = {}
+    for payload in batch.payloads:
+        link = payload.post.permalink
+        by_url[link] = link
+        by_channel.setdefault(payload.post.channel_title, link)
+        for comment in payload.comments:
+            if comment.link:
+                by_url[comment.link] = link
+    fallback = batch.payloads[0].post.permalink
+    return [
+        by_url.get(item.source_url) or by_channel.get(item.channel) or fallback
+        for item in result.items
+    ]
+
+
+def fetch_limit(
+    states: list[ChannelState | None], settings: Settings
+) -> int:
+    """Page size for fetching a channel, sized by its posting rate.
+
+    The expected volume since each profile's cursor was set, times
+    ``fetch_limit_headroom``, is clamped between the per-channel minimum
+    and maximum, so a backlog is usually read in one page. A channel
+    truncated last run gets the maximum.
+    """
+    floor = settings.fetch_limit_per_channel
+    cap = max(settings.fetch_limit_max_per_channel, floor)
+    now = datetime.now(timezone.utc)
+    limit = floor
+    for st in states:
+        if st is None:
+            continue
+        if st.last_run_truncated:
+            return cap
+        if st.posts_per_day is None or st.updated_at is None:
+            continue
+        days = (now - st.updated_at).total_seconds() / 86400
+        expected = st.posts_per_day * days * settings.fetch_limit_headroom
+        limit = max(limit, math.ceil(expected))
+    return min(limit, cap)
+
+
+def _drop_unselected(
+    posts: list[Post],
+    kept: list[Post],
+    prompt: str | None,
+    cache: DigestCache,
+) -> list[Post]:
+    """Cache filtered-out posts as itemless so they are not reconsidered."""
+    kept_links = {p.permalink for p in kept}
+    for post in posts:
+        if post.permalink not in kept_links:
+            cache.put_items(prompt, post, [])
+    return kept
 
 
 async def run_digest(
@@ -14,75 +108,470 @@ async def run_digest(
     digest_builder: DigestBuilder,
     state: StateRepository,
     settings: Settings,
+    profiles: list[DigestProfile] | None = None,
+    cache: DigestCache | None = None,
+    reducer: DigestReducer | None = None,
+    prefilter: RelevanceFilter | None = None,
+    triage: PostTriage | None = None,
+    on_item: Callable[[DigestItem], None] | None = None,
+    progress: RunProgress | None = None,
+    archive: PostArchive | None = None,
+    history: DigestHistory | None = None,
 ) -> str:
     logger.info("Starting digest run")
     state.load()
+    profiles = profiles or settings.profiles()
+    cache = cache or DigestCache(settings)
+    started = time.monotonic()
+    progress = progress or RunProgress()
+    progress.stage = "discovering channels"
 
-    channels = await gateway.get_radar_channels()
-    if not channels:
-        logger.error("No channels found in '{}' folder", settings.radar_folder_name)
-        return (
-            f"Error: No channels found in '{settings.radar_folder_name}' folder."
-        )
+    outputs: dict[str, str] = {}
+    channels_by_profile: dict[str, list[ChannelInfo]] = {}
+    for profile in profiles:
+        channels = await gateway.get_radar_channels(profile.folder_name)
+        if not channels:
+            logger.error(
+                "No channels found in '{}' folder", profile.folder_name
+            )
+            outputs[profile.name] = (
+                f"Error: No channels found in '{profile.folder_name}' folder."
+            )
+            continue
+        channels_by_profile[profile.name] = channels
 
-    all_posts: list[Post] = []
-    parsed_names: list[str] = []
+    if not channels_by_profile:
+        return "\n\n".join(outputs.values())
 
-    for ch in channels:
-        last_id = state.get_last_message_id(ch.id)
-        posts = await gateway.fetch_posts(
-            channel=ch,
-            since_message_id=last_id,
-            since_hours=settings.fetch_since_hours,
-            limit=settings.fetch_limit_per_channel,
+    # Fetch every channel once, starting from the oldest cursor any
+    # profile still needs
+    unique_channels: dict[int, ChannelInfo] = {}
+    cursors: dict[str, dict[int, int | None]] = {}
+    for name, channels in channels_by_profile.items():
+        cursors[name] = {}
+        for ch in channels:
+            unique_channels.setdefault(ch.id, ch)
+            cursors[name][ch.id] = state.get_last_message_id(
+                ch.id, profile=name
+            )
+
+    parsed_names = [ch.title for ch in unique_channels.values()]
+    channel_list = list(unique_channels.values())
+    progress.channels_total = len(channel_list)
+    # In streaming mode each chunk of channels is fetched, summarized and
+    # spooled to disk before the next one is loaded
+    streaming = settings.stream_chunk_channels > 0
+    chunk_size = settings.stream_chunk_channels or len(channel_list)
+    chunks = [
+        channel_list[i : i + chunk_size]
+        for i in range(0, len(channel_list), chunk_size)
+    ]
+    post_counts = dict.fromkeys(channels_by_profile, 0)
+    results_by_profile: dict[str, list[DigestBatchResult]] = {
+        name: [] for name in channels_by_profile
+    }
+
+    # A busy channel's backlog is read in slices, each one summarized and
+    # spooled before the next is fetched
+    slice_size = settings.stream_chunk_posts if streaming else 0
+    runs: dict[tuple[str, int], _ChannelRun] = {}
+    with ResultSpool() as spool:
+        for i, chunk in enumerate(chunks):
+            if streaming:
+                logger.info(
+                    "Streaming chunk {}/{}: {} channels",
+                    i + 1,
+                    len(chunks),
+                    len(chunk),
+                )
+            pending, first = chunk, True
+            while pending:
+                if not first:
+                    logger.info(
+                        "Reading the next slice of {} channels", len(pending)
+                    )
+                # A throwaway cache keeps posts from outliving their chunk
+                chunk_cache = DigestCache(settings) if streaming else cache
+                progress.stage = "fetching"
+                posts_by_profile, pending = await _fetch_chunk(
+                    pending,
+                    channels_by_profile,
+                    cursors,
+                    gateway,
+                    chunk_cache,
+                    state,
+                    settings,
+                    progress,
+                    runs,
+                    slice_size=slice_size,
+                    window=first,
+                )
+                first = False
+                for name, posts in posts_by_profile.items():
+                    post_counts[name] += len(posts)
+                    if archive is not None:
+                        archive.add_posts(posts)
+                progress.stage = "summarizing"
+                chunk_results = await _summarize_profiles(
+                    profiles,
+                    posts_by_profile,
+                    batch_builder,
+                    summarizer,
+                    chunk_cache,
+                    settings,
+                    prefilter,
+                    triage,
+                    on_item,
+                    progress,
+                )
+                del posts_by_profile, chunk_cache
+                for name, results in chunk_results.items():
+                    if streaming:
+                        spool.append(name, results)
+                    else:
+                        results_by_profile[name].extend(results)
+        if streaming:
+            logger.info("Spooled {} batch results to disk", spool.count)
+            results_by_profile = {
+                name: spool.read(name) for name in channels_by_profile
+            }
+    # Written once per run so a sliced backlog counts as one fetch in the
+    # posting rate
+    for (name, channel_id), run in runs.items():
+        state.update_channel(
+            channel_id,
+            run.last_id,
+            run.post_count,
+            profile=name,
+            truncated=run.truncated,
         )
+    if prefilter is not None:
+        prefilter.save()
+    if archive is not None:
+        archive.prune()
 
-        for post in posts:
-            comments = await gateway.fetch_comments(
-                channel=ch,
-                post=post,
-                limit=settings.comments_limit_per_post,
-                max_comment_len=settings.comment_max_len,
+    progress.stage = "building digest"
+    for profile in profiles:
+        if profile.name not in channels_by_profile:
+            continue
+        if not post_counts[profile.name]:
+            outputs[profile.name] = NO_POSTS_MESSAGE
+            continue
+        title = (
+            "Digest"
+            if profile.name == DEFAULT_PROFILE
+            else f"{profile.name} Digest"
+        )
+        max_items = profile.max_items or settings.digest_max_items
+        profile_results = results_by_profile[profile.name]
+        summary = None
+        # Days that fit the digest are shown as before, without LLM calls
+        total_items = sum(len(r.items) for r in profile_results)
+        if reducer is not None and total_items > max_items:
+            reduced = await reducer.reduce(profile_results, max_items)
+            profile_results = [reduced]
+            summary = reduced.batch_summary
+        outputs[profile.name] = digest_builder.build_digest(
+            profile_results,
+            max_items=max_items,
+            urgent_days=settings.deadline_urgent_days,
+            title=title,
+            summary=summary,
+            topic_similarity=settings.digest_topic_similarity
+            if settings.digest_group_by_topic
+            else None,
+        )
+        if history is not None:
+            history.record(
+                profile.name,
+                outputs[profile.name],
+                results_by_profile[profile.name],
+                post_count=post_counts[profile.name],
+                channel_count=len(channels_by_profile[profile.name]),
+                duration_seconds=time.monotonic() - started,
             )
-            post.comments = comments
 
-        all_posts.extend(posts)
-        parsed_names.append(ch.title)
+    state.record_last_run(channels_parsed=parsed_names)
+    state.save()
+    progress.stage = "done"
 
-        if posts:
-            max_id = max(p.id for p in posts)
-            state.update_channel(ch.id, max_id, len(posts))
+    logger.info("Digest run complete")
+    return "\n\n".join(outputs[p.name] for p in profiles)
 
-    logger.info(
-        "Fetched {} posts across {} channels",
-        len(all_posts),
-        len(channels),
-    )
 
-    if not all_posts:
-        state.record_last_run(channels_parsed=parsed_names)
-        state.save()
-        return "No new posts found in Radar channels since last check."
+async def _fetch_chunk(
+    channels: list[ChannelInfo],
+    channels_by_profile: dict[str, list[ChannelInfo]],
+    cursors: dict[str, dict[int, int | None]],
+    gateway: TelegramGateway,
+    cache: DigestCache,
+    state: StateRepository,
+    settings: Settings,
+    progress: RunProgress,
+    runs: dict[tuple[str, int], _ChannelRun],
+    slice_size: int = 0,
+    window: bool = True,
+) -> tuple[dict[str, list[Post]], list[ChannelInfo]]:
+    """Fetch channels once each and split new posts by profile cursor.
 
-    batches = batch_builder.build_batches(
-        all_posts, settings.llm_max_chars_per_batch
+    A channel is paged down to the lowest cursor any profile has for it.
+    Profiles without a cursor get the ``fetch_since_hours`` window, read
+    by a separate fetch, so a new profile never cuts short the backlog of
+    one that has a cursor. With ``slice_size``, only that many messages
+    above the lowest cursor are read, oldest first; the cursors are moved
+    past them and the channels with more to read are returned, to be
+    fetched again with ``window`` off.
+    """
+    by_cursor: dict[int, list[Post]] = {}
+    by_window: dict[int, list[Post]] = {}
+    truncated: set[int] = set()
+    pending: dict[int, int] = {}
+    for ch in channels:
+        needed = [c[ch.id] for c in cursors.values() if ch.id in c]
+        set_cursors = [c for c in needed if c is not None]
+        limit = fetch_limit(
+            [
+                state.get_channel_state(ch.id, profile=name)
+                for name, c in cursors.items()
+                if ch.id in c
+            ],
+            settings,
+        )
+        # The window fetch goes first so a cursor fetch inside the window
+        # is served from the cache
+        if window and None in needed:
+            by_window[ch.id], hit_limit = await cache.fetch_posts(
+                gateway, ch, None, limit
+            )
+            if hit_limit:
+                truncated.add(ch.id)
+                logger.warning(
+                    "'{}' hit its fetch limit of {}, older posts were "
+                    "skipped",
+                    ch.title,
+                    limit,
+                )
+        if set_cursors and slice_size:
+            by_cursor[ch.id], next_cursor = await cache.fetch_slice(
+                gateway, ch, min(set_cursors), slice_size
+            )
+            if next_cursor is not None:
+                pending[ch.id] = next_cursor
+        elif set_cursors:
+            by_cursor[ch.id], _ = await cache.fetch_posts(
+                gateway, ch, min(set_cursors), limit
+            )
+        if ch.id not in pending:
+            progress.channels_done += 1
+
+    total = sum(
+        len({p.id for d in (by_cursor, by_window) for p in d.get(ch.id, [])})
+        for ch in channels
     )
-    logger.info("Built {} batches", len(batches))
-
-    batch_results = []
-    for i, batch in enumerate(batches):
-        logger.info("Summarizing batch {}/{}", i + 1, len(batches))
-        result = await summarizer.summarize_batch(batch)
-        batch_results.append(result)
-
-    digest = digest_builder.build_digest(
-        batch_results,
-        max_items=settings.digest_max_items,
-        urgent_days=settings.deadline_urgent_days,
+    logger.info("Fetched {} posts across {} channels", total, len(channels))
+
+    chunk_ids = {ch.id for ch in channels}
+    posts_by_profile: dict[str, list[Post]] = {}
+    for name, profile_channels in channels_by_profile.items():
+        profile_posts: list[Post] = []
+        for ch in profile_channels:
+            if ch.id not in chunk_ids:
+                continue
+            cursor = cursors[name][ch.id]
+            if cursor is None:
+                posts = by_window.get(ch.id, [])
+            else:
+                posts = [p for p in by_cursor.get(ch.id, []) if p.id > cursor]
+                if ch.id in pending:
+                    cursors[name][ch.id] = max(cursor, pending[ch.id])
+            if posts:
+                run = runs.setdefault((name, ch.id), _ChannelRun())
+                run.last_id = max(run.last_id, *(p.id for p in posts))
+                run.post_count += len(posts)
+                run.truncated |= cursor is None and ch.id in truncated
+            profile_posts.extend(posts)
+        posts_by_profile[name] = profile_posts
+    return posts_by_profile, [ch for ch in channels if ch.id in pending]
+
+
+async def _summarize_profiles(
+    profiles: list[DigestProfile],
+    posts_by_profile: dict[str, list[Post]],
+    batch_builder: BatchBuilder,
+    summarizer: Summarizer,
+    cache: DigestCache,
+    settings: Settings,
+    prefilter: RelevanceFilter | None,
+    triage: PostTriage | None,
+    on_item: Callable[[DigestItem], None] | None,
+    progress: RunProgress,
+) -> dict[str, list[DigestBatchResult]]:
+    """Summarize posts once per distinct prompt across profiles."""
+    results: dict[str, list[DigestBatchResult]] = {}
+    prompts = dict.fromkeys(
+        p.prompt for p in profiles if posts_by_profile.get(p.name)
     )
+    for prompt in prompts:
+        group = [
+            p
+            for p in profiles
+            if p.prompt == prompt and posts_by_profile.get(p.name)
+        ]
+        group_results = await _summarize_group(
+            group,
+            posts_by_profile,
+            prompt,
+            batch_builder,
+            summarizer,
+            cache,
+            settings,
+            prefilter,
+            triage,
+            on_item,
+            progress,
+        )
+        results.update(group_results)
+    return results
 
-    state.record_last_run(channels_parsed=parsed_names)
-    state.save()
 
-    logger.info("Digest run complete")
-    return digest
+def _merge_parts(
+    batches: list[Batch], batch_results: list[DigestBatchResult]
+) -> list[tuple[DigestBatchResult, list[str]]]:
+    """Pair results with item owners, merging items of split posts.
+
+    Parts of one post may land in different batches; their items are
+    pulled out and merged into one result per post, collapsing the
+    repeats produced by the overlapping text.
+    """
+    split = {
+        p.post.permalink for b in batches for p in b.payloads if p.parts > 1
+    }
+    merged: list[tuple[DigestBatchResult, list[str]]] = []
+    part_items: dict[str, list[DigestItem]] = {}
+    for batch, result in zip(batches, batch_results):
+        owners = _item_owners(batch, result)
+        kept: list[tuple[DigestItem, str]] = []
+        for item, owner in zip(result.items, owners):
+            if owner in split:
+                part_items.setdefault(owner, []).append(item)
+            else:
+                kept.append((item, owner))
+        merged.append(
+            (
+                DigestBatchResult(
+                    items=[item for item, _ in kept],
+                    batch_summary=result.batch_summary,
+                ),
+                [owner for _, owner in kept],
+            )
+        )
+    for link, items in part_items.items():
+        result = DigestBatchResult(
+            items=merge_overlapping(items), batch_summary=""
+        )
+        logger.info(
+            "Merged {} items from parts of {} into {}",
+            len(items),
+            link,
+            len(result.items),
+        )
+        merged.append((result, [link] * len(result.items)))
+    return merged
+
+
+async def _summarize_group(
+    group: list[DigestProfile],
+    posts_by_profile: dict[str, list[Post]],
+    prompt: str | None,
+    batch_builder: BatchBuilder,
+    summarizer: Summarizer,
+    cache: DigestCache,
+    settings: Settings,
+    prefilter: RelevanceFilter | None,
+    triage: PostTriage | None,
+    on_item: Callable[[DigestItem], None] | None,
+    progress: RunProgress,
+) -> dict[str, list[DigestBatchResult]]:
+    """Summarize the union of posts for profiles sharing one prompt."""
+    unique_posts: dict[str, Post] = {}
+    for profile in group:
+        for post in posts_by_profile[profile.name]:
+            unique_posts.setdefault(post.permalink, post)
+
+    pending = [
+        p for p in unique_posts.values() if cache.get_items(prompt, p) is None
+    ]
+    fresh_links = {p.permalink for p in pending}
+    if prefilter is not None:
+        pending = _drop_unselected(
+            pending, prefilter.filter(pending), prompt, cache
+        )
+    if triage is not None and pending:
+        shortlisted = await triage.shortlist(pending, instructions=prompt)
+        pending = _drop_unselected(pending, shortlisted, prompt, cache)
+
+    fresh: list[tuple[DigestBatchResult, list[str]]] = []
+    if pending:
+        batches = batch_builder.build_batches(
+            pending, settings.llm_max_chars_per_batch
+        )
+        logger.info("Built {} batches", len(batches))
+        progress.batches_total += len(batches)
+        semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
+
+        async def summarize(i: int, batch: Batch) -> DigestBatchResult:
+            async with semaphore:
+                logger.info("Summarizing batch {}/{}", i + 1, len(batches))
+                result = await summarizer.summarize_batch(
+                    batch, instructions=prompt, on_item=on_item
+                )
+                progress.batches_done += 1
+                return result
+
+        batch_results = await asyncio.gather(
+            *(summarize(i, batch) for i, batch in enumerate(batches))
+        )
+        fresh = _merge_parts(batches, batch_results)
+
+        items_by_link: dict[str, list[DigestItem]] = {}
+        for result, owners in fresh:
+            for item, owner in zip(result.items, owners):
+                items_by_link.setdefault(owner, []).append(item)
+        summarized = {
+            p.post.permalink: p.post for b in batches for p in b.payloads
+        }
+        for link, post in summarized.items():
+            items = items_by_link.get(link, [])
+            cache.put_items(prompt, post, items)
+            if prefilter is not None:
+                prefilter.learn(post, selected=bool(items))
+
+    results: dict[str, list[DigestBatchResult]] = {}
+    for profile in group:
+        links = {p.permalink for p in posts_by_profile[profile.name]}
+        profile_results: list[DigestBatchResult] = []
+        for result, owners in fresh:
+            items = [it for it, o in zip(result.items, owners) if o in links]
+            if items:
+                profile_results.append(
+                    DigestBatchResult(
+                        items=items, batch_summary=result.batch_summary
+                    )
+                )
+        cached_items = [
+            item
+            for post in posts_by_profile[profile.name]
+            if post.permalink not in fresh_links
+            for item in cache.get_items(prompt, post) or []
+        ]
+        if cached_items:
+            logger.info(
+                "Reusing {} cached items for profile '{}'",
+                len(cached_items),
+                profile.name,
+            )
+            profile_results.append(
+                DigestBatchResult(items=cached_items, batch_summary="")
+            )
+        results[profile.name] = profile_results
+    return results
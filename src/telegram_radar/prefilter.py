@@ -0,0 +1,169 @@
+import json
+import math
+import re
+import zlib
+from pathlib import Path
+
+from loguru import logger
+
+from telegram_radar.models import Post
+from telegram_radar.settings import Settings
+
+_N_FEATURES = 1 << 18
+_TOKEN_RE = re.compile(r"\w+")
+_UNTRAINED_SCORE = 0.5
+_SHORT_FACTOR = 0.2
+_FORWARD_FACTOR = 0.5
+
+
+def _features(text: str) -> list[int]:
+    tokens = _TOKEN_RE.findall(text.lower())
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    # crc32 is stable across processes, unlike hash()
+    return sorted({zlib.crc32(g.encode()) % _N_FEATURES for g in grams})
+
+
+class HashedClassifier:
+    """Logistic regression over hashed word unigrams and bigrams."""
+
+    def __init__(self) -> None:
+        self.bias = 0.0
+        self.weights: dict[int, float] = {}
+        self.samples = 0
+        self.positives = 0
+
+    @property
+    def base_rate(self) -> float:
+        """Smoothed share of learned posts that were selected."""
+        return (self.positives + 1) / (self.samples + 2)
+
+    def predict(self, text: str) -> float:
+        z = self.bias + sum(self.weights.get(f, 0.0) for f in _features(text))
+        return 1.0 / (1.0 + math.exp(-max(-30.0, min(30.0, z))))
+
+    def learn(self, text: str, selected: bool, lr: float = 0.1) -> None:
+        features = _features(text)
+        if not features:
+            return
+        error = (1.0 if selected else 0.0) - self.predict(text)
+        step = lr * error / math.sqrt(len(features))
+        self.bias += lr * error
+        for f in features:
+            self.weights[f] = self.weights.get(f, 0.0) + step
+        self.samples += 1
+        self.positives += selected
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "bias": self.bias,
+                "samples": self.samples,
+                "positives": self.positives,
+                "weights": {str(k): v for k, v in self.weights.items()},
+            }
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> "HashedClassifier":
+        data = json.loads(raw)
+        model = cls()
+        model.bias = data["bias"]
+        model.samples = data["samples"]
+        model.positives = data.get("positives", 0)
+        model.weights = {int(k): v for k, v in data["weights"].items()}
+        return model
+
+
+class RelevanceFilter:
+    def __init__(self, settings: Settings, path: Path) -> None:
+        self._settings = settings
+        self._path = path
+        self._patterns = [
+            re.compile(p, re.IGNORECASE)
+            for p in settings.prefilter_block_patterns
+        ]
+        self._model = HashedClassifier()
+        if path.exists():
+            try:
+                self._model = HashedClassifier.from_json(
+                    path.read_text(encoding="utf-8")
+                )
+            except (json.JSONDecodeError, KeyError, ValueError):
+                logger.warning(
+                    "Corrupted prefilter model at {}, starting fresh", path
+                )
+
+    def score(self, post: Post) -> tuple[float, str]:
+        text = post.text.strip()
+        for pattern in self._patterns:
+            if pattern.search(text):
+                return 0.0, f"matches '{pattern.pattern}'"
+
+        trained = (
+            self._model.samples
+            >= self._settings.prefilter_min_training_samples
+        )
+        score = _UNTRAINED_SCORE
+        if trained:
+            # Ranked against the learned base rate: with few posts ever
+            # selected every raw probability is low, yet an average post
+            # still scores like an untrained one
+            lift = self._model.predict(text) / self._model.base_rate
+            score = lift / (1.0 + lift)
+        reasons = ["model" if trained else "default"]
+        if len(text) < self._settings.prefilter_min_chars:
+            score *= _SHORT_FACTOR
+            reasons.append("short")
+        if post.is_forward:
+            score *= _FORWARD_FACTOR
+            reasons.append("repost")
+        return score, ", ".join(reasons)
+
+    def filter(self, posts: list[Post]) -> list[Post]:
+        """Drop low-value posts and order the rest by descending score.
+
+        A sample of the posts dropped on score is kept anyway so the model
+        keeps learning what it would have missed; pattern matches are
+        always dropped.
+        """
+        threshold = self._settings.prefilter_drop_threshold
+        scored: list[tuple[float, Post]] = []
+        for post in posts:
+            score, reason = self.score(post)
+            if score < threshold and self._explore(post, score):
+                logger.debug(
+                    "Prefilter kept post {} in '{}' to learn from it",
+                    post.id,
+                    post.channel_title,
+                )
+            elif score < threshold:
+                logger.info(
+                    "Prefilter dropped post {} in '{}' (score {:.2f}: {})",
+                    post.id,
+                    post.channel_title,
+                    score,
+                    reason,
+                )
+                continue
+            scored.append((score, post))
+
+        scored.sort(key=lambda x: x[0], reverse=True)
+        logger.info(
+            "Prefilter kept {}/{} posts", len(scored), len(posts)
+        )
+        return [post for _, post in scored]
+
+    def _explore(self, post: Post, score: float) -> bool:
+        if score == 0.0:
+            return False
+        # crc32 of the link picks a stable sample across runs and profiles
+        bucket = zlib.crc32(post.permalink.encode()) % 10_000
+        return bucket < self._settings.prefilter_explore_rate * 10_000
+
+    def learn(self, post: Post, selected: bool) -> None:
+        self._model.learn(post.text, selected)
+
+    def save(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._path.write_text(self._model.to_json(), encoding="utf-8")
+        logger.debug("Prefilter model saved to {}", self._path)
@@ -1,13 +1,17 @@
+from collections.abc import Callable
 from typing import Protocol
 
 from telegram_radar.models import (
+    DEFAULT_PROFILE,
     AppState,
     Batch,
     ChannelInfo,
     ChannelState,
     Comment,
     DigestBatchResult,
+    DigestItem,
     Post,
+    PostPage,
 )
 
 
@@ -22,7 +26,9 @@ class TelegramGateway(Protocol):
 
     async def sign_in_password(self, password: str) -> None: ...
 
-    async def get_radar_channels(self) -> list[ChannelInfo]: ...
+    async def get_radar_channels(
+        self, folder_name: str | None = None
+    ) -> list[ChannelInfo]: ...
 
     async def fetch_posts(
         self,
@@ -30,7 +36,9 @@ class TelegramGateway(Protocol):
         since_message_id: int | None,
         since_hours: int,
         limit: int,
-    ) -> list[Post]: ...
+        offset_id: int = 0,
+        reverse: bool = False,
+    ) -> PostPage: ...
 
     async def fetch_comments(
         self,
@@ -46,7 +54,20 @@ class TelegramGateway(Protocol):
 
 
 class Summarizer(Protocol):
-    async def summarize_batch(self, batch: Batch) -> DigestBatchResult: ...
+    async def summarize_batch(
+        self,
+        batch: Batch,
+        instructions: str | None = None,
+        on_item: Callable[[DigestItem], None] | None = None,
+    ) -> DigestBatchResult: ...
+
+    async def triage_posts(
+        self, posts: list[Post], instructions: str | None = None
+    ) -> list[float]: ...
+
+    async def reduce_results(
+        self, results: list[DigestBatchResult], max_items: int
+    ) -> DigestBatchResult: ...
 
     async def check_health(self) -> bool: ...
 
@@ -56,15 +77,21 @@ class StateRepository(Protocol):
 
     def save(self) -> None: ...
 
-    def get_last_message_id(self, channel_id: int) -> int | None: ...
+    def get_last_message_id(
+        self, channel_id: int, profile: str = DEFAULT_PROFILE
+    ) -> int | None: ...
 
     def update_channel(
         self,
         channel_id: int,
         last_message_id: int,
         post_count: int,
+        profile: str = DEFAULT_PROFILE,
+        truncated: bool = False,
     ) -> None: ...
 
     def record_last_run(self, channels_parsed: list[str]) -> None: ...
 
-    def get_channel_state(self, channel_id: int) -> ChannelState | None: ...
+    def get_channel_state(
+        self, channel_id: int, profile: str = DEFAULT_PROFILE
+    ) -> ChannelState | None: ...
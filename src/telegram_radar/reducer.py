@@ -0,0 +1,164 @@
+import asyncio
+import re
+
+from loguru import logger
+
+from telegram_radar.models import DigestBatchResult, DigestItem
+from telegram_radar.protocols import Summarizer
+
+
+_WORD_RE = re.compile(r"\w+")
+# Consecutive words two quotes must share to be the same passage
+_SHARED_RUN_WORDS = 6
+# Share of distinct title words two items must have in common
+_TITLE_OVERLAP = 0.6
+# Batch summaries kept by the local merge; each covers one batch, so
+# joining them all would bury the digest under dozens of sentences
+_LOCAL_SUMMARIES = 2
+
+
+def _dedup_key(item: DigestItem) -> tuple[str, str]:
+    return (item.source_url, " ".join(item.post_quote.lower().split()))
+
+
+def _words(text: str) -> list[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def _runs(words: list[str]) -> set[tuple[str, ...]]:
+    n = _SHARED_RUN_WORDS
+    return {tuple(words[i : i + n]) for i in range(len(words) - n + 1)}
+
+
+def _same_story(a: DigestItem, b: DigestItem) -> bool:
+    short, long = sorted(
+        (_words(a.post_quote), _words(b.post_quote)), key=len
+    )
+    if short and f" {' '.join(short)} " in f" {' '.join(long)} ":
+        return True
+    if _runs(short) & _runs(long):
+        return True
+    ta, tb = set(_words(a.title)), set(_words(b.title))
+    return bool(ta and tb) and len(ta & tb) / len(ta | tb) >= _TITLE_OVERLAP
+
+
+def merge_overlapping(items: list[DigestItem]) -> list[DigestItem]:
+    """Collapse items that describe the same passage, without the LLM.
+
+    Meant for the parts of one split post: each part is summarized on its
+    own, so a story in the overlap comes back twice, usually quoted
+    differently. Items join a group when their quote contains, is
+    contained in or shares a run of words with a member's quote, or when
+    most of their title words match a member's title; the highest
+    priority item of each group is kept.
+    """
+    groups: list[list[DigestItem]] = []
+    for item in sorted(items, key=lambda x: x.priority, reverse=True):
+        for group in groups:
+            if any(_same_story(item, other) for other in group):
+                group.append(item)
+                break
+        else:
+            groups.append([item])
+    return [group[0] for group in groups]
+
+
+def merge_locally(results: list[DigestBatchResult]) -> DigestBatchResult:
+    """Deduplicate and rank items without the LLM."""
+    best: dict[tuple[str, str], DigestItem] = {}
+    for result in results:
+        for item in result.items:
+            key = _dedup_key(item)
+            if key not in best or item.priority > best[key].priority:
+                best[key] = item
+    items = sorted(best.values(), key=lambda x: x.priority, reverse=True)
+    summaries = [r.batch_summary for r in results if r.batch_summary]
+    summary = " ".join(summaries[:_LOCAL_SUMMARIES])
+    return DigestBatchResult(items=items, batch_summary=summary)
+
+
+class DigestReducer:
+    def __init__(
+        self,
+        summarizer: Summarizer,
+        fan_in: int,
+        max_items_per_call: int,
+    ) -> None:
+        self._summarizer = summarizer
+        self._fan_in = max(2, fan_in)
+        self._max_items_per_call = max_items_per_call
+
+    async def reduce(
+        self, results: list[DigestBatchResult], max_items: int
+    ) -> DigestBatchResult:
+        level = [r for r in results if r.items]
+        if not level:
+            return merge_locally(results)
+        depth = 0
+        while len(level) > 1 or len(level[0].items) > max_items:
+            depth += 1
+            groups = self._group(level)
+            logger.info(
+                "Reduce level {}: {} results in {} calls",
+                depth,
+                len(level),
+                sum(1 for g in groups if self._needs_call(g, max_items)),
+            )
+            reduced = await asyncio.gather(
+                *(self._reduce_group(g, max_items) for g in groups)
+            )
+            if any(r is None for r in reduced):
+                logger.warning("LLM reduce unavailable, ranking locally")
+                return merge_locally(results)
+            level = [r for r in reduced if r is not None]
+        return level[0]
+
+    def _group(
+        self, results: list[DigestBatchResult]
+    ) -> list[list[DigestBatchResult]]:
+        groups: list[list[DigestBatchResult]] = []
+        current: list[DigestBatchResult] = []
+        current_items = 0
+        for result in results:
+            # Keep at least two results per call so every level shrinks
+            if len(current) >= 2 and (
+                len(current) >= self._fan_in
+                or current_items + len(result.items)
+                > self._max_items_per_call
+            ):
+                groups.append(current)
+                current = []
+                current_items = 0
+            current.append(result)
+            current_items += len(result.items)
+        if current:
+            groups.append(current)
+        return groups
+
+    def _needs_call(
+        self, group: list[DigestBatchResult], max_items: int
+    ) -> bool:
+        return len(group) > 1 or len(group[0].items) > max_items
+
+    async def _reduce_group(
+        self, group: list[DigestBatchResult], max_items: int
+    ) -> DigestBatchResult | None:
+        if not self._needs_call(group, max_items):
+            return group[0]
+        try:
+            reduced = await self._summarizer.reduce_results(group, max_items)
+        except Exception:
+            logger.exception("LLM reduce failed for {} results", len(group))
+            return None
+        # Only keep items that exist in the input, so the reduce step can
+        # never introduce unverified quotes
+        known = {_dedup_key(item) for r in group for item in r.items}
+        items = [i for i in reduced.items if _dedup_key(i) in known]
+        if len(items) < len(reduced.items):
+            logger.warning(
+                "Dropped {} reduced items not present in the input",
+                len(reduced.items) - len(items),
+            )
+        return DigestBatchResult(
+            items=items[:max_items], batch_summary=reduced.batch_summary
+        )
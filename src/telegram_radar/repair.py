@@ -0,0 +1,98 @@
+from datetime import datetime
+
+from pydantic import ValidationError
+
+from telegram_radar.models import Batch, DigestItem, LenientDigestItem
+
+QUOTE_MAX_LEN = 160
+
+_DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+    "%d.%m.%Y",
+    "%d/%m/%Y",
+    "%d.%m.%y",
+    "%d %B %Y",
+    "%B %d, %Y",
+    "%d %b %Y",
+    "%b %d, %Y",
+)
+
+
+def normalize_date(value: str | None) -> str | None:
+    """Return value as YYYY-MM-DD, or None if it cannot be parsed."""
+    if not value:
+        return None
+    text = value.strip()
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        return parsed.date().isoformat()
+    except ValueError:
+        pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def truncate_quote(quote: str | None) -> str | None:
+    """Shorten a quote to the limit while keeping it a verbatim substring."""
+    if quote is None:
+        return None
+    quote = quote.strip()
+    if len(quote) <= QUOTE_MAX_LEN:
+        return quote
+    cut = quote[:QUOTE_MAX_LEN]
+    space = cut.rfind(" ")
+    if space > QUOTE_MAX_LEN - 40:
+        cut = cut[:space]
+    return cut.rstrip()
+
+
+def _priority(value: float | str | None) -> float:
+    try:
+        priority = float(value) if value is not None else 0.5
+    except ValueError:
+        return 0.5
+    return min(1.0, max(0.0, priority))
+
+
+def repair_items(
+    raw_items: list[LenientDigestItem], batch: Batch
+) -> tuple[list[DigestItem], list[tuple[LenientDigestItem, str]]]:
+    """Validate items, fixing what can be fixed locally.
+
+    Returns the valid items and the items that still need the LLM, each
+    with its validation error.
+    """
+    posts = {}
+    for payload in batch.payloads:
+        posts[payload.post.permalink] = payload.post
+        for comment in payload.comments:
+            if comment.link:
+                posts[comment.link] = payload.post
+
+    valid: list[DigestItem] = []
+    broken: list[tuple[LenientDigestItem, str]] = []
+    for raw in raw_items:
+        post = posts.get(raw.source_url or "")
+        fallback_date = post.date.date().isoformat() if post else None
+        candidate = {
+            "title": raw.title,
+            "why_relevant": raw.why_relevant,
+            "source_url": raw.source_url,
+            "post_quote": truncate_quote(raw.post_quote),
+            "comment_quote": truncate_quote(raw.comment_quote) or None,
+            "deadline": normalize_date(raw.deadline),
+            "action": raw.action or None,
+            "channel": raw.channel or (post.channel_title if post else None),
+            "date": normalize_date(raw.date) or fallback_date,
+            "priority": _priority(raw.priority),
+        }
+        try:
+            valid.append(DigestItem.model_validate(candidate))
+        except ValidationError as e:
+            broken.append((raw, str(e)))
+    return valid, broken
@@ -5,46 +5,57 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from loguru import logger
 
+from telegram_radar.models import DigestProfile
+
 
 class Scheduler:
     def __init__(
         self,
-        digest_callback: Callable[[], Coroutine[Any, Any, str]],
-        send_callback: Callable[[str], Coroutine[Any, Any, None]],
-        hour: int = 9,
-        minute: int = 0,
+        digest_callback: Callable[
+            [list[DigestProfile]], Coroutine[Any, Any, None]
+        ],
+        profiles: list[DigestProfile],
     ) -> None:
+        # Runs and delivers the digest for a slot's profiles
         self._digest_callback = digest_callback
-        self._send_callback = send_callback
         self._scheduler = AsyncIOScheduler()
-        self._hour = hour
-        self._minute = minute
+        # Profiles sharing a time slot run together so they share fetches
+        self._slots: dict[tuple[int, int], list[DigestProfile]] = {}
+        for profile in profiles:
+            self._slots.setdefault((profile.hour, profile.minute), []).append(
+                profile
+            )
 
-    async def _run_and_send(self) -> None:
+    async def _run(self, profiles: list[DigestProfile]) -> None:
         try:
-            logger.info("Scheduled digest job firing")
-            digest = await self._digest_callback()
-            await self._send_callback(digest)
-            logger.info("Scheduled digest delivered")
+            logger.info(
+                "Scheduled digest job firing for {}",
+                [p.name for p in profiles],
+            )
+            await self._digest_callback(profiles)
         except Exception:
             logger.exception("Scheduled digest job failed")
 
     def setup(self) -> None:
-        self._scheduler.add_job(
-            self._run_and_send,
-            trigger=CronTrigger(hour=self._hour, minute=self._minute),
-            id="daily_digest",
-            replace_existing=True,
-        )
+        for (hour, minute), profiles in self._slots.items():
+            self._scheduler.add_job(
+                self._run,
+                trigger=CronTrigger(hour=hour, minute=minute),
+                args=[profiles],
+                id=f"daily_digest_{hour:02d}{minute:02d}",
+                replace_existing=True,
+            )
 
     def start(self) -> None:
         self.setup()
         self._scheduler.start()
-        logger.info(
-            "Scheduler started — daily digest at {:02d}:{:02d}",
-            self._hour,
-            self._minute,
-        )
+        for (hour, minute), profiles in self._slots.items():
+            logger.info(
+                "Scheduler started — digest {} at {:02d}:{:02d}",
+                ", ".join(p.name for p in profiles),
+                hour,
+                minute,
+            )
 
     def stop(self) -> None:
         self._scheduler.shutdown(wait=False)
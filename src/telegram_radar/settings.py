@@ -1,7 +1,11 @@
 from pathlib import Path
+from typing import Literal
 
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
+from telegram_radar.models import DEFAULT_PROFILE, DigestProfile
+
 
 class Settings(BaseSettings):
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
@@ -14,25 +18,132 @@ class Settings(BaseSettings):
     # Telegram bot
     tg_bot_token: str
     tg_owner_user_id: int
+    # Minimum gap between messages to one chat (Bot API: ~1 msg/s per chat)
+    tg_send_interval_seconds: float = 1.0
+    # /digest_now posts a placeholder and edits it as items arrive, at
+    # most once per tg_edit_interval_seconds
+    tg_progressive_digest: bool = True
+    tg_edit_interval_seconds: float = 3.0
+    # Public HTTPS URL Telegram posts updates to; set to receive updates
+    # by webhook instead of long polling. TLS is terminated upstream and
+    # the bot itself serves plain HTTP on listen:port at the URL's path.
+    tg_webhook_url: str | None = None
+    tg_webhook_listen: str = "0.0.0.0"
+    tg_webhook_port: int = 8443
+    # Checked against X-Telegram-Bot-Api-Secret-Token; random if empty
+    tg_webhook_secret: str = ""
 
     # Folder discovery
     radar_folder_name: str = "Radar"
 
+    # Digest profiles (JSON list); empty means a single default profile
+    # built from radar_folder_name and digest_max_items
+    digest_profiles: list[DigestProfile] = []
+
     # Fetching
     fetch_since_hours: int = 24
+    # Minimum posts fetched per channel page; busier channels get larger
+    # pages, up to fetch_limit_max_per_channel, based on their observed
+    # posting rate times fetch_limit_headroom. Channels with a stored
+    # cursor are paged until it is reached
     fetch_limit_per_channel: int = 50
+    fetch_limit_max_per_channel: int = 500
+    fetch_limit_headroom: float = 2.0
+    fetch_cache_ttl_hours: int = 48
+    # Channels fetched and summarized per chunk with batch results spooled
+    # to disk; 0 loads every channel at once
+    stream_chunk_channels: int = 0
+    # Posts per channel per slice in streaming mode; a larger backlog is
+    # read oldest first in slices, 0 = no cap
+    stream_chunk_posts: int = 200
+
+    # Local full-text archive of every fetched post and comment, searched
+    # by /search; 0 days keeps everything
+    archive_path: Path = Path("data/archive.sqlite3")
+    archive_retention_days: int = 180
+
+    # Every rendered digest, served again by /digest_last and /digest_on
+    history_path: Path = Path("data/digests.sqlite3")
 
     # Comments
     comments_limit_per_post: int = 10
     comment_max_len: int = 500
     post_max_len: int = 4000
 
+    # Local relevance prefilter; a share of the posts it would drop is
+    # still summarized so the model keeps learning from them
+    prefilter_enabled: bool = True
+    prefilter_drop_threshold: float = 0.15
+    prefilter_explore_rate: float = 0.1
+    prefilter_min_chars: int = 40
+    prefilter_min_training_samples: int = 50
+    prefilter_block_patterns: list[str] = [
+        r"#(реклама|ad|ads|sponsored)\b",
+        r"\berid\b",
+        r"промокод|promo ?code",
+        r"^(доброе утро|good morning)\W*$",
+    ]
+
+    # Health monitor: background probes of Telegram and the LLM API
+    health_check_interval_seconds: float = 300.0
+    health_check_timeout_seconds: float = 10.0
+    # Probe results kept per check for latency percentiles
+    health_history_size: int = 100
+
     # Digest
     digest_max_items: int = 20
     deadline_urgent_days: int = 7
+    # Group non-urgent items under topics found by local clustering;
+    # items join a topic at this cosine similarity or above
+    digest_group_by_topic: bool = False
+    digest_topic_similarity: float = 0.3
 
     # LLM
-    llm_provider: str = "openai"
+    # "openai", "openai_compatible" (any server at llm_base_url) or "local"
+    # (inference server on this machine, llama.cpp by default)
+    llm_provider: Literal["openai", "openai_compatible", "local"] = "openai"
+    llm_base_url: str | None = None
     llm_model: str
-    llm_api_key: str
+    # Required except for the local provider, which sends a placeholder
+    llm_api_key: str = ""
     llm_max_chars_per_batch: int = 12000
+    # Posts longer than the batch budget are split into parts sharing this
+    # many chars
+    llm_chunk_overlap_chars: int = 400
+    llm_max_concurrency: int = 4
+    # Prompt-cache hints: "off", "key" (OpenAI prompt_cache_key) or
+    # "cache_control" (Anthropic-style ephemeral cache blocks)
+    llm_prompt_cache: Literal["off", "key", "cache_control"] = "off"
+    llm_streaming: bool = False
+    llm_stream_timeout_seconds: float = 180.0
+    llm_connect_timeout_seconds: float = 10.0
+    llm_read_timeout_seconds: float = 120.0
+    llm_keepalive_seconds: float = 60.0
+    llm_triage_model: str | None = None
+    llm_triage_min_score: float = 0.4
+    llm_triage_max_chars_per_batch: int = 40000
+    llm_triage_chars_per_post: int = 600
+    # Merge batch results with the LLM when a day has more items than the
+    # digest shows; off ranks them locally by priority
+    llm_reduce_enabled: bool = True
+    llm_reduce_fan_in: int = 4
+    llm_reduce_max_items: int = 60
+
+    @model_validator(mode="after")
+    def _require_api_key(self) -> "Settings":
+        if self.llm_provider != "local" and not self.llm_api_key:
+            raise ValueError(
+                f"LLM_API_KEY is required for the {self.llm_provider} provider"
+            )
+        return self
+
+    def profiles(self) -> list[DigestProfile]:
+        if self.digest_profiles:
+            return self.digest_profiles
+        return [
+            DigestProfile(
+                name=DEFAULT_PROFILE,
+                folder_name=self.radar_folder_name,
+                max_items=self.digest_max_items,
+            )
+        ]
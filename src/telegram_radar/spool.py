@@ -0,0 +1,45 @@
+import tempfile
+from typing import IO
+
+from telegram_radar.models import DigestBatchResult
+
+
+class ResultSpool:
+    """Batch results kept in anonymous temp files instead of memory.
+
+    One file per profile, one JSON line per result; the files disappear
+    on close.
+    """
+
+    def __init__(self) -> None:
+        self._files: dict[str, IO[str]] = {}
+        self.count = 0
+
+    def append(self, profile: str, results: list[DigestBatchResult]) -> None:
+        f = self._files.get(profile)
+        if f is None:
+            f = tempfile.TemporaryFile("w+", encoding="utf-8")
+            self._files[profile] = f
+        for result in results:
+            f.write(result.model_dump_json() + "\n")
+            self.count += 1
+
+    def read(self, profile: str) -> list[DigestBatchResult]:
+        f = self._files.get(profile)
+        if f is None:
+            return []
+        f.seek(0)
+        results = [DigestBatchResult.model_validate_json(line) for line in f]
+        f.seek(0, 2)
+        return results
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+    def __enter__(self) -> "ResultSpool":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
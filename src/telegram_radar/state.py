@@ -5,7 +5,32 @@ from pathlib import Path
 
 from loguru import logger
 
-from telegram_radar.models import AppState, ChannelState, LastRun
+from telegram_radar.models import (
+    DEFAULT_PROFILE,
+    AppState,
+    ChannelState,
+    LastRun,
+)
+
+# Weight of the latest observation in the smoothed posting rate
+RATE_SMOOTHING = 0.5
+
+
+def _posting_rate(
+    previous: ChannelState | None, post_count: int, now: datetime
+) -> float | None:
+    if previous is None or previous.updated_at is None:
+        return None
+    days = (now - previous.updated_at).total_seconds() / 86400
+    if days <= 0:
+        return previous.posts_per_day
+    observed = post_count / days
+    if previous.posts_per_day is None:
+        return observed
+    return (
+        RATE_SMOOTHING * observed
+        + (1 - RATE_SMOOTHING) * previous.posts_per_day
+    )
 
 
 class StateManager:
@@ -47,11 +72,20 @@ class StateManager:
             Path(tmp_path).unlink(missing_ok=True)
             raise
 
-    def get_last_message_id(self, channel_id: int) -> int | None:
+    def _channels(self, profile: str) -> dict[str, ChannelState]:
         if self._state is None:
             self.load()
         assert self._state is not None
-        ch = self._state.channels.get(str(channel_id))
+        # The default profile keeps using the top-level map so existing
+        # state files keep their cursors
+        if profile == DEFAULT_PROFILE:
+            return self._state.channels
+        return self._state.profile_channels.setdefault(profile, {})
+
+    def get_last_message_id(
+        self, channel_id: int, profile: str = DEFAULT_PROFILE
+    ) -> int | None:
+        ch = self._channels(profile).get(str(channel_id))
         return ch.last_processed_message_id if ch else None
 
     def update_channel(
@@ -59,13 +93,23 @@ class StateManager:
         channel_id: int,
         last_message_id: int,
         post_count: int,
+        profile: str = DEFAULT_PROFILE,
+        truncated: bool = False,
     ) -> None:
-        if self._state is None:
-            self.load()
-        assert self._state is not None
-        self._state.channels[str(channel_id)] = ChannelState(
+        channels = self._channels(profile)
+        previous = channels.get(str(channel_id))
+        now = datetime.now(timezone.utc)
+        if truncated:
+            truncated_at: datetime | None = now
+        else:
+            truncated_at = previous.truncated_at if previous else None
+        channels[str(channel_id)] = ChannelState(
             last_processed_message_id=last_message_id,
             last_run_post_count=post_count,
+            posts_per_day=_posting_rate(previous, post_count, now),
+            updated_at=now,
+            last_run_truncated=truncated,
+            truncated_at=truncated_at,
         )
 
     def record_last_run(self, channels_parsed: list[str]) -> None:
@@ -77,8 +121,7 @@ class StateManager:
             channels_parsed=channels_parsed,
         )
 
-    def get_channel_state(self, channel_id: int) -> ChannelState | None:
-        if self._state is None:
-            self.load()
-        assert self._state is not None
-        return self._state.channels.get(str(channel_id))
+    def get_channel_state(
+        self, channel_id: int, profile: str = DEFAULT_PROFILE
+    ) -> ChannelState | None:
+        return self._channels(profile).get(str(channel_id))
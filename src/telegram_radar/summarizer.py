@@ -1,30 +1,67 @@
+import asyncio
+import importlib.util
 import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
 
-import instructor
 from loguru import logger
-from openai import AsyncOpenAI
 
-from telegram_radar.models import Batch, DigestBatchResult
+from telegram_radar.backends import LLMBackend, create_backend
+from telegram_radar.compact import CompactBatchPrompt, compact_text
+from telegram_radar.models import (
+    Batch,
+    DigestBatchResult,
+    DigestItem,
+    LenientBatchResult,
+    LenientDigestItem,
+    Post,
+    TierUsage,
+    TriageResult,
+)
+from telegram_radar.repair import repair_items
 from telegram_radar.settings import Settings
+from telegram_radar.verifier import QuoteVerifier, verify_items
 
+if TYPE_CHECKING:
+    import httpx
+    import instructor
+    from openai import AsyncOpenAI
 
-def _format_batch_prompt(batch: Batch) -> str:
+
+def _format_triage_prompt(posts: list[Post], chars_per_post: int) -> str:
     parts: list[str] = []
-    for payload in batch.payloads:
-        post = payload.post
-        parts.append(
-            f"=== POST from [{post.channel_title}] ===\n"
-            f"Date: {post.date.isoformat()}\n"
-            f"URL: {post.permalink}\n"
-            f"Text:\n{post.text}\n"
-        )
-        for comment in payload.comments:
-            author = comment.author_name or "Anonymous"
-            link_part = f" ({comment.link})" if comment.link else ""
-            parts.append(
-                f"  -- Comment by {author}{link_part}:\n"
-                f"  {comment.text}\n"
-            )
+    for i, post in enumerate(posts):
+        text = " ".join(compact_text(post.text).split())[:chars_per_post]
+        parts.append(f"[{i}] [{post.channel_title}] {text}")
+    return "\n\n".join(parts)
+
+
+def _format_fix_prompt(
+    batch: Batch, broken: list[tuple[LenientDigestItem, str]]
+) -> str:
+    payloads = {p.post.permalink: p for p in batch.payloads}
+    parts: list[str] = []
+    for i, (item, error) in enumerate(broken, start=1):
+        parts.append(f"=== ITEM {i} ===")
+        parts.append(item.model_dump_json(exclude_none=True))
+        parts.append(f"Errors: {error}")
+        payload = payloads.get(item.source_url or "")
+        if payload is not None:
+            parts.append(f"Source post text:\n{payload.text}")
+        parts.append("")
+    if not any(payloads.get(item.source_url or "") for item, _ in broken):
+        parts.append("Available post URLs: " + ", ".join(payloads))
+    return "\n".join(parts)
+
+
+def _format_reduce_prompt(results: list[DigestBatchResult]) -> str:
+    parts: list[str] = []
+    for i, result in enumerate(results, start=1):
+        parts.append(f"=== PARTIAL DIGEST {i} ===")
+        parts.append(f"Summary: {result.batch_summary}")
+        for item in result.items:
+            parts.append(item.model_dump_json(exclude_none=True))
+        parts.append("")
     return "\n".join(parts)
 
 
@@ -32,60 +69,423 @@ SYSTEM_PROMPT = """\
 You are a digest assistant. Analyze the Telegram channel posts below \
 and produce a structured digest.
 
+Input format: channels are listed once as C1=Title. Each post starts with \
+"#P<n> <channel id> <date>" followed by its text; comments follow as \
+"> P<n>.c<m> <author>: <text>". Links are shown as <host>. Long posts are \
+split into overlapping parts marked "part k/n"; summarize each part on its \
+own.
+
 Rules:
 - Extract real deadlines from the text; if none exist, omit the deadline field.
 - post_quote MUST be a verbatim substring from the post text (max 160 chars).
 - comment_quote MUST be a verbatim substring from a comment (max 160 chars), \
 or null if no comment is noteworthy.
-- source_url MUST be the URL of the original post. If the key insight is from \
-a comment and a comment link is available, use that instead.
+- source_url MUST be the post id (e.g. P3). If the key insight is from a \
+comment, use the comment id (e.g. P3.c1) instead.
+- channel: the channel id (e.g. C1).
 - priority: 0.0 = low relevance, 1.0 = highest urgency/importance.
 - date: the post date in YYYY-MM-DD format.
 - batch_summary: 1-3 sentences summarizing the overall batch.
 """
 
+FIX_PROMPT = """\
+Some digest items failed validation. Return a corrected version of each \
+item below, fixing only the reported errors. Quotes MUST stay verbatim \
+substrings of the source text (max 160 chars), dates use YYYY-MM-DD and \
+source_url MUST be one of the given post URLs. Leave batch_summary empty.
+"""
+
+TRIAGE_PROMPT = """\
+You triage Telegram channel posts for a personal digest. Score every \
+numbered post below by how likely it is to deserve a digest entry: \
+0.0 = ads, greetings, chatter or noise; 1.0 = important news, deadlines, \
+opportunities or actionable information. Return one score per post index.
+"""
+
+REDUCE_PROMPT = """\
+You merge partial Telegram digests into one. Each partial digest has a \
+summary and a list of items as JSON objects.
+
+Rules:
+- Merge items describing the same story or event into one, keeping the \
+most informative quote and the highest priority.
+- Copy every field of a kept item verbatim from the input; never invent \
+quotes, URLs or deadlines.
+- Order items from most to least important and return at most the \
+requested number of items. Items with near deadlines are important.
+- batch_summary: 2-4 sentences summarizing the day across all partial digests.
+"""
+
+
+def _to_lenient(partial: object) -> LenientDigestItem:
+    return LenientDigestItem.model_validate(partial, from_attributes=True)
+
+
+def _cached_tokens(usage: object) -> int:
+    # OpenAI reports prompt_tokens_details.cached_tokens; Anthropic-style
+    # gateways report cache_read_input_tokens
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None)
+    if cached is None:
+        cached = getattr(usage, "cache_read_input_tokens", None)
+    return cached if isinstance(cached, int) else 0
+
+
+def _build_http_client(
+    settings: Settings, backend: LLMBackend
+) -> "httpx.AsyncClient":
+    import httpx
+    from openai import DefaultAsyncHttpxClient
+
+    # Summarization is held to llm_max_concurrency by the pipeline's
+    # semaphore; the spare connection keeps health probes from queueing
+    # behind long batch calls during a run
+    connections = settings.llm_max_concurrency + 1
+    http2 = backend.http2 and importlib.util.find_spec("h2") is not None
+    logger.debug(
+        "LLM HTTP pool: {} connections, HTTP/2 {}",
+        connections,
+        "on" if http2 else "off",
+    )
+    return DefaultAsyncHttpxClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=connections,
+            max_keepalive_connections=connections,
+            keepalive_expiry=settings.llm_keepalive_seconds,
+        ),
+        timeout=httpx.Timeout(
+            settings.llm_read_timeout_seconds,
+            connect=settings.llm_connect_timeout_seconds,
+        ),
+    )
+
 
 class LLMSummarizer:
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
-        self._client = instructor.from_openai(
-            AsyncOpenAI(api_key=settings.llm_api_key)
+        self._backend = create_backend(settings)
+        self._openai_client: "AsyncOpenAI | None" = None
+        self._instructor: "instructor.AsyncInstructor | None" = None
+        logger.info(
+            "LLM backend: {} ({})",
+            self._backend.name,
+            self._backend.base_url or "default endpoint",
         )
+        self._usage: dict[str, TierUsage] = {}
+
+    @property
+    def _openai(self) -> "AsyncOpenAI":
+        # One long-lived pooled client shared by summarization and health
+        # checks, created on first use so openai is not imported at startup;
+        # closed in close()
+        if self._openai_client is None:
+            self._openai_client = self._backend.create_client(
+                _build_http_client(self._settings, self._backend)
+            )
+        return self._openai_client
+
+    @property
+    def _client(self) -> "instructor.AsyncInstructor":
+        if self._instructor is None:
+            import instructor
+
+            self._instructor = instructor.from_openai(
+                self._openai, mode=instructor.Mode(self._backend.mode)
+            )
+        return self._instructor
+
+    def _record(self, tier: str, elapsed: float, completion: object) -> None:
+        usage = self._usage.setdefault(tier, TierUsage())
+        usage.calls += 1
+        usage.seconds += elapsed
+        tokens = getattr(completion, "usage", None)
+        if tokens is None:
+            usage.unmetered_calls += 1
+        else:
+            usage.prompt_tokens += tokens.prompt_tokens or 0
+            usage.completion_tokens += tokens.completion_tokens or 0
+            usage.cached_tokens += _cached_tokens(tokens)
 
-    async def summarize_batch(self, batch: Batch) -> DigestBatchResult:
-        prompt = _format_batch_prompt(batch)
+    def _messages(
+        self,
+        static_prompt: str,
+        content: str,
+        instructions: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Build messages with the static prompt as a stable prefix.
+
+        Anything that varies between calls (profile instructions, batch
+        content) comes after it so providers can reuse the cached prefix.
+        """
+        system: dict[str, Any] = {"role": "system", "content": static_prompt}
+        if self._settings.llm_prompt_cache == "cache_control":
+            system["content"] = [
+                {
+                    "type": "text",
+                    "text": static_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ]
+        messages = [system]
+        if instructions:
+            messages.append(
+                {
+                    "role": "system",
+                    "content": f"Additional instructions:\n{instructions}",
+                }
+            )
+        messages.append({"role": "user", "content": content})
+        return messages
+
+    def _cache_kwargs(self, tier: str) -> dict[str, Any]:
+        if self._settings.llm_prompt_cache != "key":
+            return {}
+        # Routes calls sharing a prefix to the same cache shard
+        return {"extra_body": {"prompt_cache_key": f"telegram-radar-{tier}"}}
+
+    @property
+    def backend_name(self) -> str:
+        return self._backend.name
+
+    def pop_usage(self) -> dict[str, TierUsage]:
+        """Return per-tier usage since the last call and reset it."""
+        usage, self._usage = self._usage, {}
+        return usage
+
+    async def summarize_batch(
+        self,
+        batch: Batch,
+        instructions: str | None = None,
+        on_item: Callable[[DigestItem], None] | None = None,
+    ) -> DigestBatchResult:
+        if self._settings.llm_streaming:
+            return await self._summarize_streaming(
+                batch, instructions, on_item
+            )
+
+        prompt = CompactBatchPrompt(batch)
         start = time.monotonic()
 
-        result = await self._client.chat.completions.create(
-            model=self._settings.llm_model,
-            response_model=DigestBatchResult,
-            max_retries=3,
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": prompt},
-            ],
+        # Parse leniently so one bad item does not force instructor to
+        # resend the whole batch; items are validated individually below
+        raw, completion = (
+            await self._client.chat.completions.create_with_completion(
+                model=self._settings.llm_model,
+                response_model=LenientBatchResult,
+                max_retries=1,
+                messages=self._messages(
+                    SYSTEM_PROMPT, prompt.text, instructions
+                ),
+                **self._cache_kwargs("extract"),
+            )
+        )
+
+        elapsed = time.monotonic() - start
+        self._record("extract", elapsed, completion)
+        items, broken = repair_items(
+            [prompt.resolve(item) for item in raw.items], batch
+        )
+        if broken:
+            items.extend(await self._fix_items(batch, broken))
+        items = verify_items(batch, items)
+        if on_item is not None:
+            for item in items:
+                on_item(item)
+        logger.info(
+            "LLM summarized batch ({} posts, {} prompt chars from {}) "
+            "in {:.1f}s → {} items",
+            batch.post_count,
+            len(prompt.text),
+            batch.total_chars,
+            elapsed,
+            len(items),
         )
+        return DigestBatchResult(items=items, batch_summary=raw.batch_summary)
+
+    async def _summarize_streaming(
+        self,
+        batch: Batch,
+        instructions: str | None,
+        on_item: Callable[[DigestItem], None] | None,
+    ) -> DigestBatchResult:
+        prompt = CompactBatchPrompt(batch)
+        verifier = QuoteVerifier(batch)
+        items: list[DigestItem] = []
+        broken: list[tuple[LenientDigestItem, str]] = []
+        first_item_at: float | None = None
+        start = time.monotonic()
+
+        def accept(raw: LenientDigestItem) -> None:
+            nonlocal first_item_at
+            valid, failed = repair_items([prompt.resolve(raw)], batch)
+            broken.extend(failed)
+            for item in valid:
+                verified = verifier.verify(item)
+                if verified is None:
+                    continue
+                if first_item_at is None:
+                    first_item_at = time.monotonic() - start
+                items.append(verified)
+                if on_item is not None:
+                    on_item(verified)
+
+        summary = ""
+        emitted = 0
+        try:
+            async with asyncio.timeout(
+                self._settings.llm_stream_timeout_seconds
+            ):
+                last = None
+                stream = self._client.chat.completions.create_partial(
+                    model=self._settings.llm_model,
+                    response_model=LenientBatchResult,
+                    max_retries=1,
+                    messages=self._messages(
+                        SYSTEM_PROMPT, prompt.text, instructions
+                    ),
+                    **self._cache_kwargs("extract"),
+                )
+                async for partial in stream:
+                    last = partial
+                    partial_items = partial.items or []
+                    # An item is complete once the next one has started
+                    while emitted < len(partial_items) - 1:
+                        accept(_to_lenient(partial_items[emitted]))
+                        emitted += 1
+                if last is not None:
+                    for partial_item in (last.items or [])[emitted:]:
+                        accept(_to_lenient(partial_item))
+                    summary = last.batch_summary or ""
+        except TimeoutError:
+            # The in-flight item may be truncated, so only completed
+            # items are kept
+            logger.warning(
+                "LLM stream timed out after {}s, keeping {} completed items",
+                self._settings.llm_stream_timeout_seconds,
+                len(items),
+            )
 
         elapsed = time.monotonic() - start
+        # instructor's partial stream does not surface the final usage
+        # chunk, so streamed calls are counted as unmetered rather than as
+        # zero tokens
+        self._record("extract", elapsed, None)
+        if broken:
+            fixed = verify_items(batch, await self._fix_items(batch, broken))
+            for item in fixed:
+                items.append(item)
+                if on_item is not None:
+                    on_item(item)
         logger.info(
-            "LLM summarized batch ({} posts) in {:.1f}s → {} items",
+            "LLM streamed batch ({} posts) in {:.1f}s → {} items, "
+            "first item after {}",
             batch.post_count,
             elapsed,
-            len(result.items),
+            len(items),
+            f"{first_item_at:.1f}s" if first_item_at is not None else "-",
         )
-        return result
+        return DigestBatchResult(items=items, batch_summary=summary)
 
-    async def check_health(self) -> bool:
+    async def _fix_items(
+        self, batch: Batch, broken: list[tuple[LenientDigestItem, str]]
+    ) -> list[DigestItem]:
+        logger.info("Re-asking LLM for {} invalid items", len(broken))
+        start = time.monotonic()
         try:
-            raw = instructor.from_openai(
-                AsyncOpenAI(api_key=self._settings.llm_api_key)
+            raw, completion = (
+                await self._client.chat.completions.create_with_completion(
+                    model=self._settings.llm_model,
+                    response_model=LenientBatchResult,
+                    max_retries=1,
+                    messages=self._messages(
+                        FIX_PROMPT, _format_fix_prompt(batch, broken)
+                    ),
+                    **self._cache_kwargs("repair"),
+                )
+            )
+        except Exception:
+            logger.exception("Item repair request failed")
+            return []
+        self._record("repair", time.monotonic() - start, completion)
+
+        fixed, still_broken = repair_items(raw.items, batch)
+        for item, error in still_broken:
+            logger.warning(
+                "Dropping invalid digest item '{}': {}", item.title, error
+            )
+        return fixed
+
+    async def triage_posts(
+        self, posts: list[Post], instructions: str | None = None
+    ) -> list[float]:
+        model = self._settings.llm_triage_model or self._settings.llm_model
+        prompt = _format_triage_prompt(
+            posts, self._settings.llm_triage_chars_per_post
+        )
+        start = time.monotonic()
+
+        result, completion = (
+            await self._client.chat.completions.create_with_completion(
+                model=model,
+                response_model=TriageResult,
+                max_retries=2,
+                messages=self._messages(TRIAGE_PROMPT, prompt, instructions),
+                **self._cache_kwargs("triage"),
             )
-            await raw.chat.completions.create(
+        )
+
+        elapsed = time.monotonic() - start
+        self._record("triage", elapsed, completion)
+        # Posts the model skipped are kept rather than silently dropped
+        scores = [1.0] * len(posts)
+        for entry in result.scores:
+            if 0 <= entry.index < len(posts):
+                scores[entry.index] = entry.score
+        logger.info(
+            "LLM triaged {} posts with {} in {:.1f}s", len(posts), model, elapsed
+        )
+        return scores
+
+    async def reduce_results(
+        self, results: list[DigestBatchResult], max_items: int
+    ) -> DigestBatchResult:
+        start = time.monotonic()
+
+        result, completion = (
+            await self._client.chat.completions.create_with_completion(
                 model=self._settings.llm_model,
-                response_model=None,
-                messages=[{"role": "user", "content": "ping"}],
-                max_tokens=1,
+                response_model=DigestBatchResult,
+                max_retries=3,
+                messages=self._messages(
+                    REDUCE_PROMPT,
+                    f"Return at most {max_items} items.\n\n"
+                    + _format_reduce_prompt(results),
+                ),
+                **self._cache_kwargs("reduce"),
             )
+        )
+
+        elapsed = time.monotonic() - start
+        self._record("reduce", elapsed, completion)
+        logger.info(
+            "LLM reduced {} partial digests in {:.1f}s → {} items",
+            len(results),
+            elapsed,
+            len(result.items),
+        )
+        return result
+
+    async def check_health(self) -> bool:
+        # Listing models proves the API is reachable without spending
+        # tokens, so it is cheap enough to probe on an interval
+        try:
+            await self._openai.models.list()
             return True
         except Exception:
             return False
+
+    async def close(self) -> None:
+        if self._openai_client is not None:
+            await self._openai_client.close()
+        logger.info("LLM client closed")
@@ -0,0 +1,125 @@
+import math
+import re
+import zlib
+from dataclasses import dataclass, field
+
+from telegram_radar.models import DigestItem
+
+_N_FEATURES = 1 << 18
+_TOKEN_RE = re.compile(r"[^\W\d_]{3,}")
+# Words in more than this share of items say nothing about the topic
+_MAX_DF = 0.8
+_LABEL_TERMS = 2
+
+
+def _text(item: DigestItem) -> str:
+    return f"{item.title} {item.why_relevant} {item.post_quote}"
+
+
+class HashingVectorizer:
+    """TF-IDF vectors over hashed words, stored sparsely as dicts.
+
+    Feature ids are crc32 hashes, like the prefilter's, so no vocabulary
+    has to be built or stored; the first word seen for each id is kept
+    only to label topics.
+    """
+
+    def __init__(self) -> None:
+        self.terms: dict[int, str] = {}
+
+    def _counts(self, text: str) -> dict[int, int]:
+        counts: dict[int, int] = {}
+        for token in _TOKEN_RE.findall(text.lower()):
+            f = zlib.crc32(token.encode()) % _N_FEATURES
+            self.terms.setdefault(f, token)
+            counts[f] = counts.get(f, 0) + 1
+        return counts
+
+    def fit_transform(self, texts: list[str]) -> list[dict[int, float]]:
+        counts = [self._counts(text) for text in texts]
+        df: dict[int, int] = {}
+        for doc in counts:
+            for f in doc:
+                df[f] = df.get(f, 0) + 1
+        n = len(texts)
+        max_df = max(2, int(_MAX_DF * n))
+        idf = {
+            f: math.log((1 + n) / (1 + d)) + 1.0
+            for f, d in df.items()
+            if d <= max_df
+        }
+        vectors: list[dict[int, float]] = []
+        for doc in counts:
+            vec = {f: c * idf[f] for f, c in doc.items() if f in idf}
+            norm = math.sqrt(sum(w * w for w in vec.values()))
+            vectors.append(
+                {f: w / norm for f, w in vec.items()} if norm else {}
+            )
+        return vectors
+
+
+@dataclass(slots=True, kw_only=True)
+class Topic:
+    label: str
+    items: list[DigestItem] = field(default_factory=list)
+
+
+def cluster_items(
+    items: list[DigestItem], threshold: float = 0.3
+) -> list[Topic]:
+    """Group items whose text is similar, in one pass over the items.
+
+    Items are visited by descending priority; each joins the topic whose
+    centroid is most cosine-similar, if at least ``threshold``, or starts
+    a new one. Candidate topics come from an inverted index over centroid
+    features, so an item is only compared with topics sharing a word.
+    Topics are returned in order of their highest-priority item.
+    """
+    vectorizer = HashingVectorizer()
+    vectors = vectorizer.fit_transform([_text(item) for item in items])
+    order = sorted(range(len(items)), key=lambda i: -items[i].priority)
+
+    # Per topic: summed member vectors, its squared norm and members
+    sums: list[dict[int, float]] = []
+    sq_norms: list[float] = []
+    members: list[list[int]] = []
+    index: dict[int, list[int]] = {}
+
+    for i in order:
+        vec = vectors[i]
+        dots: dict[int, float] = {}
+        for f, w in vec.items():
+            for t in index.get(f, ()):
+                dots[t] = dots.get(t, 0.0) + w * sums[t][f]
+        best, best_sim = -1, threshold
+        for t, dot in dots.items():
+            sim = dot / math.sqrt(sq_norms[t])
+            if sim >= best_sim:
+                best, best_sim = t, sim
+
+        if best < 0:
+            best = len(sums)
+            sums.append({})
+            sq_norms.append(0.0)
+            members.append([])
+        # |s + v|^2 = |s|^2 + 2 s.v + |v|^2, with |v| = 1 (or 0 if empty)
+        sq_norms[best] += 2 * dots.get(best, 0.0) + (1.0 if vec else 0.0)
+        centroid = sums[best]
+        for f, w in vec.items():
+            if f not in centroid:
+                index.setdefault(f, []).append(best)
+                centroid[f] = 0.0
+            centroid[f] += w
+        members[best].append(i)
+
+    topics: list[Topic] = []
+    for centroid, indices in zip(sums, members):
+        top = sorted(centroid, key=centroid.__getitem__, reverse=True)
+        label = " / ".join(vectorizer.terms[f] for f in top[:_LABEL_TERMS])
+        topics.append(
+            Topic(
+                label=label.capitalize(),
+                items=[items[i] for i in indices],
+            )
+        )
+    return topics
@@ -0,0 +1,60 @@
+from loguru import logger
+
+from telegram_radar.models import Post
+from telegram_radar.protocols import Summarizer
+from telegram_radar.settings import Settings
+
+
+class PostTriage:
+    """Shortlist posts with the cheap model before full extraction."""
+
+    def __init__(self, summarizer: Summarizer, settings: Settings) -> None:
+        self._summarizer = summarizer
+        self._settings = settings
+
+    def _chunks(self, posts: list[Post]) -> list[list[Post]]:
+        per_post = self._settings.llm_triage_chars_per_post
+        budget = self._settings.llm_triage_max_chars_per_batch
+        chunks: list[list[Post]] = []
+        current: list[Post] = []
+        current_chars = 0
+        for post in posts:
+            chars = min(len(post.text), per_post) + len(post.channel_title)
+            if current and current_chars + chars > budget:
+                chunks.append(current)
+                current = []
+                current_chars = 0
+            current.append(post)
+            current_chars += chars
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def shortlist(
+        self, posts: list[Post], instructions: str | None = None
+    ) -> list[Post]:
+        min_score = self._settings.llm_triage_min_score
+        kept: list[Post] = []
+        for chunk in self._chunks(posts):
+            try:
+                scores = await self._summarizer.triage_posts(
+                    chunk, instructions=instructions
+                )
+            except Exception:
+                logger.exception(
+                    "Triage failed for {} posts, keeping all", len(chunk)
+                )
+                kept.extend(chunk)
+                continue
+            for post, score in zip(chunk, scores):
+                if score < min_score:
+                    logger.info(
+                        "Triage dropped post {} in '{}' (score {:.2f})",
+                        post.id,
+                        post.channel_title,
+                        score,
+                    )
+                    continue
+                kept.append(post)
+        logger.info("Triage shortlisted {}/{} posts", len(kept), len(posts))
+        return kept
@@ -0,0 +1,141 @@
+import re
+import unicodedata
+
+from loguru import logger
+
+from telegram_radar.models import Batch, DigestItem, Post
+
+_GRAM = 8
+_MD_LINK_RE = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_ELLIPSIS_RE = re.compile(r"\.\.\.|…")
+_TRANSLATION = str.maketrans(
+    {
+        "“": '"',
+        "”": '"',
+        "«": '"',
+        "»": '"',
+        "‘": "'",
+        "’": "'",
+        "–": "-",
+        "—": "-",
+        "*": None,
+        "_": None,
+        "`": None,
+        "~": None,
+    }
+)
+
+
+def normalize(text: str) -> str:
+    """Normalize text so quotes match despite markdown and typography."""
+    text = unicodedata.normalize("NFKC", text)
+    text = _MD_LINK_RE.sub(r"\1", text)
+    return " ".join(text.translate(_TRANSLATION).casefold().split())
+
+
+class QuoteIndex:
+    """Character n-gram index answering "which texts contain this quote"."""
+
+    def __init__(self) -> None:
+        self._docs: list[str] = []
+        self._grams: dict[str, set[int]] = {}
+
+    def add(self, text: str) -> int:
+        doc_id = len(self._docs)
+        doc = normalize(text)
+        self._docs.append(doc)
+        for i in range(len(doc) - _GRAM + 1):
+            self._grams.setdefault(doc[i : i + _GRAM], set()).add(doc_id)
+        return doc_id
+
+    def _find_segment(self, segment: str) -> set[int]:
+        if len(segment) < _GRAM:
+            candidates: set[int] = set(range(len(self._docs)))
+        else:
+            # A few probe grams narrow the candidates; the final substring
+            # check confirms them
+            probes = {0, (len(segment) - _GRAM) // 2, len(segment) - _GRAM}
+            candidates = set.intersection(
+                *(
+                    self._grams.get(segment[i : i + _GRAM], set())
+                    for i in probes
+                )
+            )
+        return {d for d in candidates if segment in self._docs[d]}
+
+    def find(self, quote: str) -> set[int]:
+        segments = [
+            s.strip() for s in _ELLIPSIS_RE.split(normalize(quote)) if s.strip()
+        ]
+        if not segments:
+            return set()
+        return set.intersection(*(self._find_segment(s) for s in segments))
+
+
+class QuoteVerifier:
+    def __init__(self, batch: Batch) -> None:
+        self._index = QuoteIndex()
+        # doc id -> (owning post, url to cite for that doc)
+        self._owners: dict[int, tuple[Post, str]] = {}
+        self._comment_docs: set[int] = set()
+        self._posts_by_url: dict[str, Post] = {}
+        for payload in batch.payloads:
+            post = payload.post
+            self._posts_by_url[post.permalink] = post
+            # Quotes are taken from the rendered prompt fragments
+            doc_id = self._index.add(payload.text)
+            self._owners[doc_id] = (post, post.permalink)
+            for comment, text in zip(payload.comments, payload.comment_texts):
+                doc_id = self._index.add(text)
+                self._owners[doc_id] = (post, comment.link or post.permalink)
+                self._comment_docs.add(doc_id)
+                if comment.link:
+                    self._posts_by_url[comment.link] = post
+
+    def verify(self, item: DigestItem) -> DigestItem | None:
+        """Return the item with a corrected source, or None if unquotable."""
+        docs = self._index.find(item.post_quote)
+        if not docs:
+            logger.warning(
+                "Dropping item '{}': post_quote not found in batch", item.title
+            )
+            return None
+
+        update: dict[str, str | None] = {}
+        claimed = self._posts_by_url.get(item.source_url)
+        owners = [self._owners[d][0] for d in docs]
+        if claimed is None or all(o is not claimed for o in owners):
+            post_docs = sorted(d for d in docs if d not in self._comment_docs)
+            doc = post_docs[0] if post_docs else min(docs)
+            post, url = self._owners[doc]
+            logger.info(
+                "Reattributed item '{}' from {} to {}",
+                item.title,
+                item.source_url,
+                url,
+            )
+            update.update(
+                source_url=url,
+                channel=post.channel_title,
+                date=post.date.date().isoformat(),
+            )
+
+        if item.comment_quote and not (
+            self._index.find(item.comment_quote) & self._comment_docs
+        ):
+            logger.info(
+                "Clearing unverified comment_quote on '{}'", item.title
+            )
+            update["comment_quote"] = None
+
+        return item.model_copy(update=update) if update else item
+
+
+def verify_items(batch: Batch, items: list[DigestItem]) -> list[DigestItem]:
+    verifier = QuoteVerifier(batch)
+    verified = [v for v in (verifier.verify(i) for i in items) if v]
+    if len(verified) < len(items):
+        logger.info(
+            "Quote verification kept {}/{} items", len(verified), len(items)
+        )
+    return verified
@@ -0,0 +1,68 @@
+import hmac
+from collections.abc import Awaitable, Callable
+
+from aiohttp import web
+from loguru import logger
+from telegram import Bot, Update
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+class WebhookServer:
+    """Plain-HTTP endpoint receiving Bot API updates.
+
+    TLS is expected to be terminated by a reverse proxy in front of it.
+    Requests without the configured secret token are rejected; accepted
+    updates are handed to ``on_update`` and answered immediately.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        on_update: Callable[[Update], Awaitable[None]],
+        *,
+        path: str,
+        secret_token: str,
+        listen: str = "0.0.0.0",
+        port: int = 8443,
+    ) -> None:
+        self._bot = bot
+        self._on_update = on_update
+        self._path = path
+        self._secret = secret_token
+        self._listen = listen
+        self._port = port
+        self._runner: web.AppRunner | None = None
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post(self._path, self._handle)
+        return app
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        token = request.headers.get(SECRET_HEADER, "")
+        if not hmac.compare_digest(token, self._secret):
+            logger.warning("Webhook request with bad secret token rejected")
+            return web.Response(status=403)
+        try:
+            data = await request.json()
+            update = Update.de_json(data, self._bot)
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning("Malformed webhook update: {}", e)
+            return web.Response(status=400)
+        await self._on_update(update)
+        return web.Response()
+
+    async def start(self) -> None:
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self._listen, self._port)
+        await site.start()
+        logger.info(
+            "Webhook listening on {}:{}{}", self._listen, self._port, self._path
+        )
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
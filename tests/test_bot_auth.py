@@ -1,4 +1,5 @@
 import asyncio
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -10,7 +11,10 @@ from telethon.errors import (
     SessionPasswordNeededError,
 )
 
+from telegram_radar.archive import PostArchive
 from telegram_radar.bot import TelegramBotController
+from telegram_radar.history import DigestHistory
+from telegram_radar.models import DigestProfile, Post, PostPage
 from telegram_radar.settings import Settings
 
 # --- Helpers ---
@@ -41,11 +45,11 @@ class FakeGateway:
     async def is_authorized(self) -> bool:
         return self.authorized
 
-    async def get_radar_channels(self):
+    async def get_radar_channels(self, folder_name=None):
         return []
 
     async def fetch_posts(self, *a, **kw):
-        return []
+        return PostPage(posts=[])
 
     async def fetch_comments(self, *a, **kw):
         return []
@@ -55,7 +59,13 @@ class FakeGateway:
 
 
 class FakeSummarizer:
-    async def summarize_batch(self, batch):
+    async def summarize_batch(self, batch, instructions=None, on_item=None):
+        pass
+
+    async def triage_posts(self, posts, instructions=None):
+        return []
+
+    async def reduce_results(self, results, max_items):
         pass
 
     async def check_health(self) -> bool:
@@ -69,7 +79,7 @@ class FakeStateRepository:
     def save(self):
         pass
 
-    def get_last_message_id(self, channel_id):
+    def get_last_message_id(self, channel_id, profile="default"):
         return None
 
     def update_channel(self, *a, **kw):
@@ -78,7 +88,7 @@ class FakeStateRepository:
     def record_last_run(self, *a, **kw):
         pass
 
-    def get_channel_state(self, channel_id):
+    def get_channel_state(self, channel_id, profile="default"):
         return None
 
 
@@ -286,6 +296,162 @@ class TestCommandBlocking:
             assert "login" not in msg.lower()
 
 
+class TestHealthCommand:
+    async def test_answers_from_latest_probe(self, bot):
+        bot._auth_complete = True
+        check = AsyncMock(return_value=True)
+        bot._health._probes["Telegram"] = check
+        await bot._health.probe()
+        check.reset_mock()
+
+        update = _make_update("/health")
+        ctx = _make_context()
+        ctx.args = []
+        await bot._handle_health(update, ctx)
+
+        check.assert_not_awaited()
+        msg = update.effective_chat.send_message.call_args[0][0]
+        assert "Connected" in msg
+        assert "p95" in msg
+
+    async def test_now_forces_probe(self, bot):
+        bot._auth_complete = True
+        await bot._health.probe()
+        check = AsyncMock(return_value=False)
+        bot._health._probes["Telegram"] = check
+
+        update = _make_update("/health now")
+        ctx = _make_context()
+        ctx.args = ["now"]
+        await bot._handle_health(update, ctx)
+
+        check.assert_awaited_once()
+        msg = update.effective_chat.send_message.call_args[0][0]
+        assert "Disconnected" in msg
+
+    async def test_monitor_not_started_with_bot(self, bot):
+        check = AsyncMock(return_value=True)
+        bot._health._probes["Telegram"] = check
+
+        with patch.object(bot, "_app") as mock_app:
+            mock_app.initialize = AsyncMock()
+            mock_app.start = AsyncMock()
+            mock_app.updater.start_polling = AsyncMock()
+            mock_app.bot.set_my_commands = AsyncMock()
+            await bot.start()
+        await asyncio.sleep(0.01)
+        check.assert_not_awaited()
+
+        # main() starts it once the Telegram client is connected
+        bot.start_health_monitor()
+        await asyncio.sleep(0.01)
+        check.assert_awaited_once()
+        await bot._health.stop()
+
+
+class TestSearchCommand:
+    async def test_search_replies_with_permalinks(self, gateway, tmp_path):
+        archive = PostArchive(tmp_path / "archive.sqlite3")
+        archive.add_posts([
+            Post(
+                id=5,
+                channel_id=1,
+                channel_title="ML News",
+                date=datetime.now(timezone.utc),
+                text="Grant applications open",
+                permalink="https://t.me/mlnews/5",
+            )
+        ])
+        bot = TelegramBotController(
+            settings=_make_settings(),
+            gateway=gateway,
+            summarizer=FakeSummarizer(),
+            state=FakeStateRepository(),
+            run_digest=AsyncMock(return_value="digest"),
+            archive=archive,
+        )
+        bot._delivery = MagicMock()
+        bot._delivery.send = AsyncMock()
+        ctx = _make_context()
+        ctx.args = ["grant"]
+
+        await bot._handle_search(_make_update("/search grant"), ctx)
+
+        chat_id, text = bot._delivery.send.call_args[0][:2]
+        assert chat_id == 42
+        assert "https://t.me/mlnews/5" in text
+        assert "ML News" in text
+        archive.close()
+
+    async def test_search_without_archive(self, bot):
+        update = _make_update("/search grant")
+        ctx = _make_context()
+        ctx.args = ["grant"]
+        await bot._handle_search(update, ctx)
+        msg = update.effective_chat.send_message.call_args[0][0]
+        assert "not enabled" in msg
+
+
+class TestDigestHistoryCommands:
+    @pytest.fixture
+    def history_bot(self, gateway, tmp_path):
+        history = DigestHistory(tmp_path / "digests.sqlite3")
+        bot = TelegramBotController(
+            settings=_make_settings(),
+            gateway=gateway,
+            summarizer=FakeSummarizer(),
+            state=FakeStateRepository(),
+            run_digest=AsyncMock(return_value="digest"),
+            history=history,
+        )
+        bot._delivery = MagicMock()
+        bot._delivery.send = AsyncMock()
+        yield bot, history
+        history.close()
+
+    async def test_digest_last_served_from_history(self, history_bot):
+        bot, history = history_bot
+        history.record(
+            "default",
+            "Stored digest text",
+            [],
+            post_count=4,
+            channel_count=2,
+            duration_seconds=1.0,
+        )
+        ctx = _make_context()
+        ctx.args = []
+
+        await bot._handle_digest_last(_make_update("/digest_last"), ctx)
+
+        text = bot._delivery.send.call_args[0][1]
+        assert text.endswith("Stored digest text")
+        assert "4 posts from 2 channels" in text
+        bot._run_digest.assert_not_awaited()
+
+    async def test_digest_on_rejects_bad_date(self, history_bot):
+        bot, _ = history_bot
+        update = _make_update("/digest_on yesterday")
+        ctx = _make_context()
+        ctx.args = ["yesterday"]
+
+        await bot._handle_digest_on(update, ctx)
+
+        msg = update.effective_chat.send_message.call_args[0][0]
+        assert "YYYY-MM-DD" in msg
+
+    async def test_digest_on_without_digests(self, history_bot):
+        bot, _ = history_bot
+        update = _make_update("/digest_on 2020-01-01")
+        ctx = _make_context()
+        ctx.args = ["2020-01-01"]
+
+        await bot._handle_digest_on(update, ctx)
+
+        msg = update.effective_chat.send_message.call_args[0][0]
+        assert "No stored digests for 2020-01-01" in msg
+
+
 # --- T014: 2FA flow tests ---
 
 
@@ -488,6 +654,77 @@ class TestStartHandler:
             assert bot._phone == ""
 
 
+# --- Background digest jobs ---
+
+
+class TestBackgroundDigest:
+    async def test_digest_now_returns_while_job_runs(self, bot):
+        bot._auth_complete = True
+        bot._delivery = MagicMock()
+        bot._delivery.send = AsyncMock(return_value=[MagicMock(message_id=5)])
+        bot._delivery.edit = AsyncMock()
+        release = asyncio.Event()
+
+        async def run_digest(**kwargs):
+            kwargs["progress"].stage = "summarizing"
+            await release.wait()
+            return "digest"
+
+        bot._run_digest = run_digest
+        await bot._handle_digest_now(_make_update("/digest_now"), None)
+        await asyncio.sleep(0)
+
+        status = _make_update("/status")
+        await bot._handle_status(status, None)
+        reply = status.effective_chat.send_message.call_args[0][0]
+        assert "summarizing" in reply
+
+        again = _make_update("/digest_now")
+        await bot._handle_digest_now(again, None)
+        reply = again.effective_chat.send_message.call_args[0][0]
+        assert "already running" in reply
+
+        release.set()
+        await bot._jobs.latest.task
+        bot._delivery.edit.assert_awaited_with(42, 5, "digest", "Markdown")
+
+    async def test_scheduled_run_is_a_tracked_job(self, bot):
+        bot._auth_complete = True
+        bot._delivery = MagicMock()
+        bot._delivery.send = AsyncMock(return_value=[MagicMock(message_id=5)])
+        bot._delivery.edit = AsyncMock()
+        release = asyncio.Event()
+        runs: list[list | None] = []
+
+        async def run_digest(**kwargs):
+            runs.append(kwargs.get("profiles"))
+            kwargs["progress"].stage = "summarizing"
+            await release.wait()
+            return "digest"
+
+        bot._run_digest = run_digest
+        await bot._handle_digest_now(_make_update("/digest_now"), None)
+        manual = bot._jobs.latest
+        profiles = [DigestProfile(name="daily", folder_name="Radar")]
+        scheduled = asyncio.create_task(bot.run_scheduled_digest(profiles))
+        await asyncio.sleep(0)
+
+        # The scheduled run waits for the manual one instead of overlapping
+        assert bot._jobs.latest is manual
+        release.set()
+        await scheduled
+
+        assert runs == [None, profiles]
+        assert bot._jobs.latest.id == manual.id + 1
+        status = _make_update("/status")
+        await bot._handle_status(status, None)
+        reply = status.effective_chat.send_message.call_args[0][0]
+        assert f"#{manual.id + 1}: finished" in reply
+        bot._delivery.send.assert_awaited_with(
+            bot._settings.tg_owner_user_id, "digest"
+        )
+
+
 # --- Command menu tests (US2) ---
 
 
@@ -544,3 +781,36 @@ class TestCommandMenu:
 
             # Should NOT raise
             await bot.start()
+
+    async def test_webhook_mode_skips_polling(self):
+        settings = _make_settings()
+        settings.tg_webhook_url = "https://radar.example.com/tg/hook"
+        settings.tg_webhook_secret = "s3cret"
+        bot = TelegramBotController(
+            settings=settings,
+            gateway=FakeGateway(),
+            summarizer=FakeSummarizer(),
+            state=FakeStateRepository(),
+            run_digest=AsyncMock(return_value="digest"),
+        )
+
+        with (
+            patch.object(bot, "_app") as mock_app,
+            patch("telegram_radar.webhook.WebhookServer") as server_cls,
+        ):
+            mock_app.initialize = AsyncMock()
+            mock_app.start = AsyncMock()
+            mock_app.updater = MagicMock()
+            mock_app.updater.start_polling = AsyncMock()
+            mock_app.bot.set_webhook = AsyncMock()
+            mock_app.bot.set_my_commands = AsyncMock()
+            server_cls.return_value.start = AsyncMock()
+
+            await bot.start()
+
+            mock_app.updater.start_polling.assert_not_awaited()
+            assert server_cls.call_args.kwargs["path"] == "/tg/hook"
+            server_cls.return_value.start.assert_awaited_once()
+            mock_app.bot.set_webhook.assert_awaited_once_with(
+                "https://radar.example.com/tg/hook", secret_token="s3cret"
+            )
@@ -0,0 +1,115 @@
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from telegram_radar.archive import PostArchive
+from telegram_radar.models import Comment, Post
+
+# Roughly six months of a busy folder
+N_HISTORY = 30_000
+_WORDS = (
+    "release grant deadline conference model dataset hiring meetup "
+    "benchmark paper launch update security patch funding course"
+).split()
+
+
+def _make_post(
+    post_id: int, text: str, age_days: float = 1.0, comments=()
+) -> Post:
+    date = datetime.now(timezone.utc) - timedelta(days=age_days)
+    return Post(
+        id=post_id,
+        channel_id=1,
+        channel_title="ML News",
+        date=date,
+        text=text,
+        permalink=f"https://t.me/mlnews/{post_id}",
+        comments=list(comments),
+    )
+
+
+class TestPostArchive:
+    def test_insert_is_incremental(self, tmp_path: Path) -> None:
+        archive = PostArchive(tmp_path / "archive.sqlite3")
+        comment = Comment(
+            id=7,
+            author_name="Ann",
+            date=datetime.now(timezone.utc),
+            text="Great grant news",
+        )
+        post = _make_post(1, "Grant applications open", comments=[comment])
+
+        assert archive.add_posts([post]) == 2
+        assert archive.add_posts([post, _make_post(2, "Other")]) == 1
+        archive.close()
+
+    def test_search_ranks_matches_with_permalinks(
+        self, tmp_path: Path
+    ) -> None:
+        archive = PostArchive(tmp_path / "archive.sqlite3")
+        archive.add_posts(
+            [
+                _make_post(1, "Weekly roundup: a conference and a grant"),
+                _make_post(2, "Grant deadline: grant applications close"),
+                _make_post(3, "Nothing relevant here"),
+            ]
+        )
+
+        hits = archive.search("grant")
+
+        assert [h.url for h in hits] == [
+            "https://t.me/mlnews/2",
+            "https://t.me/mlnews/1",
+        ]
+        assert "«Grant»" in hits[0].snippet
+        # Words match as prefixes, standing in for stemming
+        assert len(archive.search("applic")) == 1
+        archive.close()
+
+    def test_query_syntax_is_not_interpreted(self, tmp_path: Path) -> None:
+        archive = PostArchive(tmp_path / "archive.sqlite3")
+        archive.add_posts([_make_post(1, 'He said "NEAR" AND left-wing')])
+
+        assert len(archive.search('"near" AND left-wing')) == 1
+        assert archive.search("   ") == []
+        assert archive.search("OR (") == []
+        archive.close()
+
+    def test_prune_respects_retention(self, tmp_path: Path) -> None:
+        archive = PostArchive(tmp_path / "archive.sqlite3", retention_days=30)
+        archive.add_posts(
+            [
+                _make_post(1, "old grant", age_days=40),
+                _make_post(2, "new grant", age_days=1),
+            ]
+        )
+
+        assert archive.prune() == 1
+        assert [h.url for h in archive.search("grant")] == [
+            "https://t.me/mlnews/2"
+        ]
+        archive.close()
+
+    def test_search_over_months_of_history(self, tmp_path: Path) -> None:
+        # Benchmark: search latency over a large archive
+        rng = random.Random(0)
+        archive = PostArchive(tmp_path / "archive.sqlite3")
+        archive.add_posts(
+            [
+                _make_post(
+                    i,
+                    " ".join(rng.choices(_WORDS, k=40)),
+                    age_days=i / 200,
+                )
+                for i in range(N_HISTORY)
+            ]
+        )
+
+        start = time.perf_counter()
+        hits = archive.search("grant deadline")
+        elapsed = time.perf_counter() - start
+
+        assert len(hits) == 10
+        assert elapsed < 0.5
+        archive.close()
@@ -0,0 +1,62 @@
+import httpx
+import instructor
+import pytest
+
+from telegram_radar.backends import (
+    LOCAL_BASE_URL,
+    LLMBackend,
+    LocalBackend,
+    OpenAICompatibleBackend,
+    create_backend,
+)
+from telegram_radar.settings import Settings
+
+
+def _make_settings(**kwargs) -> Settings:
+    return Settings(
+        telegram_api_id=12345,
+        telegram_api_hash="testhash",
+        tg_bot_token="bot:token",
+        tg_owner_user_id=1,
+        llm_model="model",
+        **kwargs,
+    )
+
+
+class TestCreateBackend:
+    def test_openai_by_default(self) -> None:
+        backend = create_backend(_make_settings(llm_api_key="sk-test"))
+        assert type(backend) is LLMBackend
+        assert instructor.Mode(backend.mode) == instructor.Mode.TOOLS
+
+    def test_compatible_requires_base_url(self) -> None:
+        settings = _make_settings(
+            llm_provider="openai_compatible", llm_api_key="key"
+        )
+        with pytest.raises(ValueError, match="LLM_BASE_URL"):
+            create_backend(settings)
+
+    @pytest.mark.parametrize("provider", ["openai", "openai_compatible"])
+    def test_hosted_providers_require_key(self, provider: str) -> None:
+        with pytest.raises(ValueError, match="LLM_API_KEY"):
+            _make_settings(llm_provider=provider)
+
+    def test_compatible_uses_base_url(self) -> None:
+        settings = _make_settings(
+            llm_provider="openai_compatible",
+            llm_base_url="https://llm.example.com/v1",
+            llm_api_key="key",
+        )
+        backend = create_backend(settings)
+        assert isinstance(backend, OpenAICompatibleBackend)
+        assert instructor.Mode(backend.mode) == instructor.Mode.JSON
+
+    async def test_local_needs_no_key(self) -> None:
+        backend = create_backend(_make_settings(llm_provider="local"))
+        assert isinstance(backend, LocalBackend)
+        assert backend.http2 is False
+
+        client = backend.create_client(httpx.AsyncClient())
+        assert str(client.base_url).rstrip("/") == LOCAL_BASE_URL
+        assert client.api_key
+        await client.close()
@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 
-from telegram_radar.batch_builder import BatchBuilder
+from telegram_radar.batch_builder import BatchBuilder, split_text
+from telegram_radar.compact import CompactBatchPrompt
 from telegram_radar.models import Comment, Post
 
 
@@ -49,10 +50,35 @@ class TestBatchBuilder:
         total_posts = sum(b.post_count for b in batches)
         assert total_posts == 10
 
-    def test_post_exceeding_budget_is_skipped(self) -> None:
-        posts = [_make_post("X" * 6000)]
-        batches = self.builder.build_batches(posts, max_chars_per_batch=5000)
-        assert len(batches) == 0
+    def test_oversized_post_split_into_parts(self) -> None:
+        words = " ".join(f"word{i}" for i in range(1500))
+        builder = BatchBuilder(chunk_overlap_chars=200)
+        batches = builder.build_batches(
+            [_make_post(words)], max_chars_per_batch=5000
+        )
+        payloads = [p for b in batches for p in b.payloads]
+        assert len(payloads) > 1
+        assert [p.part for p in payloads] == list(range(1, len(payloads) + 1))
+        assert all(p.parts == len(payloads) for p in payloads)
+        assert all(b.total_chars <= 5000 for b in batches)
+        # Consecutive parts overlap and every word survives
+        assert payloads[0].text[-100:] in payloads[1].text
+        joined = " ".join(p.text for p in payloads)
+        assert all(f"word{i} " in joined + " " for i in range(1500))
+
+    def test_comments_ranked_by_signal(self) -> None:
+        quiet = _make_comment("C" * 300, comment_id=1)
+        liked = _make_comment("Short but loved", comment_id=2)
+        liked.reactions = 12
+        discussed = _make_comment("Started a thread", comment_id=3)
+        discussed.replies = 4
+        posts = [_make_post("Short", comments=[quiet, liked, discussed])]
+
+        batches = self.builder.build_batches(posts, max_chars_per_batch=200)
+
+        payload = batches[0].payloads[0]
+        # Chronological order is kept among the selected comments
+        assert [c.id for c in payload.comments] == [2, 3]
 
     def test_comments_trimmed_to_fit_budget(self) -> None:
         comments = [
@@ -77,3 +103,30 @@ class TestBatchBuilder:
         assert b.post_count == 1
         assert b.comment_count == 2
         assert b.total_chars > 0
+
+    def test_budget_covers_rendered_prompt(self) -> None:
+        comments = [
+            _make_comment("See https://example.com/a " * 5, comment_id=i)
+            for i in range(5)
+        ]
+        posts = [
+            _make_post("**Bold** news " * 20, post_id=i, comments=comments)
+            for i in range(30)
+        ]
+        batches = self.builder.build_batches(posts, max_chars_per_batch=2000)
+        for batch in batches:
+            prompt = CompactBatchPrompt(batch).text
+            assert len(prompt) <= batch.total_chars <= 2000
+            # The prompt reuses the fragments rendered for budgeting
+            assert batch.payloads[0].text in prompt
+
+
+class TestSplitText:
+    def test_short_text_unchanged(self) -> None:
+        assert split_text("Hello world", 100, 10) == ["Hello world"]
+
+    def test_prefers_paragraph_boundaries(self) -> None:
+        text = "First paragraph here.\n\n" + "Second one " * 5
+        chunks = split_text(text, 40, 0)
+        assert chunks[0] == "First paragraph here."
+        assert all(len(c) <= 40 for c in chunks)
@@ -0,0 +1,184 @@
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+from telegram_radar.cache import DigestCache
+from telegram_radar.models import (
+    ChannelInfo,
+    Comment,
+    DigestItem,
+    Post,
+    PostPage,
+)
+from telegram_radar.settings import Settings
+
+
+class FakeGateway:
+    def __init__(self, posts: list[Post]) -> None:
+        self.posts = posts
+        self.fetch_calls: list[int | None] = []
+        self.pages = 0
+        self.comment_calls = 0
+
+    async def fetch_posts(
+        self,
+        channel: ChannelInfo,
+        since_message_id: int | None,
+        since_hours: int,
+        limit: int,
+        offset_id: int = 0,
+        reverse: bool = False,
+    ) -> PostPage:
+        # Newest first, like Telethon, or oldest first when reversed; an
+        # empty text stands for a media-only message, which is read but
+        # yields no post
+        self.pages += 1
+        if not offset_id:
+            self.fetch_calls.append(since_message_id)
+        messages = sorted(
+            (
+                p
+                for p in self.posts
+                if (since_message_id is None or p.id > since_message_id)
+                and (not offset_id or p.id < offset_id)
+            ),
+            key=lambda p: p.id,
+            reverse=not reverse,
+        )[:limit]
+        ids = [p.id for p in messages]
+        return PostPage(
+            posts=[replace(p) for p in messages if p.text],
+            scanned=len(messages),
+            oldest_id=min(ids, default=None),
+            newest_id=max(ids, default=None),
+        )
+
+    async def fetch_comments(
+        self,
+        channel: ChannelInfo,
+        post: Post,
+        limit: int,
+        max_comment_len: int,
+    ) -> list[Comment]:
+        self.comment_calls += 1
+        return []
+
+
+def _make_settings(**kwargs: int) -> Settings:
+    return Settings(
+        telegram_api_id=12345,
+        telegram_api_hash="testhash",
+        tg_bot_token="bot:token",
+        tg_owner_user_id=1,
+        llm_model="test-model",
+        llm_api_key="test-key",
+        **kwargs,
+    )
+
+
+def _make_post(
+    post_id: int, age_hours: int = 1, media_only: bool = False
+) -> Post:
+    return Post(
+        id=post_id,
+        channel_id=1,
+        channel_title="Test",
+        date=datetime.now(timezone.utc) - timedelta(hours=age_hours),
+        text="" if media_only else f"Post {post_id}",
+        permalink=f"https://t.me/test/{post_id}",
+    )
+
+
+CHANNEL = ChannelInfo(id=1, title="Test")
+
+
+class TestDigestCache:
+    async def test_second_request_only_fetches_new_posts(self) -> None:
+        gateway = FakeGateway([_make_post(1), _make_post(2)])
+        cache = DigestCache(_make_settings())
+
+        first, _ = await cache.fetch_posts(gateway, CHANNEL, 0)
+        gateway.posts.append(_make_post(3))
+        second, _ = await cache.fetch_posts(gateway, CHANNEL, 1)
+
+        assert {p.id for p in first} == {1, 2}
+        assert {p.id for p in second} == {2, 3}
+        assert gateway.fetch_calls == [0, 2]
+        assert gateway.comment_calls == 3
+
+    async def test_older_cursor_than_cached_floor_refetches(self) -> None:
+        gateway = FakeGateway([_make_post(1), _make_post(2)])
+        cache = DigestCache(_make_settings())
+
+        await cache.fetch_posts(gateway, CHANNEL, 1)
+        posts, _ = await cache.fetch_posts(gateway, CHANNEL, 0)
+
+        assert {p.id for p in posts} == {1, 2}
+        assert gateway.fetch_calls == [1, 0]
+
+    async def test_expired_posts_are_pruned(self) -> None:
+        gateway = FakeGateway([_make_post(1, age_hours=100), _make_post(2)])
+        cache = DigestCache(_make_settings(fetch_cache_ttl_hours=48))
+        await cache.fetch_posts(gateway, CHANNEL, 0)
+
+        posts, _ = await cache.fetch_posts(gateway, CHANNEL, 0)
+
+        # The pruned range is no longer covered, so the cache refetches
+        assert gateway.fetch_calls == [0, 0]
+        assert {p.id for p in posts} == {1, 2}
+
+    async def test_pages_down_to_cursor(self) -> None:
+        gateway = FakeGateway(
+            [_make_post(i, media_only=i == 4) for i in range(1, 8)]
+        )
+        cache = DigestCache(_make_settings(fetch_limit_per_channel=3))
+
+        posts, truncated = await cache.fetch_posts(gateway, CHANNEL, 1)
+
+        assert [p.id for p in posts] == [7, 6, 5, 3, 2]
+        assert truncated is False
+        assert gateway.pages == 3
+
+    async def test_truncation_counts_media_only_messages(self) -> None:
+        # The first page is full but yields only two posts
+        gateway = FakeGateway(
+            [_make_post(i, media_only=i == 5) for i in range(1, 6)]
+        )
+        cache = DigestCache(_make_settings(fetch_limit_per_channel=3))
+
+        posts, truncated = await cache.fetch_posts(gateway, CHANNEL, None)
+        assert [p.id for p in posts] == [4, 3]
+        assert truncated is True
+
+        posts, truncated = await cache.fetch_posts(gateway, CHANNEL, None, 10)
+        assert len(posts) == 4
+        assert truncated is False
+
+    async def test_slices_read_backlog_oldest_first(self) -> None:
+        gateway = FakeGateway(
+            [_make_post(i, media_only=i == 3) for i in range(1, 6)]
+        )
+        cache = DigestCache(_make_settings())
+
+        first, cursor = await cache.fetch_slice(gateway, CHANNEL, 0, 3)
+        second, end = await cache.fetch_slice(gateway, CHANNEL, cursor, 3)
+
+        assert [p.id for p in first] == [1, 2]
+        assert cursor == 3
+        assert [p.id for p in second] == [4, 5]
+        assert end is None
+
+    def test_items_keyed_by_prompt(self) -> None:
+        cache = DigestCache(_make_settings())
+        post = _make_post(1)
+        item = DigestItem(
+            title="T",
+            why_relevant="W",
+            source_url=post.permalink,
+            post_quote="Q",
+            channel="Test",
+            date="2026-01-01",
+            priority=0.5,
+        )
+        cache.put_items(None, post, [item])
+        assert cache.get_items(None, post) == [item]
+        assert cache.get_items("other prompt", post) is None
@@ -0,0 +1,111 @@
+from datetime import datetime, timezone
+
+from telegram_radar.batch_builder import render_payloads
+from telegram_radar.compact import CompactBatchPrompt, compact_text
+from telegram_radar.models import (
+    Batch,
+    Comment,
+    LenientDigestItem,
+    Post,
+    PostPayload,
+)
+
+
+def _make_batch(n_posts: int = 2) -> Batch:
+    payloads: list[PostPayload] = []
+    for i in range(1, n_posts + 1):
+        post = Post(
+            id=i,
+            channel_id=100,
+            channel_title="A Fairly Long Channel Title",
+            date=datetime(2026, 1, 15, 9, 30, tzinfo=timezone.utc),
+            text=(
+                f"**Post {i}**: the call for papers closes soon, details at "
+                f"https://example.com/events/2026/cfp?utm_source=tg\n\n\n"
+                "Подписывайтесь на канал!\n#news #events"
+            ),
+            permalink=f"https://t.me/longchannelname/{1000 + i}",
+        )
+        comment = Comment(
+            id=i,
+            author_name="Reader",
+            date=datetime(2026, 1, 15, tzinfo=timezone.utc),
+            text="Great 🔥🔥 see https://example.org/x",
+            link=f"https://t.me/c/555/{i}",
+        )
+        post.comments = [comment]
+        payloads.append(render_payloads(post, 10_000)[0])
+    return Batch(
+        payloads=payloads,
+        total_chars=0,
+        post_count=n_posts,
+        comment_count=n_posts,
+    )
+
+
+def _verbose_prompt(batch: Batch) -> str:
+    """The previous per-post layout, kept for size comparison."""
+    parts: list[str] = []
+    for payload in batch.payloads:
+        post = payload.post
+        parts.append(
+            f"=== POST from [{post.channel_title}] ===\n"
+            f"Date: {post.date.isoformat()}\n"
+            f"URL: {post.permalink}\n"
+            f"Text:\n{post.text}\n"
+        )
+        for comment in payload.comments:
+            parts.append(
+                f"  -- Comment by {comment.author_name} ({comment.link}):\n"
+                f"  {comment.text}\n"
+            )
+    return "\n".join(parts)
+
+
+class TestCompactText:
+    def test_links_emoji_and_boilerplate_removed(self) -> None:
+        text = (
+            "**Big** [news](https://example.com/a)  here 🎉\n\n\n"
+            "see https://www.example.org/long/path?x=1\n"
+            "Subscribe to our channel\n#tag @mention"
+        )
+        assert compact_text(text) == "Big news here\nsee <example.org>"
+
+    def test_lines_starting_like_a_call_to_action_kept(self) -> None:
+        text = (
+            "Подписание договора до 15 марта\n"
+            "Subscribe by Friday to get the grant\n"
+            "Подписывайтесь: @channel https://t.me/channel\n"
+            "#ai #ml\nReal text here"
+        )
+        assert compact_text(text) == (
+            "Подписание договора до 15 марта\n"
+            "Subscribe by Friday to get the grant\n"
+            "Real text here"
+        )
+
+
+class TestCompactBatchPrompt:
+    def test_ids_resolve_to_permalinks(self) -> None:
+        prompt = CompactBatchPrompt(_make_batch())
+        assert "Channels: C1=A Fairly Long Channel Title" in prompt.text
+        assert "#P2 C1 2026-01-15" in prompt.text
+        assert "> P1.c1 Reader: Great see <example.org>" in prompt.text
+
+        item = LenientDigestItem(source_url="P2", channel="C1")
+        resolved = prompt.resolve(item)
+        assert resolved.source_url == "https://t.me/longchannelname/1002"
+        assert resolved.channel == "A Fairly Long Channel Title"
+        comment = prompt.resolve(LenientDigestItem(source_url="#P1.c1"))
+        assert comment.source_url == "https://t.me/c/555/1"
+
+    def test_unknown_ids_left_untouched(self) -> None:
+        prompt = CompactBatchPrompt(_make_batch())
+        item = LenientDigestItem(source_url="https://t.me/x/1")
+        assert prompt.resolve(item) is item
+
+    def test_prompt_much_smaller_than_verbose_layout(self) -> None:
+        batch = _make_batch(20)
+        compact = len(CompactBatchPrompt(batch).text)
+        verbose = len(_verbose_prompt(batch))
+        assert compact < verbose * 0.6
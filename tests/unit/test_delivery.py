@@ -0,0 +1,123 @@
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from telegram.error import BadRequest, RetryAfter, TimedOut
+
+from telegram_radar.delivery import (
+    MessageDelivery,
+    ProgressiveMessage,
+    split_message,
+)
+
+
+class FakeBot:
+    def __init__(self, errors: list[Exception] | None = None) -> None:
+        self.errors = errors or []
+        self.sent: list[tuple[str, str | None]] = []
+        self.edits: list[tuple[int, str]] = []
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.sent.append((text, parse_mode))
+        return SimpleNamespace(message_id=len(self.sent), text=text)
+
+    async def edit_message_text(self, chat_id, message_id, text, parse_mode):
+        self.edits.append((message_id, text))
+        return True
+
+
+class TestSplitMessage:
+    def test_short_text_single_chunk(self) -> None:
+        assert split_message("Hello\nworld") == ["Hello\nworld"]
+
+    def test_splits_on_lines(self) -> None:
+        text = "\n".join(["a" * 30] * 10)
+        chunks = split_message(text, max_len=100)
+        assert all(len(c) <= 100 for c in chunks)
+        assert "\n".join(chunks) == text
+
+    def test_long_line_split_on_spaces(self) -> None:
+        line = " ".join(["word"] * 300)
+        chunks = split_message(line, max_len=100)
+        assert all(len(c) <= 100 for c in chunks)
+        assert " ".join(chunks) == line
+
+
+class TestMessageDelivery:
+    async def test_retry_after_honoured(self, monkeypatch) -> None:
+        sleeps: list[float] = []
+
+        async def fake_sleep(delay: float) -> None:
+            sleeps.append(delay)
+
+        monkeypatch.setattr("telegram_radar.delivery.asyncio.sleep", fake_sleep)
+        bot = FakeBot(errors=[RetryAfter(timedelta(seconds=7))])
+        delivery = MessageDelivery(bot, interval=0)
+
+        await delivery.send(1, "Digest")
+
+        assert 7 in sleeps
+        assert bot.sent == [("Digest", "Markdown")]
+
+    async def test_markdown_failure_falls_back_per_chunk(self) -> None:
+        bot = FakeBot(errors=[BadRequest("Can't parse entities")])
+        delivery = MessageDelivery(bot, interval=0)
+        text = "*broken\n" + "\n".join(["line"] * 2000)
+
+        await delivery.send(1, text)
+
+        # Only the rejected chunk loses formatting
+        assert bot.sent[0][1] is None
+        assert all(mode == "Markdown" for _, mode in bot.sent[1:])
+        assert len(bot.sent) == len(split_message(text))
+
+    async def test_other_bad_requests_raise(self) -> None:
+        bot = FakeBot(errors=[BadRequest("Chat not found")])
+        delivery = MessageDelivery(bot, interval=0)
+        with pytest.raises(BadRequest):
+            await delivery.send(1, "Digest")
+
+    async def test_network_errors_retried(self, monkeypatch) -> None:
+        async def fake_sleep(delay: float) -> None:
+            pass
+
+        monkeypatch.setattr("telegram_radar.delivery.asyncio.sleep", fake_sleep)
+        bot = FakeBot(errors=[TimedOut(), TimedOut()])
+        delivery = MessageDelivery(bot, interval=0)
+
+        await delivery.send(1, "Digest")
+
+        assert bot.sent == [("Digest", "Markdown")]
+
+
+class TestProgressiveMessage:
+    async def test_updates_coalesced_into_throttled_edits(self) -> None:
+        bot = FakeBot()
+        progress = ProgressiveMessage(
+            MessageDelivery(bot, interval=0), 1, interval=0.05
+        )
+        await progress.start("Generating digest...")
+
+        for i in range(10):
+            progress.update(f"{i + 1} items")
+        await asyncio.sleep(0.12)
+
+        assert bot.edits == [(1, "10 items")]
+
+    async def test_finish_replaces_placeholder_and_sends_overflow(self) -> None:
+        bot = FakeBot()
+        progress = ProgressiveMessage(
+            MessageDelivery(bot, interval=0), 1, interval=10
+        )
+        await progress.start("Generating digest...")
+        progress.update("1 item")
+        final = "\n".join(f"line {i}" for i in range(1000))
+
+        await progress.finish(final)
+
+        chunks = split_message(final)
+        assert bot.edits == [(1, chunks[0])]
+        assert [text for text, _ in bot.sent[1:]] == chunks[1:]
@@ -1,4 +1,4 @@
-from telegram_radar.digest_builder import DigestBuilder
+from telegram_radar.digest_builder import DigestBuilder, IncrementalDigest
 from telegram_radar.models import DigestBatchResult, DigestItem
 
 
@@ -75,3 +75,52 @@ class TestDigestBuilder:
         assert "**Test Title**" in digest
         assert "[Source](" in digest
         assert '"Some quote from post"' in digest
+
+    def test_summary_rendered_under_header(self) -> None:
+        items = [_make_item("Test Title", priority=0.8)]
+        br = DigestBatchResult(items=items, batch_summary="Test")
+        digest = self.builder.build_digest(
+            [br], max_items=10, urgent_days=7, summary="Busy day."
+        )
+        lines = digest.split("\n")
+        assert lines[2] == "Busy day."
+
+    def test_items_grouped_by_topic(self) -> None:
+        def item(title: str, why: str, priority: float) -> DigestItem:
+            return _make_item(title, priority=priority).model_copy(
+                update={"why_relevant": why, "post_quote": why}
+            )
+
+        items = [
+            item("Grant A", "research grant deadline extended", 0.9),
+            item("Talk", "conference talk schedule published", 0.8),
+            item("Grant B", "grant deadline for research labs", 0.7),
+            item("Grant C", "another research grant deadline", 0.1),
+        ]
+        br = DigestBatchResult(items=items, batch_summary="Test")
+        digest = self.builder.build_digest(
+            [br], max_items=3, urgent_days=7, topic_similarity=0.3
+        )
+        lines = digest.split("\n")
+        heading = next(
+            i for i, line in enumerate(lines) if "+1 related" in line
+        )
+        assert "Grant A" in lines[heading + 1]
+        assert "Other highlights:" in digest
+        assert digest.index("Grant B") < digest.index("Talk")
+        assert "Grant C" not in digest
+
+
+class TestIncrementalDigest:
+    def test_items_ranked_on_insert(self) -> None:
+        ranker = IncrementalDigest(urgent_days=36500)
+        ranker.add(_make_item("Low", priority=0.2))
+        ranker.add(_make_item("Urgent later", deadline="2030-02-01"))
+        ranker.add(_make_item("High", priority=0.9))
+        ranker.add(_make_item("Urgent soon", deadline="2030-01-01"))
+        assert [i.title for i in ranker.top(3)] == [
+            "Urgent soon",
+            "Urgent later",
+            "High",
+        ]
+        assert len(ranker) == 4
@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+from telegram_radar.health import HealthMonitor, percentile
+
+
+def _monitor(probes, **kwargs) -> HealthMonitor:
+    kwargs.setdefault("interval", 60.0)
+    kwargs.setdefault("timeout", 1.0)
+    return HealthMonitor(probes, **kwargs)
+
+
+class TestPercentile:
+    def test_nearest_rank(self) -> None:
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 95) == 95.0
+        assert percentile([3.0], 95) == 3.0
+
+
+class TestHealthMonitor:
+    async def test_checks_run_concurrently(self) -> None:
+        async def slow() -> bool:
+            await asyncio.sleep(0.2)
+            return True
+
+        monitor = _monitor({"a": slow, "b": slow})
+        start = time.monotonic()
+        results = await monitor.probe()
+        assert time.monotonic() - start < 0.35
+        assert results["a"].ok and results["b"].ok
+
+    async def test_timeout_and_errors_are_unhealthy(self) -> None:
+        async def hangs() -> bool:
+            await asyncio.sleep(10)
+            return True
+
+        async def fails() -> bool:
+            raise ConnectionError("down")
+
+        monitor = _monitor({"hangs": hangs, "fails": fails}, timeout=0.05)
+        results = await monitor.probe()
+        assert results["hangs"].ok is False
+        assert results["hangs"].latency < 1.0
+        assert results["fails"].ok is False
+
+    async def test_history_bounded_with_percentiles(self) -> None:
+        async def ok() -> bool:
+            return True
+
+        monitor = _monitor({"ok": ok}, history=3)
+        assert monitor.latest("ok") is None
+        assert monitor.latency_percentiles("ok") is None
+        for _ in range(5):
+            await monitor.probe()
+        assert len(monitor._history["ok"]) == 3
+        p50, p95 = monitor.latency_percentiles("ok")
+        assert 0 <= p50 <= p95
+
+    async def test_background_loop_probes_until_stopped(self) -> None:
+        calls = 0
+
+        async def check() -> bool:
+            nonlocal calls
+            calls += 1
+            return True
+
+        monitor = _monitor({"x": check}, interval=0.01)
+        monitor.start()
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+        seen = calls
+        assert seen >= 2
+        await asyncio.sleep(0.03)
+        assert calls == seen
@@ -0,0 +1,73 @@
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from telegram_radar.history import DigestHistory
+from telegram_radar.models import DigestBatchResult, DigestItem
+
+
+def _result() -> DigestBatchResult:
+    item = DigestItem(
+        title="Grant",
+        why_relevant="Deadline soon",
+        source_url="https://t.me/test/1",
+        post_quote="Apply now",
+        channel="Test",
+        date="2026-01-15",
+        priority=0.8,
+    )
+    return DigestBatchResult(items=[item], batch_summary="Summary")
+
+
+def _record(history: DigestHistory, profile: str, digest: str) -> int:
+    return history.record(
+        profile,
+        digest,
+        [_result()],
+        post_count=3,
+        channel_count=2,
+        duration_seconds=1.5,
+    )
+
+
+class TestDigestHistory:
+    def test_latest_per_profile(self, tmp_path: Path) -> None:
+        history = DigestHistory(tmp_path / "digests.sqlite3")
+        assert history.latest() is None
+        _record(history, "default", "first")
+        _record(history, "work", "second")
+
+        assert history.latest().digest == "second"
+        stored = history.latest("default")
+        assert stored.digest == "first"
+        assert stored.post_count == 3
+        assert stored.channel_count == 2
+        history.close()
+
+    def test_results_round_trip(self, tmp_path: Path) -> None:
+        history = DigestHistory(tmp_path / "digests.sqlite3")
+        digest_id = _record(history, "default", "digest")
+
+        assert history.results(digest_id) == [_result()]
+        assert history.results(digest_id + 1) == []
+        history.close()
+
+    def test_on_date_uses_local_day(self, tmp_path: Path) -> None:
+        history = DigestHistory(tmp_path / "digests.sqlite3")
+        _record(history, "default", "today")
+        today = datetime.now().astimezone().date()
+
+        assert [d.digest for d in history.on_date(today)] == ["today"]
+        assert history.on_date(today - timedelta(days=1)) == []
+        assert history.on_date(today, "work") == []
+        assert history.on_date(date(2020, 1, 1)) == []
+        history.close()
+
+    def test_persists_across_instances(self, tmp_path: Path) -> None:
+        path = tmp_path / "digests.sqlite3"
+        history = DigestHistory(path)
+        _record(history, "default", "kept")
+        history.close()
+
+        reopened = DigestHistory(path)
+        assert reopened.latest().digest == "kept"
+        reopened.close()
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from telegram_radar.jobs import DigestJob, DigestJobs
+
+
+class TestDigestJobs:
+    async def test_job_runs_in_background(self) -> None:
+        jobs = DigestJobs()
+        release = asyncio.Event()
+
+        async def run(job: DigestJob) -> None:
+            job.progress.stage = "summarizing"
+            job.progress.batches_total = 3
+            job.progress.batches_done = 1
+            await release.wait()
+
+        job = jobs.start(run)
+        await asyncio.sleep(0)
+
+        assert jobs.running() is job
+        status = job.describe()
+        assert f"#{job.id}: summarizing" in status
+        assert "Batches: 1/3" in status
+
+        release.set()
+        await job.task
+        assert jobs.running() is None
+        assert "finished" in job.describe()
+
+    async def test_one_job_at_a_time(self) -> None:
+        jobs = DigestJobs()
+        release = asyncio.Event()
+
+        async def run(job: DigestJob) -> None:
+            await release.wait()
+
+        first = jobs.start(run)
+        with pytest.raises(RuntimeError):
+            jobs.start(run)
+        release.set()
+        await first.task
+
+        second = jobs.start(run)
+        assert second.id == first.id + 1
+        await second.task
+
+    async def test_start_when_idle_waits_for_running_job(self) -> None:
+        jobs = DigestJobs()
+        release = asyncio.Event()
+        order: list[int] = []
+
+        async def run(job: DigestJob) -> None:
+            order.append(job.id)
+            await release.wait()
+
+        first = jobs.start(run)
+        waiter = asyncio.create_task(jobs.start_when_idle(run))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        release.set()
+        second = await waiter
+        await second.task
+        assert order == [first.id, second.id]
+
+    async def test_failure_recorded(self) -> None:
+        jobs = DigestJobs()
+
+        async def run(job: DigestJob) -> None:
+            raise ValueError("LLM down")
+
+        job = jobs.start(run)
+        await job.task
+
+        assert not job.running
+        assert "failed: LLM down" in job.describe()
@@ -0,0 +1,93 @@
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from pydantic import BaseModel, Field
+
+from telegram_radar.models import Comment, Post, PostPayload
+
+N_MESSAGES = 100_000
+_DATE = datetime(2026, 1, 15, tzinfo=timezone.utc)
+
+
+class PydanticComment(BaseModel):
+    id: int
+    author_name: str | None = None
+    date: datetime
+    text: str
+    link: str | None = None
+
+
+class PydanticPost(BaseModel):
+    """The previous BaseModel definition of Post, for comparison."""
+
+    id: int
+    channel_id: int
+    channel_title: str
+    channel_username: str | None = None
+    date: datetime
+    text: str
+    permalink: str
+    is_forward: bool = False
+    comments: list[PydanticComment] = Field(default_factory=list)
+
+
+def _build(cls: type) -> list:
+    return [
+        cls(
+            id=i,
+            channel_id=1,
+            channel_title="Channel",
+            date=_DATE,
+            text="Post text",
+            permalink=f"https://t.me/channel/{i}",
+        )
+        for i in range(N_MESSAGES)
+    ]
+
+
+def _measure(cls: type) -> tuple[float, int]:
+    start = time.perf_counter()
+    _build(cls)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    try:
+        posts = _build(cls)
+        memory = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del posts
+    return elapsed, memory
+
+
+class TestHotPathRecords:
+    def test_payload_keeps_selected_comments(self) -> None:
+        comments = [
+            Comment(id=i, date=_DATE, text=f"Comment {i}") for i in range(3)
+        ]
+        post = Post(
+            id=1,
+            channel_id=1,
+            channel_title="Channel",
+            date=_DATE,
+            text="Post text",
+            permalink="https://t.me/channel/1",
+            comments=comments,
+        )
+        payload = PostPayload(
+            post=post,
+            text="Post text",
+            comments=comments[:2],
+            comment_texts=["Comment 0", "Comment 1"],
+            char_count=0,
+        )
+        assert payload.parts == 1
+        assert payload.comments == comments[:2]
+
+    def test_cheaper_than_pydantic_for_100k_messages(self) -> None:
+        # Benchmark: construction time and retained memory for 100k posts
+        dataclass_time, dataclass_memory = _measure(Post)
+        pydantic_time, pydantic_memory = _measure(PydanticPost)
+
+        assert dataclass_time < pydantic_time
+        assert dataclass_memory * 2 < pydantic_memory
@@ -1,10 +1,15 @@
-from datetime import datetime, timezone
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
+from telegram_radar.archive import PostArchive
 from telegram_radar.batch_builder import BatchBuilder
 from telegram_radar.digest_builder import DigestBuilder
+from telegram_radar.history import DigestHistory
 from telegram_radar.models import (
+    DEFAULT_PROFILE,
     AppState,
     Batch,
     ChannelInfo,
@@ -12,9 +17,13 @@ from telegram_radar.models import (
     Comment,
     DigestBatchResult,
     DigestItem,
+    DigestProfile,
     Post,
+    PostPage,
+    RunProgress,
 )
-from telegram_radar.pipeline import run_digest
+from telegram_radar.pipeline import fetch_limit, run_digest
+from telegram_radar.reducer import DigestReducer
 from telegram_radar.settings import Settings
 
 
@@ -27,12 +36,19 @@ class FakeGateway:
         channels: list[ChannelInfo] | None = None,
         posts_by_channel: dict[int, list[Post]] | None = None,
         comments_by_post: dict[int, list[Comment]] | None = None,
+        channels_by_folder: dict[str, list[ChannelInfo]] | None = None,
     ) -> None:
         self._channels = channels or []
         self._posts = posts_by_channel or {}
         self._comments = comments_by_post or {}
-
-    async def get_radar_channels(self) -> list[ChannelInfo]:
+        self._folders = channels_by_folder
+        self.fetch_calls: list[tuple[int, int | None]] = []
+
+    async def get_radar_channels(
+        self, folder_name: str | None = None
+    ) -> list[ChannelInfo]:
+        if self._folders is not None:
+            return self._folders.get(folder_name or "", [])
         return self._channels
 
     async def fetch_posts(
@@ -41,8 +57,28 @@ class FakeGateway:
         since_message_id: int | None,
         since_hours: int,
         limit: int,
-    ) -> list[Post]:
-        return self._posts.get(channel.id, [])
+        offset_id: int = 0,
+        reverse: bool = False,
+    ) -> PostPage:
+        if not offset_id:
+            self.fetch_calls.append((channel.id, since_message_id))
+        # Newest first, like Telethon, or oldest first when reversed
+        posts = sorted(
+            (
+                p
+                for p in self._posts.get(channel.id, [])
+                if (since_message_id is None or p.id > since_message_id)
+                and (not offset_id or p.id < offset_id)
+            ),
+            key=lambda p: p.id,
+            reverse=not reverse,
+        )[:limit]
+        return PostPage(
+            posts=posts,
+            scanned=len(posts),
+            oldest_id=min((p.id for p in posts), default=None),
+            newest_id=max((p.id for p in posts), default=None),
+        )
 
     async def fetch_comments(
         self,
@@ -66,14 +102,32 @@ class FakeSummarizer:
         self._results = results or []
         self._call_count = 0
         self._error_on_call = error_on_call
+        self.batches: list[Batch] = []
 
-    async def summarize_batch(self, batch: Batch) -> DigestBatchResult:
+    async def summarize_batch(
+        self,
+        batch: Batch,
+        instructions: str | None = None,
+        on_item: Callable[[DigestItem], None] | None = None,
+    ) -> DigestBatchResult:
         idx = self._call_count
         self._call_count += 1
+        self.batches.append(batch)
         if self._error_on_call is not None and idx == self._error_on_call:
             raise RuntimeError("LLM summarization failed")
         return self._results[idx]
 
+    async def triage_posts(
+        self, posts: list[Post], instructions: str | None = None
+    ) -> list[float]:
+        return [1.0] * len(posts)
+
+    async def reduce_results(
+        self, results: list[DigestBatchResult], max_items: int
+    ) -> DigestBatchResult:
+        items = [item for r in results for item in r.items]
+        return DigestBatchResult(items=items[:max_items], batch_summary="Day")
+
     async def check_health(self) -> bool:
         return True
 
@@ -90,8 +144,15 @@ class FakeStateRepository:
     def save(self) -> None:
         self._save_count += 1
 
-    def get_last_message_id(self, channel_id: int) -> int | None:
-        ch = self._state.channels.get(str(channel_id))
+    def _channels(self, profile: str) -> dict[str, ChannelState]:
+        if profile == DEFAULT_PROFILE:
+            return self._state.channels
+        return self._state.profile_channels.setdefault(profile, {})
+
+    def get_last_message_id(
+        self, channel_id: int, profile: str = DEFAULT_PROFILE
+    ) -> int | None:
+        ch = self._channels(profile).get(str(channel_id))
         return ch.last_processed_message_id if ch else None
 
     def update_channel(
@@ -99,17 +160,22 @@ class FakeStateRepository:
         channel_id: int,
         last_message_id: int,
         post_count: int,
+        profile: str = DEFAULT_PROFILE,
+        truncated: bool = False,
     ) -> None:
-        self._state.channels[str(channel_id)] = ChannelState(
+        self._channels(profile)[str(channel_id)] = ChannelState(
             last_processed_message_id=last_message_id,
             last_run_post_count=post_count,
+            last_run_truncated=truncated,
         )
 
     def record_last_run(self, channels_parsed: list[str]) -> None:
         self._last_run_calls.append(channels_parsed)
 
-    def get_channel_state(self, channel_id: int) -> ChannelState | None:
-        return self._state.channels.get(str(channel_id))
+    def get_channel_state(
+        self, channel_id: int, profile: str = DEFAULT_PROFILE
+    ) -> ChannelState | None:
+        return self._channels(profile).get(str(channel_id))
 
 
 # --- Helpers ---
@@ -147,11 +213,15 @@ def _make_comment(comment_id: int) -> Comment:
     )
 
 
-def _make_digest_item(title: str, priority: float = 0.5) -> DigestItem:
+def _make_digest_item(
+    title: str,
+    priority: float = 0.5,
+    source_url: str = "https://t.me/test/1",
+) -> DigestItem:
     return DigestItem(
         title=title,
         why_relevant="Test relevance",
-        source_url="https://t.me/test/1",
+        source_url=source_url,
         post_quote="Test quote here",
         channel="Test Channel",
         date="2026-01-15",
@@ -159,6 +229,9 @@ def _make_digest_item(title: str, priority: float = 0.5) -> DigestItem:
     )
 
 
+_URL_101 = "https://t.me/test/101"
+
+
 # --- Tests ---
 
 
@@ -207,6 +280,31 @@ class TestRunDigest:
         assert ch_state is not None
         assert ch_state.last_processed_message_id == 102
 
+    async def test_progress_reported(self) -> None:
+        channel = ChannelInfo(id=1, title="Test Channel")
+        gateway = FakeGateway(
+            channels=[channel],
+            posts_by_channel={1: [_make_post(101, 1, "Test Channel")]},
+        )
+        summarizer = FakeSummarizer(
+            results=[DigestBatchResult(items=[], batch_summary="")]
+        )
+        progress = RunProgress()
+
+        await run_digest(
+            gateway=gateway,
+            batch_builder=BatchBuilder(),
+            summarizer=summarizer,
+            digest_builder=DigestBuilder(),
+            state=FakeStateRepository(),
+            settings=_make_settings(),
+            progress=progress,
+        )
+
+        assert progress.stage == "done"
+        assert (progress.channels_done, progress.channels_total) == (1, 1)
+        assert (progress.batches_done, progress.batches_total) == (1, 1)
+
     async def test_digest_no_channels(self) -> None:
         gateway = FakeGateway(channels=[])
         summarizer = FakeSummarizer()
@@ -271,3 +369,578 @@ class TestRunDigest:
                 state=state,
                 settings=settings,
             )
+
+
+class TestFetchLimits:
+    def test_quiet_or_unknown_channels_get_minimum(self) -> None:
+        settings = _make_settings()
+        quiet = ChannelState(
+            last_processed_message_id=1,
+            posts_per_day=1.0,
+            updated_at=datetime.now(timezone.utc) - timedelta(days=1),
+        )
+        assert fetch_limit([None], settings) == 50
+        assert fetch_limit([quiet], settings) == 50
+
+    def test_busy_channel_scaled_by_rate_and_capped(self) -> None:
+        settings = _make_settings()
+        busy = ChannelState(
+            last_processed_message_id=1,
+            posts_per_day=60.0,
+            updated_at=datetime.now(timezone.utc) - timedelta(days=1),
+        )
+        assert 120 <= fetch_limit([busy], settings) <= 121
+        busy.updated_at -= timedelta(days=30)
+        assert fetch_limit([busy], settings) == 500
+
+    def test_truncated_channel_gets_maximum(self) -> None:
+        truncated = ChannelState(
+            last_processed_message_id=1, last_run_truncated=True
+        )
+        assert fetch_limit([None, truncated], _make_settings()) == 500
+
+    async def test_truncation_recorded_in_state(self) -> None:
+        channel = ChannelInfo(id=1, title="Busy")
+        gateway = FakeGateway(
+            channels=[channel],
+            posts_by_channel={
+                1: [_make_post(i, 1, "Busy") for i in range(100, 103)]
+            },
+        )
+        settings = _make_settings()
+        settings.fetch_limit_per_channel = 3
+        state = FakeStateRepository()
+
+        await run_digest(
+            gateway=gateway,
+            batch_builder=BatchBuilder(),
+            summarizer=FakeSummarizer(
+                results=[DigestBatchResult(items=[], batch_summary="")]
+            ),
+            digest_builder=DigestBuilder(),
+            state=state,
+            settings=settings,
+        )
+
+        assert state.get_channel_state(1).last_run_truncated is True
+
+    async def test_backlog_above_cap_paged_to_cursor(self) -> None:
+        channel = ChannelInfo(id=1, title="Busy")
+        gateway = FakeGateway(
+            channels=[channel],
+            posts_by_channel={
+                1: [_make_post(i, 1, "Busy") for i in range(100, 113)]
+            },
+        )
+        settings = _make_settings()
+        settings.fetch_limit_per_channel = 3
+        settings.fetch_limit_max_per_channel = 5
+        state = FakeStateRepository()
+        state.update_channel(1, 100, 1, truncated=True)
+        summarizer = FakeSummarizer(
+            results=[DigestBatchResult(items=[], batch_summary="")]
+        )
+
+        await run_digest(
+            gateway=gateway,
+            batch_builder=BatchBuilder(),
+            summarizer=summarizer,
+            digest_builder=DigestBuilder(),
+            state=state,
+            settings=settings,
+        )
+
+        summarized = {
+            p.post.id for b in summarizer.batches for p in b.payloads
+        }
+        assert summarized == set(range(101, 113))
+        ch_state = state.get_channel_state(1)
+        assert ch_state.last_processed_message_id == 112
+        assert ch_state.last_run_truncated is False
+
+
+class TestArchive:
+    async def test_fetched_posts_archived(self, tmp_path) -> None:
+        channel = ChannelInfo(id=1, title="Test Channel")
+        gateway = FakeGateway(
+            channels=[channel],
+            posts_by_channel={1: [_make_post(101, 1, channel.title)]},
+            comments_by_post={101: [_make_comment(201)]},
+        )
+        archive = PostArchive(tmp_path / "archive.sqlite3")
+
+        await run_digest(
+            gateway=gateway,
+            batch_builder=BatchBuilder(),
+            summarizer=FakeSummarizer(
+                results=[DigestBatchResult(items=[], batch_summary="")]
+            ),
+            digest_builder=DigestBuilder(),
+            state=FakeStateRepository(),
+            settings=_make_settings(),
+            archive=archive,
+        )
+
+        assert [h.url for h in archive.search("content")] == [
+            "https://t.me/test/101"
+        ]
+        assert [h.kind for h in archive.search("comment")] == ["comment"]
+        archive.close()
+
+
+class TestHistory:
+    async def test_run_recorded_with_results(self, tmp_path) -> None:
+        channel = ChannelInfo(id=1, title="Test Channel")
+        gateway = FakeGateway(
+            channels=[channel],
+            posts_by_channel={1: [_make_post(101, 1, channel.title)]},
+        )
+        result = DigestBatchResult(
+            items=[_make_digest_item("Item 1", source_url=_URL_101)],
+            batch_summary="Summary",
+        )
+        history = DigestHistory(tmp_path / "digests.sqlite3")
+
+        digest = await run_digest(
+            gateway=gateway,
+            batch_builder=BatchBuilder(),
+            summarizer=FakeSummarizer(results=[result]),
+            digest_builder=DigestBuilder(),
+            state=FakeStateRepository(),
+            settings=_make_settings(),
+            history=history,
+        )
+
+        stored = history.latest()
+        assert stored.digest == digest
+        assert stored.profile == DEFAULT_PROFILE
+        assert stored.post_count == 1
+        assert stored.channel_count == 1
+        assert history.results(stored.id) == [result]
+        history.close()
+
+
+class TestSplitPosts:
+    async def test_items_from_parts_merged(self) -> None:
+        channel = ChannelInfo(id=1, title="Test Channel")
+        post = _make_post(101, channel.id, channel.title)
+        post.text = " ".join(f"word{i}" for i in range(120))
+        gateway = FakeGateway(channels=[channel], posts_by_channel={1: [post]})
+        # The overlap yields the same item from both parts
+        shared = _make_digest_item("Shared", source_url=post.permalink)
+        summarizer = FakeSummarizer(
+            results=[
+                DigestBatchResult(items=[shared], batch_summary="One"),
+                DigestBatchResult(
+                    items=[
+                        shared,
+                        _make_digest_item(
+                            "Second", source_url=post.permalink
+                        ).model_copy(update={"post_quote": "Other quote"}),
+                    ],
+                    batch_summary="Two",
+                ),
+            ]
+        )
+        settings = _make_settings()
+        settings.llm_max_chars_per_batch = 600
+
+        result = await run_digest(
+            gateway=gateway,
+            batch_builder=BatchBuilder(chunk_overlap_chars=100),
+            summarizer=summarizer,
+            digest_builder=DigestBuilder(),
+            state=FakeStateRepository(),
+            settings=settings,
+        )
+
+        assert len(summarizer.batches) == 2
+        assert result.count("Shared") == 1
+        assert "Second" in result
+
+    async def test_overlap_items_with_differing_quotes_merged(self) -> None:
+        channel = ChannelInfo(id=1, title="Test Channel")
+        post = _make_post(101, channel.id, channel.title)
+        post.text = " ".join(f"word{i}" for i in range(120))
+        gateway = FakeGateway(channels=[channel], posts_by_channel={1: [post]})
+        # Each part quotes a different span of the overlapping text
+        first = _make_digest_item(
+            "Deadline", priority=0.4, source_url=post.permalink
+        ).model_copy(
+            update={"post_quote": " ".join(f"word{i}" for i in range(40, 50))}
+        )
+        second = _make_digest_item(
+            "Call closes", priority=0.9, source_url=post.permalink
+        ).model_copy(
+            update={"post_quote": " ".join(f"word{i}" for i in range(44, 56))}
+        )
+        summarizer = FakeSummarizer(
+            results=[
+                DigestBatchResult(items=[first], batch_summary="One"),
+                DigestBatchResult(items=[second], batch_summary="Two"),
+            ]
+        )
+        settings = _make_settings()
+        settings.llm_max_chars_per_batch = 600
+
+        result = await run_digest(
+            gateway=gateway,
+            batch_builder=BatchBuilder(chunk_overlap_chars=100),
+            summarizer=summarizer,
+            digest_builder=DigestBuilder(),
+            state=FakeStateRepository(),
+            settings=settings,
+        )
+
+        assert len(summarizer.batches) == 2
+        assert "Call closes" in result
+        assert "Deadline" not in result
+
+
+class TestDigestProfiles:
+    def _setup(self) -> tuple[FakeGateway, list[DigestProfile]]:
+        shared = ChannelInfo(id=1, title="Shared")
+        only_a = ChannelInfo(id=2, title="OnlyA")
+        gateway = FakeGateway(
+            channels_by_folder={"A": [shared, only_a], "B": [shared]},
+            posts_by_channel={
+                1: [_make_post(101, 1, "Shared")],
+                2: [_make_post(201, 2, "OnlyA")],
+            },
+        )
+        profiles = [
+            DigestProfile(name="alpha", folder_name="A"),
+            DigestProfile(name="beta", folder_name="B"),
+        ]
+        return gateway, profiles
+
+    async def test_shared_channel_fetched_and_summarized_once(self) -> None:
+        gateway, profiles = self._setup()
+        summarizer = FakeSummarizer(
+            results=[
+                DigestBatchResult(
+                    items=[
+                        _make_digest_item(
+                            "Shared item", source_url="https://t.me/test/101"
+                        ),
+                        _make_digest_item(
+                            "OnlyA item", source_url="https://t.me/test/201"
+                        ),
+                    ],
+                    batch_summary="Summary",
+                )
+            ]
+        )
+        state = FakeStateRepository()
+
+        result = await run_digest(
+            gateway=gateway,
+            batch_builder=BatchBuilder(),
+            summarizer=summarizer,
+            digest_builder=DigestBuilder(),
+            state=state,
+            settings=_make_settings(),
+            profiles=profiles,
+        )
+
+        assert [c[0] for c in gateway.fetch_calls] == [1, 2]
+        assert len(summarizer.batches) == 1
+        assert summarizer.batches[0].post_count == 2
+        alpha, beta = result.split("\n\n\U0001f4cb ")
+        assert "alpha Digest" in alpha
+        assert "Shared item" in alpha and "OnlyA item" in alpha
+        assert "beta Digest" in beta
+        assert "Shared item" in beta and "OnlyA item" not in beta
+
+    async def test_cursors_tracked_per_profile(self) -> None:
+        gateway, profiles = self._setup()
+        state = FakeStateRepository()
+        state.update_channel(1, 101, 1, profile="alpha")
+        summarizer = FakeSummarizer(
+            results=[DigestBatchResult(items=[], batch_summary="")]
+        )
+
+        result = await run_digest(
+            gateway=gateway,
+            batch_builder=BatchBuilder(),
+            summarizer=summarizer,
+            digest_builder=DigestBuilder(),
+            state=state,
+            settings=_make_settings(),
+            profiles=profiles,
+        )
+
+        # beta has no cursor yet, so the shared channel uses the time window
+        assert (1, None) in gateway.fetch_calls
+        assert state.get_last_message_id(1, profile="beta") == 101
+        assert state.get_last_message_id(2, profile="alpha") == 201
+        assert state.get_last_message_id(1) is None
+        assert "Error" not in result
+
+    async def test_new_profile_does_not_cut_short_older_cursor(self) -> None:
+        channel = ChannelInfo(id=1, title="Shared")
+        gateway = WindowedGateway(
+            window_start=54,
+            channels_by_folder={"A": [channel], "B": [channel]},
+            posts_by_channel={
+                1: [_make_post(i, 1, "Shared") for i in range(6, 67)]
+            },
+        )
+        profiles = [
+            DigestProfile(name="a", folder_name="A"),
+            DigestProfile(name="b", folder_name="B"),
+        ]
+        state = FakeStateRepository()
+        state.update_channel(1, 5, 1, profile="a")
+        summarizer = FakeSummarizer(
+            results=[DigestBatchResult(items=[], batch_summary="")]
+        )
+
+        await run_digest(
+            gateway=gateway,
+            batch_builder=BatchBuilder(),
+            summarizer=summarizer,
+            digest_builder=DigestBuilder(),
+            state=state,
+            settings=_make_settings(),
+            profiles=profiles,
+        )
+
+        summarized = {
+            p.post.id for b in summarizer.batches for p in b.payloads
+        }
+        assert summarized == set(range(6, 67))
+        a = state.get_channel_state(1, profile="a")
+        assert a.last_processed_message_id == 66
+        assert a.last_run_post_count == 61
+        assert a.last_run_truncated is False
+        b = state.get_channel_state(1, profile="b")
+        assert b.last_run_post_count == 13
+
+
+class WindowedGateway(FakeGateway):
+    """Without a cursor, only posts from window_start on are in the
+    fetch_since_hours window."""
+
+    def __init__(self, window_start: int, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._window_start = window_start
+
+    async def fetch_posts(
+        self,
+        channel: ChannelInfo,
+        since_message_id: int | None,
+        since_hours: int,
+        limit: int,
+        offset_id: int = 0,
+        reverse: bool = False,
+    ) -> PostPage:
+        if since_message_id is None:
+            since_message_id = self._window_start - 1
+        return await super().fetch_posts(
+            channel, since_message_id, since_hours, limit, offset_id, reverse
+        )
+
+
+class GeneratingGateway(FakeGateway):
+    """Builds posts on request so only the pipeline holds them."""
+
+    def __init__(self, channels: list[ChannelInfo], posts_per_channel: int):
+        super().__init__(channels=channels)
+        self._per_channel = posts_per_channel
+
+    async def fetch_posts(
+        self,
+        channel: ChannelInfo,
+        since_message_id: int | None,
+        since_hours: int,
+        limit: int,
+        offset_id: int = 0,
+        reverse: bool = False,
+    ) -> PostPage:
+        base = channel.id * 100_000
+        low = max(base, since_message_id or base) + 1
+        high = offset_id - 1 if offset_id else base + self._per_channel
+        ids = range(low, high + 1) if reverse else range(high, low - 1, -1)
+        posts = [
+            Post(
+                id=msg_id,
+                channel_id=channel.id,
+                channel_title=channel.title,
+                date=datetime(2026, 1, 15, tzinfo=timezone.utc),
+                text=f"Post {msg_id} " + "x" * 2000,
+                permalink=f"https://t.me/c{channel.id}/{msg_id - base}",
+            )
+            for msg_id in ids[:limit]
+        ]
+        return PostPage(
+            posts=posts,
+            scanned=len(posts),
+            oldest_id=min((p.id for p in posts), default=None),
+            newest_id=max((p.id for p in posts), default=None),
+        )
+
+
+class EchoSummarizer(FakeSummarizer):
+    """Returns one item per post, or only for the first with first_only."""
+
+    def __init__(self, first_only: bool = False) -> None:
+        super().__init__()
+        self._first_only = first_only
+
+    async def summarize_batch(
+        self,
+        batch: Batch,
+        instructions: str | None = None,
+        on_item: Callable[[DigestItem], None] | None = None,
+    ) -> DigestBatchResult:
+        items = [
+            _make_digest_item(
+                f"Post {p.post.id}", source_url=p.post.permalink
+            )
+            for p in batch.payloads[: 1 if self._first_only else None]
+        ]
+        return DigestBatchResult(items=items, batch_summary="")
+
+
+class TestStreamingMode:
+    async def _run(
+        self,
+        chunk_channels: int,
+        n_channels: int,
+        per: int,
+        first_only: bool = False,
+        chunk_posts: int = 0,
+        seen: bool = False,
+    ):
+        channels = [
+            ChannelInfo(id=i, title=f"Channel {i}")
+            for i in range(1, n_channels + 1)
+        ]
+        settings = _make_settings()
+        settings.stream_chunk_channels = chunk_channels
+        settings.stream_chunk_posts = chunk_posts
+        settings.digest_max_items = 100
+        state = FakeStateRepository()
+        if seen:
+            # A cursor from before the outage, so the backlog is read
+            for ch in channels:
+                state.update_channel(ch.id, ch.id * 100_000, 1)
+        result = await run_digest(
+            gateway=GeneratingGateway(channels, per),
+            batch_builder=BatchBuilder(),
+            summarizer=EchoSummarizer(first_only),
+            digest_builder=DigestBuilder(),
+            state=state,
+            settings=settings,
+        )
+        return result, state
+
+    async def test_same_digest_as_loading_everything(self) -> None:
+        streamed, state = await self._run(2, 5, 10)
+        loaded, _ = await self._run(0, 5, 10)
+
+        assert streamed == loaded
+        assert "Post 500010" in streamed
+        assert state.get_last_message_id(5) == 500_010
+        assert state._save_count == 1
+
+    async def test_peak_memory_bounded_by_chunk(self) -> None:
+        # Memory benchmark: 30 channels x 300 posts of ~2 KB (~18 MB of
+        # text); streaming three channels at a time must stay well below
+        # the peak of loading the whole backlog
+        async def peak(chunk_channels: int) -> int:
+            tracemalloc.start()
+            try:
+                await self._run(chunk_channels, 30, 300, first_only=True)
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        full = await peak(0)
+        streamed = await peak(3)
+
+        assert streamed * 4 < full
+
+    async def test_busy_channel_read_in_slices(self) -> None:
+        sliced, state = await self._run(1, 1, 25, chunk_posts=10, seen=True)
+        whole, _ = await self._run(0, 1, 25, seen=True)
+
+        assert sorted(sliced.splitlines()) == sorted(whole.splitlines())
+        assert "Post 100001" in sliced and "Post 100025" in sliced
+        assert state.get_last_message_id(1) == 100_025
+        assert state.get_channel_state(1).last_run_post_count == 25
+
+    async def test_peak_memory_bounded_for_one_busy_channel(self) -> None:
+        # One channel with 3000 posts of ~2 KB (~6 MB of text) since its
+        # cursor; slices of 100 must stay well below reading it at once
+        async def peak(chunk_channels: int) -> int:
+            tracemalloc.start()
+            try:
+                await self._run(
+                    chunk_channels,
+                    1,
+                    3000,
+                    first_only=True,
+                    chunk_posts=100,
+                    seen=True,
+                )
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        full = await peak(0)
+        streamed = await peak(1)
+
+        assert streamed * 4 < full
+
+
+class SpySummarizer(EchoSummarizer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.reduce_calls = 0
+
+    async def reduce_results(
+        self, results: list[DigestBatchResult], max_items: int
+    ) -> DigestBatchResult:
+        self.reduce_calls += 1
+        return await super().reduce_results(results, max_items)
+
+
+class TestReduce:
+    async def _run(self, n_posts: int, max_items: int) -> SpySummarizer:
+        channel = ChannelInfo(id=1, title="Test Channel")
+        gateway = FakeGateway(
+            channels=[channel],
+            posts_by_channel={
+                1: [
+                    _make_post(i, 1, channel.title)
+                    for i in range(1, n_posts + 1)
+                ]
+            },
+        )
+        summarizer = SpySummarizer()
+        settings = _make_settings()
+        settings.llm_max_chars_per_batch = 200
+        settings.digest_max_items = max_items
+
+        await run_digest(
+            gateway=gateway,
+            batch_builder=BatchBuilder(),
+            summarizer=summarizer,
+            digest_builder=DigestBuilder(),
+            state=FakeStateRepository(),
+            settings=settings,
+            reducer=DigestReducer(
+                summarizer, fan_in=4, max_items_per_call=100
+            ),
+        )
+        return summarizer
+
+    async def test_day_that_fits_skips_llm(self) -> None:
+        summarizer = await self._run(n_posts=4, max_items=10)
+        assert summarizer.reduce_calls == 0
+
+    async def test_overflowing_day_reduced(self) -> None:
+        summarizer = await self._run(n_posts=6, max_items=3)
+        assert summarizer.reduce_calls > 0
@@ -0,0 +1,121 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+from telegram_radar.models import Post
+from telegram_radar.prefilter import HashedClassifier, RelevanceFilter
+from telegram_radar.settings import Settings
+
+
+def _make_settings(**kwargs) -> Settings:
+    return Settings(
+        telegram_api_id=12345,
+        telegram_api_hash="testhash",
+        tg_bot_token="bot:token",
+        tg_owner_user_id=1,
+        llm_model="test-model",
+        llm_api_key="test-key",
+        **kwargs,
+    )
+
+
+def _make_post(text: str, post_id: int = 1, is_forward: bool = False) -> Post:
+    return Post(
+        id=post_id,
+        channel_id=1,
+        channel_title="Test",
+        date=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        text=text,
+        permalink=f"https://t.me/test/{post_id}",
+        is_forward=is_forward,
+    )
+
+
+LONG_TEXT = "Applications for the research grant close next Friday, apply now"
+
+
+class TestRelevanceFilter:
+    def test_ads_and_short_posts_dropped(self, tmp_path: Path) -> None:
+        f = RelevanceFilter(_make_settings(), tmp_path / "model.json")
+        posts = [
+            _make_post(LONG_TEXT, 1),
+            _make_post("Доброе утро!", 2),
+            _make_post(f"{LONG_TEXT} #реклама", 3),
+            _make_post("ok", 4),
+        ]
+        kept = f.filter(posts)
+        assert [p.id for p in kept] == [1]
+
+    def test_reposts_demoted_not_dropped(self, tmp_path: Path) -> None:
+        f = RelevanceFilter(_make_settings(), tmp_path / "model.json")
+        posts = [
+            _make_post(LONG_TEXT, 1, is_forward=True),
+            _make_post(LONG_TEXT, 2),
+        ]
+        kept = f.filter(posts)
+        assert [p.id for p in kept] == [2, 1]
+
+    def test_threshold_configurable(self, tmp_path: Path) -> None:
+        settings = _make_settings(prefilter_drop_threshold=0.0)
+        f = RelevanceFilter(settings, tmp_path / "model.json")
+        assert len(f.filter([_make_post("ok")])) == 1
+
+    def test_learned_model_persists(self, tmp_path: Path) -> None:
+        path = tmp_path / "model.json"
+        settings = _make_settings(prefilter_min_training_samples=10)
+        f = RelevanceFilter(settings, path)
+        for i in range(20):
+            f.learn(_make_post(f"{LONG_TEXT} {i}"), selected=True)
+            f.learn(
+                _make_post(f"Weekly giveaway, subscribe to win {i}"),
+                selected=False,
+            )
+        f.save()
+
+        reloaded = RelevanceFilter(settings, path)
+        good, _ = reloaded.score(_make_post(LONG_TEXT))
+        bad, _ = reloaded.score(_make_post("Weekly giveaway, subscribe to win"))
+        assert good > 0.5 > bad
+
+    def test_low_selection_rate_does_not_lock_in(
+        self, tmp_path: Path
+    ) -> None:
+        # Ten runs where the LLM selects one post in ten, with nothing in
+        # the wording to tell them apart, learning only from what the
+        # filter let through
+        settings = _make_settings(prefilter_min_training_samples=20)
+        path = tmp_path / "model.json"
+        selected_kept = []
+        for run in range(10):
+            f = RelevanceFilter(settings, path)
+            posts = [
+                _make_post(f"{LONG_TEXT}, issue {run} {i}", run * 100 + i)
+                for i in range(50)
+            ]
+            kept = f.filter(posts)
+            selected_kept.append(sum(p.id % 10 == 0 for p in kept))
+            for post in kept:
+                f.learn(post, selected=post.id % 10 == 0)
+            f.save()
+
+        assert selected_kept[-3:] == [5, 5, 5]
+
+    def test_dropped_posts_sampled_for_learning(
+        self, tmp_path: Path
+    ) -> None:
+        settings = _make_settings(prefilter_explore_rate=0.5)
+        f = RelevanceFilter(settings, tmp_path / "model.json")
+        posts = [_make_post("ok", i) for i in range(200)]
+        kept = len(f.filter(posts))
+        assert 50 < kept < 150
+
+        blocked = [_make_post(f"{LONG_TEXT} #ad", i) for i in range(200)]
+        assert f.filter(blocked) == []
+
+
+class TestHashedClassifier:
+    def test_json_round_trip(self) -> None:
+        model = HashedClassifier()
+        model.learn("hello world", selected=True)
+        restored = HashedClassifier.from_json(model.to_json())
+        assert restored.predict("hello world") == model.predict("hello world")
+        assert restored.samples == 1
@@ -0,0 +1,146 @@
+from telegram_radar.models import DigestBatchResult, DigestItem
+from telegram_radar.reducer import (
+    DigestReducer,
+    merge_locally,
+    merge_overlapping,
+)
+
+
+def _make_item(
+    title: str, priority: float = 0.5, url: str | None = None
+) -> DigestItem:
+    return DigestItem(
+        title=title,
+        why_relevant="Test relevance",
+        source_url=url or f"https://t.me/test/{title}",
+        post_quote=f"Quote for {title}",
+        channel="Test",
+        date="2026-01-01",
+        priority=priority,
+    )
+
+
+def _make_result(*titles: str) -> DigestBatchResult:
+    return DigestBatchResult(
+        items=[_make_item(t) for t in titles], batch_summary=f"About {titles}"
+    )
+
+
+class FakeSummarizer:
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.calls: list[int] = []
+
+    async def reduce_results(
+        self, results: list[DigestBatchResult], max_items: int
+    ) -> DigestBatchResult:
+        self.calls.append(len(results))
+        if self.fail:
+            raise RuntimeError("LLM unavailable")
+        items = [item for r in results for item in r.items]
+        items.append(_make_item("Invented"))
+        return DigestBatchResult(items=items[:max_items], batch_summary="Day")
+
+
+class TestMergeLocally:
+    def test_duplicates_keep_highest_priority(self) -> None:
+        low = _make_item("Same", priority=0.2)
+        high = _make_item("Same", priority=0.9)
+        merged = merge_locally(
+            [
+                DigestBatchResult(items=[low], batch_summary="A"),
+                DigestBatchResult(items=[high], batch_summary="B"),
+            ]
+        )
+        assert merged.items == [high]
+        assert merged.batch_summary == "A B"
+
+
+class TestMergeOverlapping:
+    def _item(self, title: str, quote: str, priority: float) -> DigestItem:
+        return _make_item(title, priority).model_copy(
+            update={"post_quote": quote}
+        )
+
+    def test_same_passage_collapsed(self) -> None:
+        items = [
+            self._item(
+                "Grant call opens",
+                "The foundation opens its research grant call on Monday",
+                0.5,
+            ),
+            self._item(
+                "Research grants",
+                "opens its research grant call on Monday, deadline May 1",
+                0.8,
+            ),
+            self._item("Grant call opens today", "Apply now", 0.4),
+            self._item("Hiring", "We are hiring two engineers", 0.6),
+        ]
+
+        merged = merge_overlapping(items)
+
+        assert [i.title for i in merged] == ["Research grants", "Hiring"]
+
+    def test_contained_quote_collapsed(self) -> None:
+        items = [
+            self._item("A", "deadline is May 1", 0.3),
+            self._item("B", "Note: the deadline is May 1.", 0.9),
+        ]
+        assert [i.title for i in merge_overlapping(items)] == ["B"]
+
+
+class TestDigestReducer:
+    async def test_tree_reduces_level_by_level(self) -> None:
+        summarizer = FakeSummarizer()
+        reducer = DigestReducer(summarizer, fan_in=2, max_items_per_call=100)
+        results = [_make_result(f"I{i}") for i in range(4)]
+
+        reduced = await reducer.reduce(results, max_items=10)
+
+        # Two calls at the first level, one at the root
+        assert summarizer.calls == [2, 2, 2]
+        assert reduced.batch_summary == "Day"
+        assert {i.title for i in reduced.items} == {"I0", "I1", "I2", "I3"}
+
+    async def test_single_small_result_skips_llm(self) -> None:
+        summarizer = FakeSummarizer()
+        reducer = DigestReducer(summarizer, fan_in=4, max_items_per_call=100)
+        result = _make_result("A", "B")
+
+        reduced = await reducer.reduce([result], max_items=10)
+
+        assert summarizer.calls == []
+        assert reduced == result
+
+    async def test_oversized_result_is_cut_to_max_items(self) -> None:
+        summarizer = FakeSummarizer()
+        reducer = DigestReducer(summarizer, fan_in=4, max_items_per_call=100)
+
+        reduced = await reducer.reduce(
+            [_make_result(*(f"I{i}" for i in range(8)))], max_items=3
+        )
+
+        assert summarizer.calls == [1]
+        assert len(reduced.items) == 3
+
+    async def test_falls_back_to_local_ranking(self) -> None:
+        summarizer = FakeSummarizer(fail=True)
+        reducer = DigestReducer(summarizer, fan_in=2, max_items_per_call=100)
+        results = [_make_result("A", "B"), _make_result("C")]
+
+        reduced = await reducer.reduce(results, max_items=2)
+
+        # Local ranking keeps every item so the digest can report the rest
+        assert len(reduced.items) == 3
+        assert "About" in reduced.batch_summary
+
+    async def test_local_fallback_caps_summary(self) -> None:
+        summarizer = FakeSummarizer(fail=True)
+        reducer = DigestReducer(summarizer, fan_in=2, max_items_per_call=100)
+        results = [_make_result(f"I{i}") for i in range(10)]
+
+        reduced = await reducer.reduce(results, max_items=2)
+
+        assert len(reduced.items) == 10
+        assert reduced.batch_summary.count("About") == 2
@@ -0,0 +1,87 @@
+from datetime import datetime, timezone
+
+from telegram_radar.batch_builder import render_payloads
+from telegram_radar.models import Batch, LenientDigestItem, Post
+from telegram_radar.repair import normalize_date, repair_items, truncate_quote
+
+
+def _make_batch() -> Batch:
+    post = Post(
+        id=1,
+        channel_id=1,
+        channel_title="TestChannel",
+        date=datetime(2026, 1, 15, tzinfo=timezone.utc),
+        text="Post text",
+        permalink="https://t.me/test/1",
+    )
+    payload = render_payloads(post, 10_000)[0]
+    return Batch(
+        payloads=[payload], total_chars=10, post_count=1, comment_count=0
+    )
+
+
+def _raw(**kwargs) -> LenientDigestItem:
+    fields = {
+        "title": "Title",
+        "why_relevant": "Why",
+        "source_url": "https://t.me/test/1",
+        "post_quote": "Quote",
+        "channel": "TestChannel",
+        "date": "2026-01-15",
+        "priority": 0.5,
+    }
+    fields.update(kwargs)
+    return LenientDigestItem(**fields)
+
+
+class TestNormalizeDate:
+    def test_common_formats(self) -> None:
+        assert normalize_date("2026-01-05") == "2026-01-05"
+        assert normalize_date("05.01.2026") == "2026-01-05"
+        assert normalize_date("2026-01-05T10:00:00Z") == "2026-01-05"
+        assert normalize_date("January 5, 2026") == "2026-01-05"
+
+    def test_unparseable_returns_none(self) -> None:
+        assert normalize_date("next Friday") is None
+        assert normalize_date(None) is None
+
+
+class TestTruncateQuote:
+    def test_long_quote_cut_at_word_boundary(self) -> None:
+        quote = ("word " * 50).strip()
+        cut = truncate_quote(quote)
+        assert cut is not None
+        assert len(cut) <= 160
+        assert quote.startswith(cut)
+        assert not cut.endswith(" ")
+
+
+class TestRepairItems:
+    def test_valid_item_passes(self) -> None:
+        valid, broken = repair_items([_raw()], _make_batch())
+        assert len(valid) == 1 and broken == []
+
+    def test_local_repairs(self) -> None:
+        raw = _raw(
+            post_quote="x" * 300,
+            deadline="20.01.2026",
+            date=None,
+            channel=None,
+            priority="1.7",
+        )
+        valid, broken = repair_items([raw], _make_batch())
+        assert broken == []
+        item = valid[0]
+        assert len(item.post_quote) == 160
+        assert item.deadline == "2026-01-20"
+        assert item.date == "2026-01-15"
+        assert item.channel == "TestChannel"
+        assert item.priority == 1.0
+
+    def test_unrepairable_item_reported(self) -> None:
+        valid, broken = repair_items(
+            [_raw(), _raw(title=None, post_quote=None)], _make_batch()
+        )
+        assert len(valid) == 1
+        assert len(broken) == 1
+        assert "title" in broken[0][1]
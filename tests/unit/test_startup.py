@@ -0,0 +1,37 @@
+import json
+import subprocess
+import sys
+
+# Generous for slow CI machines; a cold import takes about 1s locally
+MAX_IMPORT_SECONDS = 5.0
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import telegram_radar.__main__
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+def _import_package() -> dict:
+    # A fresh interpreter, so modules cached by other tests do not count
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return json.loads(out.stdout)
+
+
+class TestStartupImports:
+    def test_llm_clients_imported_lazily(self) -> None:
+        modules = set(_import_package()["modules"])
+        assert "openai" not in modules
+        assert "instructor" not in modules
+
+    def test_import_time_bounded(self) -> None:
+        assert _import_package()["seconds"] < MAX_IMPORT_SECONDS
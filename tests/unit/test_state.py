@@ -1,6 +1,9 @@
 import json
+from datetime import timedelta
 from pathlib import Path
 
+import pytest
+
 from telegram_radar.models import AppState, ChannelState
 from telegram_radar.state import StateManager
 
@@ -94,3 +97,40 @@ class TestStateManager:
         assert ch_state is not None
         assert ch_state.last_processed_message_id == 50
         assert ch_state.last_run_post_count == 3
+
+    def test_profile_cursors_are_independent(self, tmp_path: Path) -> None:
+        state_file = tmp_path / "state.json"
+        mgr = StateManager(state_file)
+        mgr.load()
+        mgr.update_channel(123, last_message_id=10, post_count=1)
+        mgr.update_channel(123, last_message_id=20, post_count=2, profile="work")
+        mgr.save()
+        mgr2 = StateManager(state_file)
+        mgr2.load()
+        assert mgr2.get_last_message_id(123) == 10
+        assert mgr2.get_last_message_id(123, profile="work") == 20
+        assert mgr2.get_last_message_id(123, profile="other") is None
+
+    def test_posting_rate_and_truncation_tracked(
+        self, tmp_path: Path
+    ) -> None:
+        mgr = StateManager(tmp_path / "state.json")
+        mgr.load()
+        mgr.update_channel(123, last_message_id=10, post_count=5)
+        first = mgr.get_channel_state(123)
+        assert first.posts_per_day is None
+        # Pretend the first run happened two days ago
+        first.updated_at -= timedelta(days=2)
+
+        mgr.update_channel(
+            123, last_message_id=50, post_count=40, truncated=True
+        )
+        second = mgr.get_channel_state(123)
+        assert second.posts_per_day == pytest.approx(20, rel=0.01)
+        assert second.last_run_truncated is True
+        assert second.truncated_at is not None
+
+        mgr.update_channel(123, last_message_id=60, post_count=2)
+        third = mgr.get_channel_state(123)
+        assert third.last_run_truncated is False
+        assert third.truncated_at == second.truncated_at
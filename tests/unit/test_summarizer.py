@@ -0,0 +1,297 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from telegram_radar.batch_builder import render_payloads
+from telegram_radar.models import (
+    Batch,
+    LenientBatchResult,
+    LenientDigestItem,
+    Post,
+    TriageResult,
+    TriageScore,
+)
+from telegram_radar.settings import Settings
+from telegram_radar.summarizer import LLMSummarizer
+
+
+def _make_settings() -> Settings:
+    return Settings(
+        telegram_api_id=12345,
+        telegram_api_hash="testhash",
+        tg_bot_token="bot:token",
+        tg_owner_user_id=1,
+        llm_model="strong-model",
+        llm_api_key="test-key",
+        llm_triage_model="cheap-model",
+    )
+
+
+def _make_post(post_id: int) -> Post:
+    return Post(
+        id=post_id,
+        channel_id=1,
+        channel_title="Test",
+        date=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        text=f"Post {post_id}",
+        permalink=f"https://t.me/test/{post_id}",
+    )
+
+
+def _completion(prompt_tokens: int, completion_tokens: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        usage=SimpleNamespace(
+            prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+        )
+    )
+
+
+@pytest.fixture
+def client():
+    with patch("instructor.from_openai") as from_openai:
+        client = MagicMock()
+        client.chat.completions.create_with_completion = AsyncMock()
+        from_openai.return_value = client
+        yield client
+
+
+class TestTriage:
+    async def test_scores_mapped_by_index(self, client) -> None:
+        client.chat.completions.create_with_completion.return_value = (
+            TriageResult(scores=[TriageScore(index=1, score=0.2)]),
+            _completion(100, 10),
+        )
+        summarizer = LLMSummarizer(_make_settings())
+
+        scores = await summarizer.triage_posts([_make_post(1), _make_post(2)])
+
+        # Unscored posts are kept
+        assert scores == [1.0, 0.2]
+        kwargs = client.chat.completions.create_with_completion.call_args
+        assert kwargs.kwargs["model"] == "cheap-model"
+
+    async def test_usage_recorded_per_tier(self, client) -> None:
+        client.chat.completions.create_with_completion.return_value = (
+            TriageResult(scores=[]),
+            _completion(100, 10),
+        )
+        summarizer = LLMSummarizer(_make_settings())
+        await summarizer.triage_posts([_make_post(1)])
+        await summarizer.triage_posts([_make_post(2)])
+
+        usage = summarizer.pop_usage()
+
+        assert usage["triage"].calls == 2
+        assert usage["triage"].prompt_tokens == 200
+        assert usage["triage"].completion_tokens == 20
+        assert summarizer.pop_usage() == {}
+
+
+class TestHttpClient:
+    async def test_health_check_reuses_pooled_client(self, client) -> None:
+        summarizer = LLMSummarizer(_make_settings())
+        with patch.object(
+            summarizer._openai.models, "list", AsyncMock()
+        ) as list_models:
+            assert await summarizer.check_health() is True
+            assert await summarizer.check_health() is True
+        assert list_models.await_count == 2
+        await summarizer.close()
+
+    async def test_pool_sized_to_concurrency(self, client) -> None:
+        settings = _make_settings()
+        settings.llm_max_concurrency = 7
+        summarizer = LLMSummarizer(settings)
+        pool = summarizer._openai._client._transport._pool
+        # One spare connection for health probes
+        assert pool._max_connections == 8
+        await summarizer.close()
+        assert summarizer._openai._client.is_closed
+
+
+def _make_batch() -> Batch:
+    post = _make_post(1)
+    return Batch(
+        payloads=[render_payloads(post, 10_000)[0]],
+        total_chars=10,
+        post_count=1,
+        comment_count=0,
+    )
+
+
+def _lenient_item(title: str | None) -> LenientDigestItem:
+    return LenientDigestItem(
+        title=title,
+        why_relevant="Why",
+        source_url="https://t.me/test/1",
+        post_quote="Post 1",
+        channel="Test",
+        date="2026-01-01",
+        priority=0.5,
+    )
+
+
+class TestTolerantParsing:
+    async def test_only_broken_items_are_re_requested(self, client) -> None:
+        create = client.chat.completions.create_with_completion
+        create.side_effect = [
+            (
+                LenientBatchResult(
+                    items=[_lenient_item("Good"), _lenient_item(None)],
+                    batch_summary="Summary",
+                ),
+                _completion(1000, 100),
+            ),
+            (
+                LenientBatchResult(items=[_lenient_item("Fixed")]),
+                _completion(50, 10),
+            ),
+        ]
+        summarizer = LLMSummarizer(_make_settings())
+
+        result = await summarizer.summarize_batch(_make_batch())
+
+        assert [i.title for i in result.items] == ["Good", "Fixed"]
+        assert result.batch_summary == "Summary"
+        fix_prompt = create.call_args_list[1].kwargs["messages"][1]["content"]
+        assert "ITEM 1" in fix_prompt and "ITEM 2" not in fix_prompt
+        assert set(summarizer.pop_usage()) == {"extract", "repair"}
+
+    async def test_valid_batch_needs_single_call(self, client) -> None:
+        create = client.chat.completions.create_with_completion
+        create.return_value = (
+            LenientBatchResult(items=[_lenient_item("Good")]),
+            _completion(1000, 100),
+        )
+        summarizer = LLMSummarizer(_make_settings())
+
+        result = await summarizer.summarize_batch(_make_batch())
+
+        assert len(result.items) == 1
+        assert create.await_count == 1
+
+
+class TestPromptCaching:
+    async def test_static_prefix_shared_across_profiles(self, client) -> None:
+        create = client.chat.completions.create_with_completion
+        create.return_value = (LenientBatchResult(items=[]), _completion(10, 1))
+        summarizer = LLMSummarizer(_make_settings())
+
+        await summarizer.summarize_batch(_make_batch())
+        await summarizer.summarize_batch(_make_batch(), instructions="Jobs")
+
+        plain = create.call_args_list[0].kwargs["messages"]
+        custom = create.call_args_list[1].kwargs["messages"]
+        assert plain[0] == custom[0]
+        assert custom[1]["content"].endswith("Jobs")
+        assert custom[-1]["role"] == "user"
+
+    async def test_cache_control_marks_system_prompt(self, client) -> None:
+        create = client.chat.completions.create_with_completion
+        create.return_value = (LenientBatchResult(items=[]), _completion(10, 1))
+        settings = _make_settings()
+        settings.llm_prompt_cache = "cache_control"
+        summarizer = LLMSummarizer(settings)
+
+        await summarizer.summarize_batch(_make_batch())
+
+        system = create.call_args.kwargs["messages"][0]["content"]
+        assert system[0]["cache_control"] == {"type": "ephemeral"}
+        assert "extra_body" not in create.call_args.kwargs
+
+    async def test_cache_key_sent_per_tier(self, client) -> None:
+        create = client.chat.completions.create_with_completion
+        create.return_value = (LenientBatchResult(items=[]), _completion(10, 1))
+        settings = _make_settings()
+        settings.llm_prompt_cache = "key"
+        summarizer = LLMSummarizer(settings)
+
+        await summarizer.summarize_batch(_make_batch())
+
+        extra = create.call_args.kwargs["extra_body"]
+        assert extra == {"prompt_cache_key": "telegram-radar-extract"}
+
+    async def test_cached_tokens_recorded(self, client) -> None:
+        completion = _completion(1000, 100)
+        completion.usage.prompt_tokens_details = SimpleNamespace(
+            cached_tokens=800
+        )
+        client.chat.completions.create_with_completion.return_value = (
+            LenientBatchResult(items=[]),
+            completion,
+        )
+        summarizer = LLMSummarizer(_make_settings())
+
+        await summarizer.summarize_batch(_make_batch())
+        await summarizer.summarize_batch(_make_batch())
+
+        usage = summarizer.pop_usage()["extract"]
+        assert usage.prompt_tokens == 2000
+        assert usage.cached_tokens == 1600
+
+
+def _stream(*snapshots: LenientBatchResult, hang: bool = False):
+    async def gen():
+        for snapshot in snapshots:
+            yield snapshot
+        if hang:
+            await asyncio.sleep(10)
+
+    return gen()
+
+
+class TestStreaming:
+    def _settings(self, **kwargs) -> Settings:
+        settings = _make_settings()
+        settings.llm_streaming = True
+        for key, value in kwargs.items():
+            setattr(settings, key, value)
+        return settings
+
+    async def test_items_emitted_as_they_complete(self, client) -> None:
+        first = _lenient_item("First")
+        second = _lenient_item("Second")
+        seen: list[str] = []
+        client.chat.completions.create_partial = MagicMock(
+            return_value=_stream(
+                LenientBatchResult(items=[first]),
+                LenientBatchResult(items=[first, second]),
+                LenientBatchResult(items=[first, second], batch_summary="S"),
+            )
+        )
+        summarizer = LLMSummarizer(self._settings())
+
+        def on_item(item) -> None:
+            seen.append(item.title)
+            # "Second" must not be emitted before the stream moves past it
+            assert item.title == "First" or len(seen) == 2
+
+        result = await summarizer.summarize_batch(
+            _make_batch(), on_item=on_item
+        )
+
+        assert seen == ["First", "Second"]
+        assert result.batch_summary == "S"
+        usage = summarizer.pop_usage()["extract"]
+        assert usage.calls == 1
+        assert usage.unmetered_calls == 1
+        assert usage.prompt_tokens == 0
+
+    async def test_timeout_keeps_completed_items(self, client) -> None:
+        first = _lenient_item("First")
+        partial = _lenient_item("Second")
+        client.chat.completions.create_partial = MagicMock(
+            return_value=_stream(
+                LenientBatchResult(items=[first, partial]), hang=True
+            )
+        )
+        summarizer = LLMSummarizer(
+            self._settings(llm_stream_timeout_seconds=0.05)
+        )
+
+        result = await summarizer.summarize_batch(_make_batch())
+
+        assert [i.title for i in result.items] == ["First"]
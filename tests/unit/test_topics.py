@@ -0,0 +1,91 @@
+import random
+import time
+
+from telegram_radar.models import DigestItem
+from telegram_radar.topics import HashingVectorizer, cluster_items
+
+N_ITEMS = 3000
+_TOPICS = [
+    "grant funding application deadline proposal",
+    "conference talk speakers venue tickets",
+    "model release weights benchmark checkpoint",
+    "hiring vacancy engineer salary remote",
+    "security vulnerability patch exploit advisory",
+    "dataset annotation labels corpus license",
+    "course lectures homework students syllabus",
+    "startup investors seed round valuation",
+]
+_FILLER = "today announced team new update great week".split()
+
+
+def _make_item(title: str, text: str, priority: float = 0.5) -> DigestItem:
+    return DigestItem(
+        title=title,
+        why_relevant=text,
+        source_url="https://t.me/test/1",
+        post_quote=text[:160],
+        channel="Test",
+        date="2026-01-15",
+        priority=priority,
+    )
+
+
+def _synthetic(n: int) -> tuple[list[DigestItem], list[int]]:
+    rng = random.Random(0)
+    items: list[DigestItem] = []
+    labels: list[int] = []
+    for i in range(n):
+        topic = i % len(_TOPICS)
+        words = rng.sample(_TOPICS[topic].split(), 4) + rng.sample(_FILLER, 3)
+        rng.shuffle(words)
+        text = " ".join(words)
+        items.append(_make_item(f"Item {i}", text, rng.random()))
+        labels.append(topic)
+    return items, labels
+
+
+class TestHashingVectorizer:
+    def test_vectors_normalized_and_common_words_dropped(self) -> None:
+        vectors = HashingVectorizer().fit_transform(
+            ["the grant opens", "the talk starts", "the grant closes"]
+        )
+        for vec in vectors:
+            assert abs(sum(w * w for w in vec.values()) - 1.0) < 1e-9
+        # "the" is in every text and carries no topic signal
+        assert len(vectors[0]) == 2
+
+
+class TestClusterItems:
+    def test_similar_items_grouped(self) -> None:
+        items = [
+            _make_item("Grant A", "research grant deadline extended", 0.9),
+            _make_item("Talk", "conference talk schedule published", 0.8),
+            _make_item("Grant B", "grant deadline for research labs", 0.7),
+            _make_item("Misc", "weather is nice", 0.1),
+        ]
+
+        topics = cluster_items(items)
+
+        assert [[i.title for i in t.items] for t in topics] == [
+            ["Grant A", "Grant B"],
+            ["Talk"],
+            ["Misc"],
+        ]
+        assert "grant" in topics[0].label.lower()
+
+    def test_thousands_of_items_clustered_quickly(self) -> None:
+        # Benchmark: clustering time and topic purity for 3000 items
+        items, labels = _synthetic(N_ITEMS)
+        label_of = {id(item): label for item, label in zip(items, labels)}
+
+        start = time.perf_counter()
+        topics = cluster_items(items)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 1.0
+        assert sum(len(t.items) for t in topics) == N_ITEMS
+        big = [t for t in topics if len(t.items) >= 50]
+        assert len(big) == len(_TOPICS)
+        for topic in big:
+            topic_labels = {label_of[id(item)] for item in topic.items}
+            assert len(topic_labels) == 1
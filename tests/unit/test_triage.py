@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+
+from telegram_radar.models import Post
+from telegram_radar.settings import Settings
+from telegram_radar.triage import PostTriage
+
+
+def _make_settings(**kwargs) -> Settings:
+    return Settings(
+        telegram_api_id=12345,
+        telegram_api_hash="testhash",
+        tg_bot_token="bot:token",
+        tg_owner_user_id=1,
+        llm_model="test-model",
+        llm_api_key="test-key",
+        llm_triage_model="cheap-model",
+        **kwargs,
+    )
+
+
+def _make_post(post_id: int, text: str = "Post text") -> Post:
+    return Post(
+        id=post_id,
+        channel_id=1,
+        channel_title="Test",
+        date=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        text=text,
+        permalink=f"https://t.me/test/{post_id}",
+    )
+
+
+class FakeSummarizer:
+    def __init__(self, scores: dict[int, float], fail: bool = False) -> None:
+        self.scores = scores
+        self.fail = fail
+        self.calls: list[list[int]] = []
+
+    async def triage_posts(
+        self, posts: list[Post], instructions: str | None = None
+    ) -> list[float]:
+        self.calls.append([p.id for p in posts])
+        if self.fail:
+            raise RuntimeError("triage model down")
+        return [self.scores[p.id] for p in posts]
+
+
+class TestPostTriage:
+    async def test_low_scores_dropped(self) -> None:
+        summarizer = FakeSummarizer({1: 0.9, 2: 0.1, 3: 0.4})
+        triage = PostTriage(summarizer, _make_settings())
+
+        kept = await triage.shortlist([_make_post(i) for i in (1, 2, 3)])
+
+        assert [p.id for p in kept] == [1, 3]
+
+    async def test_posts_chunked_by_budget(self) -> None:
+        summarizer = FakeSummarizer({i: 1.0 for i in range(6)})
+        settings = _make_settings(
+            llm_triage_max_chars_per_batch=250, llm_triage_chars_per_post=100
+        )
+        triage = PostTriage(summarizer, settings)
+
+        await triage.shortlist([_make_post(i, "x" * 500) for i in range(6)])
+
+        assert summarizer.calls == [[0, 1], [2, 3], [4, 5]]
+
+    async def test_failure_keeps_posts(self) -> None:
+        summarizer = FakeSummarizer({}, fail=True)
+        triage = PostTriage(summarizer, _make_settings())
+
+        kept = await triage.shortlist([_make_post(1), _make_post(2)])
+
+        assert len(kept) == 2
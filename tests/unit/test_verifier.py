@@ -0,0 +1,102 @@
+from datetime import datetime, timezone
+
+from telegram_radar.batch_builder import render_payloads
+from telegram_radar.models import Batch, Comment, DigestItem, Post, PostPayload
+from telegram_radar.verifier import QuoteIndex, verify_items
+
+
+def _make_post(post_id: int, text: str, comments: list[Comment]) -> PostPayload:
+    post = Post(
+        id=post_id,
+        channel_id=post_id,
+        channel_title=f"Channel{post_id}",
+        date=datetime(2026, 1, post_id, tzinfo=timezone.utc),
+        text=text,
+        permalink=f"https://t.me/test/{post_id}",
+        comments=comments,
+    )
+    return render_payloads(post, 10_000)[0]
+
+
+def _make_batch() -> Batch:
+    comment = Comment(
+        id=10,
+        author_name="User",
+        date=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        text="Great news, I already applied!",
+        link="https://t.me/c/555/10",
+    )
+    payloads = [
+        _make_post(
+            1, "The **grant** deadline is March 1, apply via the form.", [comment]
+        ),
+        _make_post(2, "Conference tickets are on sale — early bird ends soon.", []),
+    ]
+    return Batch(
+        payloads=payloads, total_chars=100, post_count=2, comment_count=1
+    )
+
+
+def _make_item(
+    quote: str,
+    source_url: str = "https://t.me/test/1",
+    comment_quote: str | None = None,
+) -> DigestItem:
+    return DigestItem(
+        title="Item",
+        why_relevant="Why",
+        source_url=source_url,
+        post_quote=quote,
+        comment_quote=comment_quote,
+        channel="Channel1",
+        date="2026-01-01",
+        priority=0.5,
+    )
+
+
+class TestQuoteIndex:
+    def test_finds_normalized_substring(self) -> None:
+        index = QuoteIndex()
+        index.add("Hello  “World”, this is *bold* text")
+        other = index.add("Something else entirely")
+        assert index.find('hello "world", this is bold') == {0}
+        assert index.find("else") == {other}
+        assert index.find("not present anywhere") == set()
+
+    def test_ellipsis_segments_must_share_a_doc(self) -> None:
+        index = QuoteIndex()
+        index.add("first part of the post and then the second part")
+        index.add("only the second part here")
+        assert index.find("first part ... second part") == {0}
+
+
+class TestVerifyItems:
+    def test_verified_item_unchanged(self) -> None:
+        item = _make_item("grant deadline is March 1")
+        assert verify_items(_make_batch(), [item]) == [item]
+
+    def test_hallucinated_quote_dropped(self) -> None:
+        item = _make_item("The deadline was moved to April")
+        assert verify_items(_make_batch(), [item]) == []
+
+    def test_misattributed_source_fixed(self) -> None:
+        item = _make_item(
+            "early bird ends soon", source_url="https://t.me/test/1"
+        )
+        [fixed] = verify_items(_make_batch(), [item])
+        assert fixed.source_url == "https://t.me/test/2"
+        assert fixed.channel == "Channel2"
+        assert fixed.date == "2026-01-02"
+
+    def test_comment_link_source_accepted(self) -> None:
+        item = _make_item(
+            "grant deadline",
+            source_url="https://t.me/c/555/10",
+            comment_quote="I already applied",
+        )
+        assert verify_items(_make_batch(), [item]) == [item]
+
+    def test_unverified_comment_quote_cleared(self) -> None:
+        item = _make_item("grant deadline", comment_quote="Invented comment")
+        [fixed] = verify_items(_make_batch(), [item])
+        assert fixed.comment_quote is None
@@ -0,0 +1,125 @@
+import asyncio
+import statistics
+import time
+
+from aiohttp import test_utils
+from telegram import Bot, Update
+
+from telegram_radar.webhook import SECRET_HEADER, WebhookServer
+
+SECRET = "s3cret"
+N_UPDATES = 200
+
+
+def _update(update_id: int) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 1767225600,
+            "chat": {"id": 42, "type": "private"},
+            "from": {"id": 42, "is_bot": False, "first_name": "Owner"},
+            "text": "/status",
+            "entities": [{"type": "bot_command", "offset": 0, "length": 7}],
+        },
+    }
+
+
+async def _client(on_update) -> test_utils.TestClient:
+    server = WebhookServer(
+        Bot("123:abc"), on_update, path="/hook", secret_token=SECRET
+    )
+    client = test_utils.TestClient(
+        test_utils.TestServer(server.build_app())
+    )
+    await client.start_server()
+    return client
+
+
+class TestWebhookServer:
+    async def test_rejects_bad_secret(self) -> None:
+        received: list[Update] = []
+
+        async def on_update(update: Update) -> None:
+            received.append(update)
+
+        client = await _client(on_update)
+        try:
+            resp = await client.post(
+                "/hook", json=_update(1), headers={SECRET_HEADER: "wrong"}
+            )
+            assert resp.status == 403
+            resp = await client.post("/hook", json=_update(1))
+            assert resp.status == 403
+        finally:
+            await client.close()
+        assert received == []
+
+    async def test_rejects_malformed_update(self) -> None:
+        async def on_update(update: Update) -> None:
+            raise AssertionError("must not be called")
+
+        client = await _client(on_update)
+        try:
+            resp = await client.post(
+                "/hook", data="not json", headers={SECRET_HEADER: SECRET}
+            )
+            assert resp.status == 400
+            resp = await client.post(
+                "/hook", json={"foo": 1}, headers={SECRET_HEADER: SECRET}
+            )
+            assert resp.status == 400
+        finally:
+            await client.close()
+
+    async def test_parses_update(self) -> None:
+        received: list[Update] = []
+
+        async def on_update(update: Update) -> None:
+            received.append(update)
+
+        client = await _client(on_update)
+        try:
+            resp = await client.post(
+                "/hook", json=_update(7), headers={SECRET_HEADER: SECRET}
+            )
+            assert resp.status == 200
+        finally:
+            await client.close()
+        assert received[0].update_id == 7
+        assert received[0].effective_user.id == 42
+        assert received[0].message.text == "/status"
+
+    async def test_handler_latency(self) -> None:
+        # Harness: post fake updates and time each one until the handler
+        # has seen it
+        queue: asyncio.Queue[Update] = asyncio.Queue()
+        handled: dict[int, float] = {}
+
+        async def handler() -> None:
+            while True:
+                update = await queue.get()
+                handled[update.update_id] = time.perf_counter()
+
+        worker = asyncio.create_task(handler())
+        client = await _client(queue.put)
+        latencies: list[float] = []
+        try:
+            for i in range(N_UPDATES):
+                start = time.perf_counter()
+                resp = await client.post(
+                    "/hook", json=_update(i), headers={SECRET_HEADER: SECRET}
+                )
+                assert resp.status == 200
+                while i not in handled:
+                    await asyncio.sleep(0)
+                latencies.append(handled[i] - start)
+        finally:
+            worker.cancel()
+            await client.close()
+
+        p50 = statistics.median(latencies)
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        assert p95 < 0.1, (
+            f"webhook latency p50={p50 * 1000:.2f}ms p95={p95 * 1000:.2f}ms"
+        )